@@ -1,10 +1,29 @@
 import sys
 import os
+import time
+
+# Reference point for the startup-timing report
+STARTUP_T0 = time.perf_counter()
+
 import json
+import queue
 import subprocess
+import shutil
+import threading
+import tempfile
+import uuid
+import bisect
+import hashlib
+from collections import Counter, OrderedDict
+from concurrent.futures import (
+    Future,
+    CancelledError,
+    ThreadPoolExecutor,
+    FIRST_COMPLETED,
+    wait as wait_futures,
+)
 from datetime import datetime, timedelta
 from pathlib import Path
-import yt_dlp
 import io
 import urllib.request
 from urllib.parse import urlparse
@@ -31,13 +50,28 @@ from PyQt5.QtWidgets import (
     QHeaderView,
     QRadioButton,
     QButtonGroup,
-    QListWidget,
-    QListWidgetItem,
+    QListView,
     QScrollArea,
     QSizePolicy,
     QSplitter,
+    QPlainTextEdit,
+    QComboBox,
+    QListWidget,
+)
+from PyQt5.QtCore import (
+    Qt,
+    QThread,
+    pyqtSignal,
+    QSize,
+    QDir,
+    QUrl,
+    QTimer,
+    QFileSystemWatcher,
+    QObject,
+    QAbstractListModel,
+    QModelIndex,
+    QRect,
 )
-from PyQt5.QtCore import Qt, QThread, pyqtSignal, QSize, QDir, QUrl, QTimer
 from PyQt5.QtGui import (
     QFont,
     QIcon,
@@ -52,6 +86,168 @@ from PyQt5.QtGui import (
 # --- Configuration Files ---
 CONFIG_FILE = "config.json"
 HISTORY_FILE = "history.json"
+HISTORY_JOURNAL_FILE = "history.journal"
+CLEAR_FAILURES_FILE = "clear_failures.log"
+
+# Number of rolling backups (file.bak.1 is the newest) kept for JSON state
+BACKUP_COUNT = 2
+# Fold the history journal into history.json after this many entries
+JOURNAL_CHECKPOINT_ENTRIES = 200
+
+# Cached ffmpeg/ffprobe capabilities (re-probed when the binary changes)
+FFMPEG_CAPS_FILE = "ffmpeg_caps.json"
+# Encoder name fragments that indicate hardware acceleration
+HWACCEL_ENCODER_MARKERS = (
+    "nvenc",
+    "qsv",
+    "vaapi",
+    "amf",
+    "videotoolbox",
+    "v4l2m2m",
+    "_mf",
+    "omx",
+    "cuda",
+    "vulkan",
+    "d3d12",
+)
+
+# Persistent yt-dlp cache (YouTube player/signature data etc.)
+YTDLP_CACHE_DIR = "ytdlp_cache"
+# Most-used sites from history whose extractor data is refreshed at startup
+CACHE_PREWARM_SITES = 2
+
+# --- Source Cache ---
+# Full downloads kept for re-trimming, keyed by video ID + format
+SOURCE_CACHE_DIR = "source_cache"
+SOURCE_CACHE_INDEX = "index.json"
+# Downloads land here and move into the cache only once complete
+SOURCE_CACHE_STAGING = ".downloads"
+SOURCE_CACHE_QUOTA_CHOICES_GB = (1, 5, 10, 25, 50)
+
+# Speculative metadata prefetch while a URL sits unchanged in the input box
+PREFETCH_DELAY_MS = 300
+PREFETCH_CACHE_SIZE = 8
+# Prefetched info holds signed stream URLs (YouTube's expire after ~6 hours)
+PREFETCH_TTL = 30 * 60  # seconds
+# Pre-resolved thumbnails / direct images (clipboard watcher and previews)
+THUMBNAIL_CACHE_SIZE = 16
+
+# --- Format Size Probing ---
+# Only plain HTTP(S) formats have a single URL whose Content-Length is the size
+DIRECT_HTTP_PROTOCOLS = ("http", "https")
+SIZE_PROBE_TIMEOUT = 3  # seconds per HEAD request
+SIZE_PROBE_WORKERS = 6
+CONTENT_LENGTH_CACHE_SIZE = 256
+
+# --- Format Recommendations ---
+# Throughput samples (bytes/s) kept from recent downloads
+RECENT_THROUGHPUT_SAMPLES = 5
+# Relative quality per bit; more efficient codecs look as good at a lower size
+CODEC_EFFICIENCY = {
+    "av1": 1.5,
+    "hevc": 1.4,
+    "vp9": 1.3,
+    "avc": 1.0,
+    "opus": 1.3,
+    "vorbis": 1.1,
+    "aac": 1.0,
+    "mp3": 0.9,
+}
+FASTEST_MAX_HEIGHT = 720
+
+# --- Output Container Planning ---
+# Post-download work an option needs, cheapest first
+COST_NONE = "none"
+COST_REMUX = "remux"
+COST_TRANSCODE = "transcode"
+# Score penalty per cost, so equal options that skip ffmpeg rank higher
+COST_PENALTY = {COST_NONE: 0.0, COST_REMUX: 0.05, COST_TRANSCODE: 0.5}
+# Seconds of post-processing per second of media (remux copies, transcode encodes)
+POSTPROCESS_TIME_FACTOR = {COST_NONE: 0.0, COST_REMUX: 0.02, COST_TRANSCODE: 1.0}
+# Bytes/s assumed for time ranking until a download has been measured
+FALLBACK_THROUGHPUT = 2 * 1024 * 1024
+# Codec families that play back from MP4 everywhere
+MP4_VIDEO_CODECS = ("avc", "hevc", "av1")
+MP4_AUDIO_CODECS = ("aac", "mp3")
+
+# --- Audio Pipeline ---
+# Target -> label, output extension, codec family and ffmpeg encoder/args
+AUDIO_TARGETS = {
+    "native": {
+        "label": "Original format (no re-encode)",
+        "ext": None,
+        "codec": None,
+        "encoder": None,
+        "args": None,
+    },
+    "mp3": {
+        "label": "MP3",
+        "ext": "mp3",
+        "codec": "mp3",
+        "encoder": "libmp3lame",
+        "args": ["-c:a", "libmp3lame", "-q:a", "2"],
+    },
+    "m4a": {
+        "label": "M4A (AAC)",
+        "ext": "m4a",
+        "codec": "aac",
+        "encoder": "aac",
+        "args": ["-c:a", "aac", "-b:a", "192k"],
+    },
+    "opus": {
+        "label": "Opus",
+        "ext": "opus",
+        "codec": "opus",
+        "encoder": "libopus",
+        "args": ["-c:a", "libopus", "-b:a", "128k"],
+    },
+}
+# ffmpeg processes converting audio at once
+AUDIO_CONVERSION_WORKERS = max(1, min(4, os.cpu_count() or 1))
+
+# --- Local Post-Processing ---
+# Per-file keyframe indexes for clips cut from already downloaded media
+KEYFRAME_INDEX_DIR = "keyframe_index"
+# Local clip/export jobs run at once (video re-encodes are CPU heavy)
+POSTPROCESS_WORKERS = max(1, min(2, os.cpu_count() or 1))
+EXPORT_HEIGHTS = (1080, 720, 480, 360)
+# Files with no video to re-encode; clips from them are always copies
+AUDIO_FILE_EXTENSIONS = (
+    ".mp3",
+    ".m4a",
+    ".aac",
+    ".opus",
+    ".ogg",
+    ".oga",
+    ".wav",
+    ".flac",
+)
+
+# --- Timeline Filmstrip ---
+FILMSTRIP_FRAMES = 12
+FILMSTRIP_FRAME_WIDTH = 160  # pixels; frames are scaled by ffmpeg before sending
+# Frames sampled at once; each is one ffmpeg seeking into the remote stream
+FILMSTRIP_WORKERS = 4
+FILMSTRIP_SAMPLE_TIMEOUT = 20  # seconds per frame
+FILMSTRIP_CACHE_SIZE = 8  # videos
+# Stream protocols ffmpeg can seek into without a download first
+PREVIEW_STREAM_PROTOCOLS = ("http", "https", "m3u8", "m3u8_native")
+
+# --- Trim Point Preview ---
+PREVIEW_WINDOW = 4  # seconds decoded after a start point / before an end point
+PREVIEW_FPS = 10
+PREVIEW_FRAME_WIDTH = 320
+# Past this without a decoded frame, the nearest timeline frame stands in
+PREVIEW_FIRST_FRAME_TARGET = 1.0  # seconds
+# Buffered windows kept for the session, per video and in total videos
+PREVIEW_SEGMENTS_PER_VIDEO = 12
+PREVIEW_VIDEOS = 4
+
+# --- History File Status ---
+FILE_STATUS_CHECKING = "Checking..."
+FILE_STATUS_PRESENT = "Completed"
+FILE_STATUS_MISSING = "Missing"
+FILE_STATUS_SIZE_MISMATCH = "Size Mismatch"
 
 # --- Clean, Professional Color Palettes (Like Your Reference UI) ---
 PALETTES = {
@@ -274,14 +470,14 @@ def generate_qss(palette_key):
         }}
         
         /* ===== CLEAN LIST WIDGET (LIKE REFERENCE UI) ===== */
-        QListWidget {{
+        QListView {{
             border: 1px solid {p['BORDER']};
             border-radius: 6px;
             background-color: {p['BG_CARD']};
             padding: 4px;
             outline: none;
         }}
-        QListWidget::item {{
+        QListView::item {{
             padding: 10px 12px;
             background-color: transparent;
             border: none;
@@ -290,10 +486,10 @@ def generate_qss(palette_key):
             font-family: "Consolas", "Courier New", monospace;
             font-size: 9pt;
         }}
-        QListWidget::item:hover {{
+        QListView::item:hover {{
             background-color: {QColor(p['ACCENT_BLUE']).lighter(195).name()};
         }}
-        QListWidget::item:selected {{
+        QListView::item:selected {{
             background-color: {QColor(p['ACCENT_BLUE']).lighter(180).name()};
             color: {p['TEXT_PRIMARY']};
             font-weight: 600;
@@ -349,13 +545,95 @@ def generate_qss(palette_key):
         QScrollBar::handle:vertical:hover {{
             background: {p['TEXT_SECONDARY']};
         }}
+
+        /* ===== DETAIL LABELS ===== */
+        QLabel#MetaKeyLabel {{
+            font-weight: 600;
+            color: #666666;
+        }}
+        QLabel#MetaValueLabel {{
+            font-weight: 500;
+            color: #333333;
+        }}
+        QLabel#ListHeaderLabel {{
+            font-weight: 600;
+            color: #888888;
+            font-size: 9pt;
+            padding: 5px;
+        }}
+
+        /* ===== STATUS LABEL (state set via dynamic property) ===== */
+        QLabel#StatusLabel {{
+            background-color: {p['BG_CARD']};
+            color: {p['TEXT_PRIMARY']};
+            padding: 10px;
+            font-weight: 500;
+            font-size: 10pt;
+            border-radius: 6px;
+            border: 1px solid {p['BORDER']};
+        }}
+        QLabel#StatusLabel[state="success"] {{
+            background-color: #D4EDDA;
+            color: #155724;
+            border-color: #28A745;
+        }}
+        QLabel#StatusLabel[state="error"] {{
+            background-color: #FFF3CD;
+            color: #856404;
+            border-color: #FFC107;
+        }}
     """
     return qss
 
 
+# Compiled stylesheets per palette key
+_QSS_CACHE = {}
+
+
+def get_qss(palette_key):
+    """Returns the stylesheet for a palette, compiling it only once."""
+    if palette_key not in PALETTES:
+        palette_key = "light"
+    if palette_key not in _QSS_CACHE:
+        _QSS_CACHE[palette_key] = generate_qss(palette_key)
+    return _QSS_CACHE[palette_key]
+
+
+def precompile_stylesheets():
+    """Compiles and caches the stylesheet of every palette."""
+    for palette_key in PALETTES:
+        get_qss(palette_key)
+
+
 # --- Utility Functions ---
 
 
+def backup_paths(path):
+    """Returns the rolling backup paths for a file, newest first."""
+    return [f"{path}.bak.{i}" for i in range(1, BACKUP_COUNT + 1)]
+
+
+def read_json_file(path, expected_type):
+    """Reads a JSON file, falling back to its rolling backups if it is corrupt.
+
+    Returns None when neither the file nor any backup holds valid data.
+    """
+    for candidate in [path] + backup_paths(path):
+        if not os.path.exists(candidate):
+            continue
+        try:
+            with open(candidate, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if isinstance(data, expected_type):
+                if candidate != path:
+                    print(f"Recovered {path} from backup {candidate}.")
+                return data
+        except (OSError, ValueError):
+            pass
+        print(f"Error reading {candidate}.")
+    return None
+
+
 def load_config():
     """Loads configuration with all default values."""
     default_config = {
@@ -364,52 +642,350 @@ def load_config():
         "theme": "light",
         "window_width": 1400,
         "window_height": 900,
+        "ytdlp_cache_dir": YTDLP_CACHE_DIR,
+        "source_cache_enabled": False,
+        "source_cache_dir": SOURCE_CACHE_DIR,
+        "source_cache_quota_gb": 10,
+        "clipboard_prefetch": False,
+        "probe_format_sizes": False,
+        "recent_throughput": [],
+        "force_mp4": False,
+        "audio_target": "native",
     }
 
-    if os.path.exists(CONFIG_FILE):
-        try:
-            with open(CONFIG_FILE, "r", encoding="utf-8") as f:
-                config = json.load(f)
-                for key, value in default_config.items():
-                    if key not in config:
-                        config[key] = value
-                if config["theme"] not in PALETTES:
-                    config["theme"] = "light"
-                return config
-        except json.JSONDecodeError:
-            print("Error reading config.json. Using defaults.")
-            return default_config
-    return default_config
+    config = read_json_file(CONFIG_FILE, dict)
+    if config is None:
+        return default_config
+
+    for key, value in default_config.items():
+        if key not in config:
+            config[key] = value
+    if config["theme"] not in PALETTES:
+        config["theme"] = "light"
+    return config
+
+
+def fsync_directory(directory):
+    """Flushes a directory entry so a rename survives power loss (no-op on Windows)."""
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    try:
+        fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def rotate_backups(path):
+    """Copies the current file into the rolling backup chain."""
+    if not os.path.exists(path):
+        return
+    backups = backup_paths(path)
+    for older, newer in reversed(list(zip(backups[1:], backups[:-1]))):
+        if os.path.exists(newer):
+            os.replace(newer, older)
+    shutil.copy2(path, backups[0])
+
+
+def atomic_write_json(path, data, backup=False):
+    """Writes JSON to a temp file, fsyncs it, then renames it over the target.
+
+    With backup=True the previous version is kept in the rolling backup chain.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(
+        prefix=f".{os.path.basename(path)}.", suffix=".tmp", dir=directory
+    )
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=4)
+            f.flush()
+            os.fsync(f.fileno())
+        if backup:
+            rotate_backups(path)
+        os.replace(tmp_path, path)
+        fsync_directory(directory)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
 
 
 def save_config(config):
     """Saves the current configuration."""
-    with open(CONFIG_FILE, "w", encoding="utf-8") as f:
-        json.dump(config, f, indent=4)
+    atomic_write_json(CONFIG_FILE, config, backup=True)
+
+
+class ConfigService(QObject):
+    """Single in-memory copy of config.json with debounced write-behind saves.
+
+    Must be used from the GUI thread (the save timer lives there).
+    """
+
+    changed = pyqtSignal(str, object)
+
+    SAVE_DELAY_MS = 750
+
+    def __init__(self):
+        super().__init__()
+        self._config = load_config()
+
+        self._save_timer = QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(self.SAVE_DELAY_MS)
+        self._save_timer.timeout.connect(self.flush)
+        self._dirty = False
+
+    @property
+    def data(self):
+        """The live config dict. Treat as read-only; use set() to change values."""
+        return self._config
+
+    def get(self, key, default=None):
+        return self._config.get(key, default)
+
+    def set(self, key, value):
+        """Updates a value, notifies listeners and schedules a save."""
+        if self._config.get(key) == value:
+            return
+        self._config[key] = value
+        self._dirty = True
+        self._save_timer.start()
+        self.changed.emit(key, value)
+
+    def flush(self):
+        """Writes pending changes to disk immediately."""
+        self._save_timer.stop()
+        if self._dirty:
+            save_config(self._config)
+            self._dirty = False
+
+
+_config_service = None
+
+
+def get_config_service():
+    """Returns the shared ConfigService, reading config.json on first use."""
+    global _config_service
+    if _config_service is None:
+        _config_service = ConfigService()
+    return _config_service
 
 
 def get_media_folder():
     """Returns the absolute path to the media folder."""
-    config = load_config()
-    return os.path.abspath(config["media_folder"])
+    return os.path.abspath(get_config_service().get("media_folder"))
+
+
+def get_ytdlp_cache_dir():
+    """Returns the absolute path to the managed yt-dlp cache directory."""
+    return os.path.abspath(
+        get_config_service().get("ytdlp_cache_dir") or YTDLP_CACHE_DIR
+    )
+
+
+def get_source_cache_dir():
+    """Returns the absolute path to the source cache directory."""
+    return os.path.abspath(
+        get_config_service().get("source_cache_dir") or SOURCE_CACHE_DIR
+    )
+
+
+def get_directory_size(path):
+    """Returns (total bytes, file count) for everything under a directory."""
+    total = 0
+    count = 0
+    for root, dirs, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+                count += 1
+            except OSError:
+                continue
+    return total, count
 
 
 def load_db():
-    """Loads the download history database."""
-    if os.path.exists(HISTORY_FILE):
-        try:
-            with open(HISTORY_FILE, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except json.JSONDecodeError:
-            print("Error reading history.json. Starting fresh.")
-            return []
-    return []
+    """Loads the download history snapshot (without the journal)."""
+    db = read_json_file(HISTORY_FILE, list)
+    if db is None:
+        if os.path.exists(HISTORY_FILE):
+            print("Error reading history.json and its backups. Starting fresh.")
+        return []
+    return db
 
 
 def save_db(data):
-    """Saves the download history database."""
-    with open(HISTORY_FILE, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=4)
+    """Saves the download history snapshot."""
+    atomic_write_json(HISTORY_FILE, data, backup=True)
+
+
+def read_journal(path):
+    """Returns (valid entries, damaged line count) of a JSON-lines journal.
+
+    A torn final line (crash mid-append) is skipped and counted as damaged.
+    """
+    entries = []
+    damaged = 0
+    if not os.path.exists(path):
+        return entries, damaged
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    damaged += 1
+                    print(f"Ignoring damaged entry in {path}.")
+    except OSError:
+        print(f"Error reading {path}.")
+    return entries, damaged
+
+
+class HistoryStore:
+    """In-memory download history keyed by stable record IDs.
+
+    history.json is a snapshot; each mutation is appended to history.journal
+    and replayed on load. The journal is folded into a new snapshot every
+    JOURNAL_CHECKPOINT_ENTRIES entries and on checkpoint().
+
+    With autoload=False nothing is read until ensure_loaded() or the first
+    access, so the load can be moved off the startup path.
+    """
+
+    def __init__(self, autoload=True):
+        self._records = {}
+        self._journal_entries = 0
+        self.loaded = False
+        if autoload:
+            self.load()
+
+    def ensure_loaded(self):
+        if not self.loaded:
+            self.load()
+
+    def load(self):
+        """(Re)loads the snapshot, replays the journal and assigns missing IDs."""
+        db = load_db()
+        missing_ids = False
+        self.loaded = True
+
+        self._records = {}
+        for record in db:
+            if not isinstance(record, dict):
+                continue
+            if not record.get("id") or record["id"] in self._records:
+                record["id"] = uuid.uuid4().hex
+                missing_ids = True
+            self._records[record["id"]] = record
+
+        journal, damaged = read_journal(HISTORY_JOURNAL_FILE)
+        for entry in journal:
+            self._apply(entry)
+        self._journal_entries = len(journal)
+
+        # A damaged line would otherwise stay in the journal for good; the
+        # snapshot holds everything that could be replayed.
+        if missing_ids or damaged:
+            self.checkpoint()
+
+    def _apply(self, entry):
+        """Applies one journal entry to the in-memory records."""
+        op = entry.get("op")
+        if op == "add":
+            record = entry.get("record") or {}
+            if record.get("id"):
+                self._records[record["id"]] = record
+        elif op == "remove":
+            for record_id in entry.get("ids", []):
+                self._records.pop(record_id, None)
+        elif op == "clear":
+            self._records = {}
+
+    def _log(self, entry):
+        """Durably appends a mutation to the journal."""
+        with open(HISTORY_JOURNAL_FILE, "ab+") as f:
+            # Never append onto a torn last line, or both are lost on replay
+            if f.seek(0, os.SEEK_END):
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    f.write(b"\n")
+            f.write((json.dumps(entry) + "\n").encode("utf-8"))
+            f.flush()
+            os.fsync(f.fileno())
+
+        self._journal_entries += 1
+        if self._journal_entries >= JOURNAL_CHECKPOINT_ENTRIES:
+            self.checkpoint()
+
+    def checkpoint(self):
+        """Writes a snapshot of all records and truncates the journal."""
+        # Entries journaled before the load must not be snapshotted alone
+        self.ensure_loaded()
+        save_db(list(self._records.values()))
+        # Replaying the old journal over the new snapshot is harmless, so a
+        # crash between these two steps loses nothing.
+        if os.path.exists(HISTORY_JOURNAL_FILE):
+            os.remove(HISTORY_JOURNAL_FILE)
+        self._journal_entries = 0
+
+    def has_pending_journal(self):
+        return self._journal_entries > 0
+
+    def records(self):
+        """Returns records oldest first."""
+        self.ensure_loaded()
+        return list(self._records.values())
+
+    def get(self, record_id):
+        """Returns the record with the given ID, or None."""
+        self.ensure_loaded()
+        return self._records.get(record_id)
+
+    def add(self, record):
+        """Adds a record and returns its ID."""
+        self.ensure_loaded()
+        record_id = record.get("id") or uuid.uuid4().hex
+        record["id"] = record_id
+        self._records[record_id] = record
+        self._log({"op": "add", "record": record})
+        return record_id
+
+    def remove(self, record_id):
+        """Removes a record; returns it, or None if it did not exist."""
+        self.ensure_loaded()
+        record = self._records.pop(record_id, None)
+        if record is not None:
+            self._log({"op": "remove", "ids": [record_id]})
+        return record
+
+    def remove_many(self, record_ids):
+        """Removes several records with a single journal entry."""
+        self.ensure_loaded()
+        removed_ids = [
+            record_id
+            for record_id in record_ids
+            if self._records.pop(record_id, None) is not None
+        ]
+        if removed_ids:
+            self._log({"op": "remove", "ids": removed_ids})
+        return len(removed_ids)
+
+    def clear(self):
+        """Removes every record."""
+        self.loaded = True
+        self._records = {}
+        self._log({"op": "clear"})
+
+    def __len__(self):
+        self.ensure_loaded()
+        return len(self._records)
 
 
 def format_bytes(size_bytes):
@@ -427,210 +1003,2652 @@ def format_bytes(size_bytes):
     return f"{size_bytes:.2f} {size_name[i]}"
 
 
-def is_image_url(url):
-    """Checks if URL is a direct image file."""
-    if not url:
-        return False
-    path = urlparse(url).path
-    if not path:
+def parse_size_string(size_str):
+    """Converts a human-readable size (as written by format_bytes) back to bytes."""
+    try:
+        parts = size_str.split()
+        if len(parts) == 2:
+            multipliers = {
+                "B": 1,
+                "KB": 1024,
+                "MB": 1024**2,
+                "GB": 1024**3,
+                "TB": 1024**4,
+            }
+            if parts[1] in multipliers:
+                return float(parts[0]) * multipliers[parts[1]]
+    except (AttributeError, ValueError):
+        pass
+    return None
+
+
+def is_valid_media_url(url):
+    """Checks that a URL is syntactically complete enough to try extracting."""
+    if not url or any(c.isspace() for c in url):
         return False
-    ext = Path(path).suffix.lower()
-    return ext in [".jpg", ".jpeg", ".png", ".gif", ".bmp", ".webp", ".tiff", ".svg"]
+    parsed = urlparse(url)
+    return parsed.scheme in ("http", "https") and "." in parsed.netloc
 
 
-# --- Simple Loading Overlay (Clean Design) ---
+class BoundedCache:
+    """Small thread-safe LRU mapping that drops the oldest entry when full.
 
+    With ttl (seconds) set, entries also expire that long after their put.
+    """
 
-class LoadingOverlay(QWidget):
-    """Clean loading overlay with spinning animation."""
+    def __init__(self, max_size, ttl=None):
+        self.max_size = max_size
+        self.ttl = ttl
+        # key -> (value, monotonic time of the put)
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
 
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self.setAttribute(Qt.WA_StyledBackground, True)
-        self.setAttribute(Qt.WA_TranslucentBackground, True)
+    def _live(self, key):
+        """True if key is present and not expired (call with the lock held)."""
+        if key not in self._items:
+            return False
+        if self.ttl is not None and time.monotonic() - self._items[key][1] > self.ttl:
+            del self._items[key]
+            return False
+        return True
 
-        self.setStyleSheet(
-            """
-            LoadingOverlay {
-                background-color: rgba(0, 0, 0, 120);
-                border-radius: 12px;
-            }
-        """
-        )
+    def get(self, key, default=None):
+        with self._lock:
+            if not self._live(key):
+                return default
+            self._items.move_to_end(key)
+            return self._items[key][0]
 
-        layout = QVBoxLayout(self)
-        layout.setAlignment(Qt.AlignCenter)
+    def put(self, key, value):
+        with self._lock:
+            self._items[key] = (value, time.monotonic())
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
 
-        # Spinner
-        self.spinner_label = QLabel()
-        self.spinner_label.setFixedSize(60, 60)
-        self.spinner_label.setStyleSheet("background: transparent;")
-        layout.addWidget(self.spinner_label, alignment=Qt.AlignCenter)
+    def pop(self, key, default=None):
+        with self._lock:
+            if not self._live(key):
+                return default
+            return self._items.pop(key)[0]
 
-        # Message
-        self.message_label = QLabel("Loading...")
-        self.message_label.setAlignment(Qt.AlignCenter)
-        self.message_label.setStyleSheet(
-            """
-            color: white; 
-            font-size: 14pt; 
-            font-weight: 600;
-            background: transparent;
-            padding: 10px;
-        """
-        )
-        layout.addWidget(self.message_label)
+    def __contains__(self, key):
+        with self._lock:
+            return self._live(key)
 
-        # Animation
-        self.rotation_angle = 0
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.rotate_spinner)
+    def __len__(self):
+        with self._lock:
+            return len(self._items)
 
-        self.hide()
 
-    def rotate_spinner(self):
-        """Rotates the spinner."""
-        self.rotation_angle = (self.rotation_angle + 12) % 360
-        self.update_spinner()
+def fetch_url_bytes(url, timeout=10, require_image=False):
+    """Downloads a small resource (thumbnail, image) and returns its bytes."""
+    req = urllib.request.Request(url, headers={"User-Agent": "Mozilla/5.0"})
 
-    def update_spinner(self):
-        """Draws rotating spinner."""
-        pixmap = QPixmap(60, 60)
-        pixmap.fill(Qt.transparent)
+    with urllib.request.urlopen(req, timeout=timeout) as response:
+        if response.getcode() != 200:
+            raise Exception(f"HTTP Error: {response.getcode()}")
 
-        painter = QPainter(pixmap)
-        painter.setRenderHint(QPainter.Antialiasing)
+        if require_image:
+            content_type = response.info().get_content_type()
+            if not content_type.startswith("image/"):
+                raise Exception(f"URL did not return an image (got: {content_type})")
 
-        pen = painter.pen()
-        pen.setWidth(4)
-        pen.setCapStyle(Qt.RoundCap)
-        pen.setColor(QColor("#4A90E2"))
-        painter.setPen(pen)
+        return response.read()
 
-        painter.translate(30, 30)
-        painter.rotate(self.rotation_angle)
 
-        for i in range(8):
-            painter.rotate(45)
-            painter.drawLine(0, -20, 0, -15)
+def estimate_format_size(f, duration):
+    """Returns (size_bytes, is_estimate) for a yt-dlp format dict.
 
-        painter.end()
-        self.spinner_label.setPixmap(pixmap)
+    Falls back from the reported filesize to a size probed earlier by HEAD
+    request, then yt-dlp's approximation, and finally the format's bitrate
+    over the media duration. Returns (None, True) when nothing is known.
+    """
+    if f.get("filesize"):
+        return f["filesize"], False
 
-    def showEvent(self, event):
-        """Centers overlay and starts animation."""
-        if self.parent():
-            self.setGeometry(self.parent().rect())
-        self.timer.start(50)
-        self.update_spinner()
-        super().showEvent(event)
+    url = f.get("url")
+    probed = CONTENT_LENGTH_CACHE.get(url) if url else None
+    if probed:
+        return probed, False
 
-    def hideEvent(self, event):
-        """Stops animation."""
-        self.timer.stop()
-        super().hideEvent(event)
+    if f.get("filesize_approx"):
+        return f["filesize_approx"], True
 
-    def set_message(self, message):
-        """Updates loading message."""
-        self.message_label.setText(message)
+    if not duration:
+        return None, True
 
+    # Bitrates are in kbit/s; 1 kbit/s for one second is 125 bytes
+    vcodec = f.get("vcodec", "none")
+    acodec = f.get("acodec", "none")
+    if vcodec != "none" and acodec == "none":
+        bitrate = f.get("vbr") or f.get("tbr")
+    elif vcodec == "none" and acodec != "none":
+        bitrate = f.get("abr") or f.get("tbr")
+    else:
+        bitrate = f.get("tbr") or (f.get("vbr") or 0) + (f.get("abr") or 0)
 
-# --- Worker Thread: Fetch Metadata ---
+    if not bitrate:
+        return None, True
+    return int(bitrate * duration * 125), True
 
 
-class YtdlpWorker(QThread):
-    """Thread to fetch video/audio metadata using yt-dlp."""
+def probe_content_length(url, timeout=SIZE_PROBE_TIMEOUT):
+    """Returns the Content-Length of a URL from a HEAD request, or None.
 
-    metadata_fetched = pyqtSignal(dict)
-    error_occurred = pyqtSignal(str)
+    Successful results are cached per URL for the session.
+    """
+    cached = CONTENT_LENGTH_CACHE.get(url)
+    if cached is not None:
+        return cached
 
-    def __init__(self, url):
-        super().__init__()
-        self.url = url
+    req = urllib.request.Request(
+        url, method="HEAD", headers={"User-Agent": "Mozilla/5.0"}
+    )
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as response:
+            length = int(response.headers.get("Content-Length") or 0)
+    except (OSError, ValueError):
+        return None
 
-    def run(self):
-        try:
-            ydl_opts = {
-                "quiet": True,
-                "no_warnings": True,
-                "skip_download": True,
-                "extract_flat": False,
-            }
+    if length <= 0:
+        return None
+    CONTENT_LENGTH_CACHE.put(url, length)
+    return length
 
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(self.url, download=False)
-                self.metadata_fetched.emit(info)
 
-        except Exception as e:
-            error_msg = str(e)
-            if "Unsupported URL" in error_msg or "No video" in error_msg:
-                self.error_occurred.emit(
-                    "This URL is not supported. Please try a video/audio link from YouTube, "
-                    "Vimeo, or other supported platforms."
-                )
-            else:
-                self.error_occurred.emit(f"Failed to fetch metadata: {error_msg}")
+def image_filename_from_url(url):
+    """Returns the file name to save a direct image link under."""
+    return Path(urlparse(url).path).name or "downloaded_image.jpg"
 
 
-# --- Worker Thread: Download Image ---
+def parse_hms(text):
+    """Parses "HH:MM:SS" into seconds; raises ValueError on other input."""
+    parsed = datetime.strptime(text.strip(), "%H:%M:%S")
+    return parsed.hour * 3600 + parsed.minute * 60 + parsed.second
 
 
-class ImageDownloadWorker(QThread):
-    """Thread to download direct image links."""
+def format_hms(seconds, sep=":"):
+    """Formats seconds as HH:MM:SS (sep="-" gives a filename-safe form)."""
+    minutes, secs = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours:02d}{sep}{minutes:02d}{sep}{secs:02d}"
 
-    image_data_fetched = pyqtSignal(bytes, str)
-    error_occurred = pyqtSignal(str)
 
-    def __init__(self, url):
-        super().__init__()
-        self.url = url
+def cut_clips(ffmpeg_path, source, ranges, offset, output_dir, stem=None):
+    """Writes each (start, end) range of source to its own file in one ffmpeg run.
 
-    def run(self):
+    Ranges are in media time (end None runs to the end) and offset is the
+    media time source starts at. Every output copies the streams, so the
+    input is read once and nothing is re-encoded. Existing files are never
+    overwritten; a repeated cut gets a numbered name. Returns (path, range
+    label) for each clip.
+    """
+    source_stem, ext = os.path.splitext(os.path.basename(source))
+    stem = stem or source_stem
+    command = [
+        ffmpeg_path,
+        "-hide_banner",
+        "-loglevel",
+        "error",
+        "-nostdin",
+        "-n",
+        "-i",
+        source,
+    ]
+    outputs = []
+    for i, (start, end) in enumerate(ranges, 1):
+        end_text = format_hms(end, "-") if end is not None else "end"
+        span = f"{format_hms(start, '-')} to {end_text}"
+        name = (
+            f"{stem} (clip {i} {span}){ext}"
+            if len(ranges) > 1
+            else f"{stem} ({span}){ext}"
+        )
+        path = unique_path(
+            os.path.join(output_dir, name), taken=[p for p, _ in outputs]
+        )
+
+        command += ["-map", "0:v?", "-map", "0:a?", "-ss", f"{start - offset:.3f}"]
+        if end is not None:
+            command += ["-to", f"{end - offset:.3f}"]
+        command += ["-c", "copy", path]
+
+        label_end = format_hms(end) if end is not None else "end"
+        outputs.append((path, f"{format_hms(start)}-{label_end}"))
+
+    process = FFMPEG_JOBS.popen(
+        command,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+        errors="replace",
+    )
+    try:
+        _, stderr = process.communicate()
+    finally:
+        FFMPEG_JOBS.release(process)
+    if process.returncode != 0:
+        # The names were free before the run, so anything there is partial
+        for path, _ in outputs:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        details = stderr.strip().splitlines()
+        raise RuntimeError(
+            details[-1] if details else f"ffmpeg exited with {process.returncode}"
+        )
+    return outputs
+
+
+def load_keyframe_index(ffprobe_path, path, index_dir=KEYFRAME_INDEX_DIR):
+    """Returns {"duration", "keyframes"} for a media file, probing it only once.
+
+    Keyframe times come from packet flags, so nothing is decoded. The index
+    is cached as JSON per file and reused while its size and mtime match.
+    """
+    stat = os.stat(path)
+    key = hashlib.sha1(os.path.abspath(path).encode("utf-8")).hexdigest()
+    cache_path = os.path.join(index_dir, key + ".json")
+
+    cached = read_json_file(cache_path, dict) if os.path.exists(cache_path) else None
+    if (
+        cached
+        and cached.get("size") == stat.st_size
+        and cached.get("mtime") == stat.st_mtime
+    ):
+        DEBUG_METRICS.add("keyframe_index_hits")
+        return cached
+
+    def probe(*args):
+        return subprocess.run(
+            [ffprobe_path, "-v", "error", *args, "-of", "csv=p=0", path],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            errors="replace",
+        ).stdout.splitlines()
+
+    try:
+        duration = float(probe("-show_entries", "format=duration")[0])
+    except (IndexError, ValueError):
+        duration = None
+
+    keyframes = []
+    for line in probe(
+        "-select_streams", "v:0", "-show_entries", "packet=pts_time,flags"
+    ):
+        pts, _, flags = line.partition(",")
+        if "K" in flags:
+            try:
+                keyframes.append(float(pts))
+            except ValueError:
+                continue
+
+    index = {
+        "size": stat.st_size,
+        "mtime": stat.st_mtime,
+        "duration": duration,
+        "keyframes": sorted(keyframes),
+    }
+    try:
+        Path(index_dir).mkdir(exist_ok=True)
+        atomic_write_json(cache_path, index)
+    except OSError:
+        pass
+    DEBUG_METRICS.add("keyframe_index_built")
+    return index
+
+
+def keyframe_before(keyframes, seconds):
+    """Returns the latest keyframe at or before seconds (or seconds itself
+    when the file has no video keyframes, e.g. audio)."""
+    if not keyframes:
+        return seconds
+    i = bisect.bisect_right(keyframes, seconds)
+    return keyframes[i - 1] if i else 0.0
+
+
+def unique_path(path, taken=()):
+    """Returns path, or "name (2).ext" and so on if it exists or is taken."""
+    stem, ext = os.path.splitext(path)
+    candidate = path
+    n = 2
+    while os.path.exists(candidate) or candidate in taken:
+        candidate = f"{stem} ({n}){ext}"
+        n += 1
+    return candidate
+
+
+class ChildProcessRegistry:
+    """Tracks running local ffmpeg jobs so closing the app can stop them."""
+
+    def __init__(self):
+        self._processes = set()
+        self._closed = False
+        self._lock = threading.Lock()
+
+    def popen(self, command, **kwargs):
+        """Starts and registers a process; refuses once terminate_all() ran."""
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Stopped on exit")
+            process = subprocess.Popen(command, **kwargs)
+            self._processes.add(process)
+            return process
+
+    def release(self, process):
+        with self._lock:
+            self._processes.discard(process)
+
+    def terminate_all(self):
+        """Kills every running job and refuses new ones."""
+        with self._lock:
+            self._closed = True
+            for process in self._processes:
+                if process.poll() is None:
+                    process.kill()
+
+
+# Audio conversions and local clip/export jobs
+FFMPEG_JOBS = ChildProcessRegistry()
+
+
+def run_ffmpeg_with_progress(command, duration, on_progress):
+    """Runs ffmpeg with -progress output, reporting percent done to on_progress."""
+    command = command[:1] + ["-progress", "pipe:1", "-nostats"] + command[1:]
+    with tempfile.TemporaryFile(mode="w+", errors="replace") as errors:
+        process = FFMPEG_JOBS.popen(
+            command,
+            stdout=subprocess.PIPE,
+            stderr=errors,
+            text=True,
+            errors="replace",
+        )
         try:
-            req = urllib.request.Request(
-                self.url, headers={"User-Agent": "Mozilla/5.0"}
+            for line in process.stdout:
+                key, _, value = line.strip().partition("=")
+                # out_time_ms is in microseconds too (a long-standing ffmpeg quirk)
+                if key in ("out_time_us", "out_time_ms") and duration:
+                    try:
+                        on_progress(min(100.0, int(value) / 1e6 / duration * 100))
+                    except ValueError:
+                        continue
+            process.wait()
+        finally:
+            FFMPEG_JOBS.release(process)
+
+        if process.returncode != 0:
+            errors.seek(0)
+            details = errors.read().strip().splitlines()
+            raise RuntimeError(
+                details[-1] if details else f"ffmpeg exited with {process.returncode}"
             )
+    on_progress(100.0)
 
-            with urllib.request.urlopen(req, timeout=15) as response:
-                if response.getcode() != 200:
-                    raise Exception(f"HTTP Error: {response.getcode()}")
 
-                content_type = response.info().get_content_type()
-                if not content_type.startswith("image/"):
-                    raise Exception(
-                        f"URL did not return an image (got: {content_type})"
-                    )
+def export_clip(
+    ffmpeg_path, ffprobe_path, source, target, start, end, height, on_progress
+):
+    """Cuts [start, end) of a local file, optionally re-encoded to a height.
 
-                image_data = response.read()
-                parsed_url = urlparse(self.url)
-                filename = Path(parsed_url.path).name or "downloaded_image.jpg"
+    Input seeking starts at the keyframe before start, so ffmpeg never reads
+    the file from the beginning. A stream copy has to begin on that keyframe;
+    a re-encode decodes from it and trims precisely to start.
+    """
+    index = load_keyframe_index(ffprobe_path, source)
+    duration = index["duration"]
+    # Checked before ffmpeg runs; its own errors are far less clear
+    if duration and start >= duration:
+        raise ValueError(
+            f"The start time is past the end of the file ({format_hms(duration)})."
+        )
+    if duration:
+        end = min(end, duration) if end else duration
+    if end is not None and end <= start:
+        raise ValueError("The end time must be after the start time.")
+    if height is not None and not index["keyframes"]:
+        raise ValueError("The file has no video to re-encode.")
+    seek = keyframe_before(index["keyframes"], start)
+
+    command = [
+        ffmpeg_path,
+        "-hide_banner",
+        "-loglevel",
+        "error",
+        "-nostdin",
+        "-y",
+        "-ss",
+        f"{seek:.3f}",
+        "-i",
+        source,
+        "-map",
+        "0:v?",
+        "-map",
+        "0:a?",
+    ]
+    # Without a known end (no duration from ffprobe) the cut runs to the end
+    if height is None:
+        length = end - seek if end is not None else None
+        command += ["-t", f"{length:.3f}"] if length is not None else []
+        command += ["-c", "copy"]
+    else:
+        length = end - start if end is not None else None
+        command += ["-ss", f"{start - seek:.3f}"]
+        command += ["-t", f"{length:.3f}"] if length is not None else []
+        command += [
+            "-vf",
+            f"scale=-2:{height}",
+            "-c:v",
+            "libx264",
+            "-preset",
+            "veryfast",
+            "-crf",
+            "23",
+            "-c:a",
+            "aac",
+            "-b:a",
+            "160k",
+            "-movflags",
+            "+faststart",
+        ]
+    command.append(target)
+
+    try:
+        run_ffmpeg_with_progress(command, length, on_progress)
+    except Exception:
+        # A failed or stopped job leaves no partial clip behind
+        try:
+            os.remove(target)
+        except OSError:
+            pass
+        raise
+    return target
 
-                self.image_data_fetched.emit(image_data, filename)
 
-        except Exception as e:
-            self.error_occurred.emit(f"Image download failed: {str(e)}")
+def is_image_url(url):
+    """Checks if URL is a direct image file."""
+    if not url:
+        return False
+    path = urlparse(url).path
+    if not path:
+        return False
+    ext = Path(path).suffix.lower()
+    return ext in [".jpg", ".jpeg", ".png", ".gif", ".bmp", ".webp", ".tiff", ".svg"]
 
 
-# --- Worker Thread: Download Media/Image ---
+# Format URL -> Content-Length found by probe_content_length
+CONTENT_LENGTH_CACHE = BoundedCache(CONTENT_LENGTH_CACHE_SIZE)
 
 
-class DownloadWorker(QThread):
-    """Thread to handle actual downloads (media or image)."""
+class SourceCache:
+    """Full source downloads kept on disk so re-trims never hit the network.
 
-    progress_signal = pyqtSignal(float, str)
-    finished_signal = pyqtSignal(str, str, str, str)
-    error_signal = pyqtSignal(str)
+    Entries are keyed by extractor + video ID + format ID and tracked in an
+    index file with their size and last use. Adding an entry evicts the least
+    recently used ones until the cache fits its quota again; the entry just
+    added is always kept so the job that fetched it can use it. Downloads run
+    in a staging folder, so an interrupted one never sits in the cache
+    uncounted; leftovers there are removed when the index is first loaded.
+    """
 
-    def __init__(
-        self,
-        url,
-        format_id,
-        start_time,
-        end_time,
-        filepath,
-        filename_template,
-        is_image=False,
-    ):
+    def __init__(self, directory, quota_bytes):
+        self.directory = directory
+        self.quota_bytes = quota_bytes
+        self.index_path = os.path.join(directory, SOURCE_CACHE_INDEX)
+        self.staging_root = os.path.join(directory, SOURCE_CACHE_STAGING)
+        self._lock = threading.Lock()
+        self._entries = None
+
+    @staticmethod
+    def make_key(info, format_id):
+        """Returns the cache key for a slim info dict and format, or None."""
+        if not info or not info.get("id"):
+            return None
+        raw = f"{info.get('extractor', 'media')}_{info['id']}_{format_id}"
+        return "".join(c if c.isalnum() or c in "-_" else "_" for c in raw)
+
+    def _load(self):
+        if self._entries is None:
+            self._entries = read_json_file(self.index_path, dict) or {}
+            # Partial files of downloads interrupted in an earlier session
+            shutil.rmtree(self.staging_root, ignore_errors=True)
+        return self._entries
+
+    def _save(self):
+        atomic_write_json(self.index_path, self._entries)
+
+    def lookup(self, key):
+        """Returns the entry for key (with its "path") and marks it used."""
+        with self._lock:
+            entry = self._load().get(key)
+            if entry is None:
+                return None
+
+            path = os.path.join(self.directory, entry["file"])
+            if not os.path.exists(path):
+                del self._entries[key]
+                self._save()
+                return None
+
+            entry["last_used"] = time.time()
+            self._save()
+            DEBUG_METRICS.add("source_cache_hits")
+            return dict(entry, path=path)
+
+    def staging_dir(self):
+        """Creates a private folder to download one source into."""
+        with self._lock:
+            self._load()
+            Path(self.staging_root).mkdir(parents=True, exist_ok=True)
+            return tempfile.mkdtemp(dir=self.staging_root)
+
+    def add(self, key, path, title=""):
+        """Moves a finished download into the cache, registers it and evicts to quota."""
+        with self._lock:
+            entries = self._load()
+            target = os.path.join(self.directory, os.path.basename(path))
+            previous = entries.get(key)
+            if previous is not None and previous["file"] != os.path.basename(path):
+                try:
+                    os.remove(os.path.join(self.directory, previous["file"]))
+                except OSError:
+                    pass
+            os.replace(path, target)
+            path = target
+            entries[key] = {
+                "file": os.path.basename(path),
+                "size": os.path.getsize(path),
+                "title": title,
+                "last_used": time.time(),
+            }
+            self._evict(keep=key)
+            self._save()
+            DEBUG_METRICS.add("source_cache_stores")
+            return dict(entries[key], path=path)
+
+    def _evict(self, keep=None):
+        """Drops least recently used entries until the cache fits its quota."""
+        total = sum(entry["size"] for entry in self._entries.values())
+        by_age = sorted(self._entries.items(), key=lambda item: item[1]["last_used"])
+        for key, entry in by_age:
+            if total <= self.quota_bytes:
+                break
+            if key == keep:
+                continue
+            try:
+                os.remove(os.path.join(self.directory, entry["file"]))
+            except OSError:
+                pass
+            total -= entry["size"]
+            del self._entries[key]
+            DEBUG_METRICS.add("source_cache_evictions")
+
+    def set_quota(self, quota_bytes):
+        with self._lock:
+            self.quota_bytes = quota_bytes
+            self._load()
+            self._evict()
+            self._save()
+
+    def usage(self):
+        """Returns (total bytes, entry count)."""
+        with self._lock:
+            entries = self._load()
+            return sum(entry["size"] for entry in entries.values()), len(entries)
+
+    def clear(self):
+        """Deletes every cached source."""
+        with self._lock:
+            for entry in self._load().values():
+                try:
+                    os.remove(os.path.join(self.directory, entry["file"]))
+                except OSError:
+                    pass
+            self._entries = {}
+            self._save()
+
+
+_source_cache = None
+
+
+def get_source_cache():
+    """Returns the shared SourceCache, or None while the cache is disabled."""
+    global _source_cache
+    service = get_config_service()
+    if not service.get("source_cache_enabled", False):
+        return None
+
+    directory = get_source_cache_dir()
+    quota = int(service.get("source_cache_quota_gb", 10)) * 1024**3
+    if _source_cache is None or _source_cache.directory != directory:
+        Path(directory).mkdir(parents=True, exist_ok=True)
+        _source_cache = SourceCache(directory, quota)
+    elif _source_cache.quota_bytes != quota:
+        _source_cache.set_quota(quota)
+    return _source_cache
+
+
+# --- Debug Metrics ---
+
+
+class DebugMetrics:
+    """Thread-safe counters and timings shown in Settings > Diagnostics."""
+
+    def __init__(self):
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def set(self, name, value):
+        with self._lock:
+            self._values[name] = value
+
+    def add(self, name, amount=1):
+        with self._lock:
+            self._values[name] = self._values.get(name, 0) + amount
+
+    def get(self, name, default=None):
+        with self._lock:
+            return self._values.get(name, default)
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self._values)
+
+
+DEBUG_METRICS = DebugMetrics()
+
+
+def mark_startup(stage):
+    """Records milliseconds since process start for a startup stage."""
+    DEBUG_METRICS.set(f"startup_{stage}_ms", (time.perf_counter() - STARTUP_T0) * 1000)
+
+
+def startup_report():
+    """Returns the startup-timing report as text."""
+    lines = []
+    for stage, label in (
+        ("imports", "Module imports"),
+        ("window", "Window constructed"),
+        ("first_paint", "First paint"),
+        ("history", "History loaded"),
+    ):
+        value = DEBUG_METRICS.get(f"startup_{stage}_ms")
+        lines.append(
+            f"{label + ':':<22}"
+            + (f"{value:8.1f} ms" if value is not None else "     pending")
+        )
+    for key, label in (
+        ("yt_dlp_import_ms", "yt-dlp import (bg):"),
+        ("yt_dlp_warmup_ms", "yt-dlp warm-up (bg):"),
+    ):
+        value = DEBUG_METRICS.get(key)
+        lines.append(
+            f"{label:<22}"
+            + (f"{value:8.1f} ms" if value is not None else "     pending")
+        )
+    return "\n".join(lines)
+
+
+# --- Deferred yt-dlp Import ---
+
+# yt-dlp pulls in hundreds of extractor modules; it is imported off the GUI
+# thread after the window is on screen, or on first use.
+_yt_dlp_module = None
+_yt_dlp_lock = threading.Lock()
+
+
+def load_yt_dlp():
+    """Imports yt-dlp once and returns the module."""
+    global _yt_dlp_module
+    with _yt_dlp_lock:
+        if _yt_dlp_module is None:
+            start = time.perf_counter()
+            import yt_dlp
+
+            _yt_dlp_module = yt_dlp
+            DEBUG_METRICS.set("yt_dlp_import_ms", (time.perf_counter() - start) * 1000)
+    return _yt_dlp_module
+
+
+# Options used for metadata extraction (shared by the warm-up and YtdlpWorker)
+YTDLP_METADATA_OPTS = {
+    "quiet": True,
+    "no_warnings": True,
+    "skip_download": True,
+    "extract_flat": False,
+}
+
+# Extractors instantiated during warm-up (the rest are only class-registered)
+WARMUP_EXTRACTOR_KEYS = ("Youtube", "YoutubeTab", "Generic")
+
+_ytdlp_warmup_future = None
+_ytdlp_warmup_lock = threading.Lock()
+
+
+def _warm_up_yt_dlp():
+    """Imports yt-dlp and primes its extractor registry."""
+    yt_dlp = load_yt_dlp()
+    start = time.perf_counter()
+
+    from yt_dlp.extractor import gen_extractor_classes
+
+    # The first extract_info() matches the URL against every extractor,
+    # compiling ~1700 _VALID_URL regexes; do that here instead.
+    extractor_classes = list(gen_extractor_classes())
+    for ie_class in extractor_classes:
+        ie_class.suitable("https://warmup.invalid/")
+
+    with yt_dlp.YoutubeDL(
+        dict(YTDLP_METADATA_OPTS, cachedir=get_ytdlp_cache_dir())
+    ) as ydl:
+        for ie_key in WARMUP_EXTRACTOR_KEYS:
+            ydl.get_info_extractor(ie_key)
+
+    DEBUG_METRICS.set("yt_dlp_extractor_count", len(extractor_classes))
+    DEBUG_METRICS.set("yt_dlp_warmup_ms", (time.perf_counter() - start) * 1000)
+    return yt_dlp
+
+
+def start_ytdlp_warmup():
+    """Starts the yt-dlp warm-up on a daemon thread; returns its Future."""
+    global _ytdlp_warmup_future
+    with _ytdlp_warmup_lock:
+        if _ytdlp_warmup_future is None:
+            future = Future()
+
+            def run():
+                try:
+                    future.set_result(_warm_up_yt_dlp())
+                except BaseException as e:
+                    future.set_exception(e)
+
+            threading.Thread(target=run, name="yt-dlp-warmup", daemon=True).start()
+            _ytdlp_warmup_future = future
+        return _ytdlp_warmup_future
+
+
+def has_site_extractor(url):
+    """True if a site-specific yt-dlp extractor (not Generic) matches url.
+
+    Returns None until the warm-up has primed the extractor registry, so
+    callers on the UI thread never import or compile it themselves.
+    """
+    future = start_ytdlp_warmup()
+    if not future.done() or future.exception() is not None:
+        return None
+    from yt_dlp.extractor import gen_extractor_classes
+
+    return any(
+        ie_class.ie_key() != "Generic" and ie_class.suitable(url)
+        for ie_class in gen_extractor_classes()
+    )
+
+
+def wait_for_ytdlp_warmup():
+    """Blocks until the warm-up is done and returns the yt-dlp module."""
+    try:
+        return start_ytdlp_warmup().result()
+    except Exception:
+        # A failed warm-up must not stop extraction; import directly instead
+        return load_yt_dlp()
+
+
+# --- FFmpeg Capability Probe ---
+
+
+def _run_ffmpeg_listing(binary, flag):
+    """Runs e.g. `ffmpeg -hide_banner -encoders` and returns the lines after the legend."""
+    result = subprocess.run(
+        [binary, "-hide_banner", flag],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+        errors="replace",
+        timeout=15,
+    )
+    lines = result.stdout.splitlines()
+    for i, line in enumerate(lines):
+        if line.strip().startswith("--"):
+            return lines[i + 1 :]
+    return lines
+
+
+class FFmpegProbe:
+    """Detects ffmpeg/ffprobe capabilities once and caches them on disk.
+
+    The cache is keyed by the ffmpeg binary's path and mtime; a probe only
+    spawns processes again when either changes.
+    """
+
+    def __init__(self, cache_file):
+        self.cache_file = cache_file
+        self._caps = None
+        self._future = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Starts probing on a daemon thread; returns a Future of the caps dict."""
+        with self._lock:
+            if self._future is None or (
+                self._future.done() and not self._is_current(self._caps)
+            ):
+                future = Future()
+
+                def run():
+                    try:
+                        caps = self._probe()
+                        self._caps = caps
+                        future.set_result(caps)
+                    except BaseException as e:
+                        future.set_exception(e)
+
+                threading.Thread(target=run, name="ffmpeg-probe", daemon=True).start()
+                self._future = future
+            return self._future
+
+    def caps(self, wait=True):
+        """Returns the capability dict (None if not ready and wait is False)."""
+        future = self.start()
+        if not wait and not future.done():
+            return None
+        try:
+            return future.result()
+        except Exception:
+            return {"available": False}
+
+    def available(self):
+        return bool(self.caps().get("available"))
+
+    def has_encoder(self, name):
+        return name in (self.caps().get("encoders") or [])
+
+    def _is_current(self, caps):
+        """True while the cached caps still describe the ffmpeg on PATH."""
+        if caps is None:
+            return False
+        path = shutil.which("ffmpeg")
+        if not caps.get("available"):
+            return path is None
+        try:
+            return path == caps.get("path") and os.stat(path).st_mtime == caps.get(
+                "mtime"
+            )
+        except OSError:
+            return False
+
+    def _probe(self):
+        start = time.perf_counter()
+        cached = read_json_file(self.cache_file, dict)
+        if cached is not None and cached.get("available") and self._is_current(cached):
+            DEBUG_METRICS.set("ffmpeg_probe", "cached")
+            return cached
+
+        path = shutil.which("ffmpeg")
+        if path is None:
+            DEBUG_METRICS.set("ffmpeg_probe", "not found")
+            return {"available": False}
+
+        version_output = subprocess.run(
+            [path, "-version"],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            errors="replace",
+            timeout=15,
+        ).stdout
+        version_line = version_output.splitlines()[0] if version_output else ""
+
+        # " V....D libx264   H.264 / AVC ..." -> type V, name libx264
+        encoders = {}
+        for line in _run_ffmpeg_listing(path, "-encoders"):
+            parts = line.split()
+            if len(parts) >= 2 and len(parts[0]) == 6:
+                encoders[parts[1]] = parts[0][0]
+
+        # " E mp4   MP4 (MPEG-4 Part 14)" (muxers listing)
+        muxers = []
+        for line in _run_ffmpeg_listing(path, "-muxers"):
+            parts = line.split()
+            if len(parts) >= 2 and "E" in parts[0]:
+                muxers.append(parts[1])
+
+        software_encoders = sorted(
+            name
+            for name in encoders
+            if not any(marker in name for marker in HWACCEL_ENCODER_MARKERS)
+        )
+
+        caps = {
+            "available": True,
+            "path": path,
+            "mtime": os.stat(path).st_mtime,
+            "ffprobe_path": shutil.which("ffprobe"),
+            "version": version_line,
+            "encoders": sorted(encoders),
+            "video_encoders": sorted(n for n, t in encoders.items() if t == "V"),
+            "audio_encoders": sorted(n for n, t in encoders.items() if t == "A"),
+            "software_encoders": software_encoders,
+            "muxers": sorted(muxers),
+        }
+
+        try:
+            atomic_write_json(self.cache_file, caps)
+        except OSError:
+            pass
+
+        DEBUG_METRICS.set("ffmpeg_probe", "probed")
+        DEBUG_METRICS.set("ffmpeg_probe_ms", (time.perf_counter() - start) * 1000)
+        return caps
+
+
+FFMPEG_PROBE = FFmpegProbe(FFMPEG_CAPS_FILE)
+
+
+# --- Extraction Service ---
+
+# Top-level info fields the preview, format lists and history actually read
+SLIM_INFO_FIELDS = (
+    "id",
+    "title",
+    "uploader",
+    "channel",
+    "extractor",
+    "duration",
+    "ext",
+    "webpage_url",
+    "upload_date",
+    "thumbnail",
+)
+
+# Per-format fields kept; fragments, HTTP headers and manifests are dropped
+SLIM_FORMAT_FIELDS = (
+    "format_id",
+    "format_note",
+    "ext",
+    "protocol",
+    "url",
+    "vcodec",
+    "acodec",
+    "width",
+    "height",
+    "fps",
+    "tbr",
+    "vbr",
+    "abr",
+    "filesize",
+    "filesize_approx",
+)
+
+
+def slim_info(info):
+    """Projects a yt-dlp info dict onto the fields the app uses.
+
+    A full info dict carries every format's fragment list, HTTP headers and
+    manifest URLs, which for long HLS streams runs to megabytes. Only this
+    slim view is cached or kept while a URL is on screen.
+    """
+    slim = {key: info[key] for key in SLIM_INFO_FIELDS if info.get(key) is not None}
+    slim["formats"] = [
+        {key: f[key] for key in SLIM_FORMAT_FIELDS if f.get(key) is not None}
+        for f in info.get("formats") or []
+    ]
+    preview = preview_stream(info)
+    if preview:
+        slim["preview"] = preview
+    return slim
+
+
+def preview_stream(info):
+    """Returns the cheapest seekable video stream of a full info dict, or None.
+
+    The lowest-bitrate format with a video track is what timeline frames are
+    sampled from. Its HTTP headers are kept here, since slim_info drops them
+    from the format list.
+    """
+    candidates = [
+        f
+        for f in info.get("formats") or []
+        if f.get("url") and f.get("protocol", "https") in PREVIEW_STREAM_PROTOCOLS
+        # Unknown codecs count as video only when a frame size is given
+        and (f.get("height") or f.get("vcodec") not in (None, "none"))
+    ]
+    if not candidates:
+        return None
+    best = min(
+        candidates,
+        key=lambda f: (f.get("tbr") or float("inf"), f.get("height") or 0),
+    )
+    return {
+        "format_id": best.get("format_id"),
+        "url": best["url"],
+        "protocol": best.get("protocol", "https"),
+        "height": best.get("height"),
+        "http_headers": best.get("http_headers") or info.get("http_headers") or {},
+    }
+
+
+def ffmpeg_header_args(headers):
+    """ffmpeg input options sending a stream's HTTP headers."""
+    if not headers:
+        return []
+    return ["-headers", "".join(f"{k}: {v}\r\n" for k, v in headers.items())]
+
+
+def media_key(info):
+    """Session key for per-video caches (extractor and video id)."""
+    return (
+        f"{info.get('extractor', '')}:{info.get('id') or info.get('webpage_url', '')}"
+    )
+
+
+def split_jpeg_stream(buffer):
+    """Splits the complete JPEGs off the front of an MJPEG byte stream.
+
+    Returns (frames, rest) where rest is the start of the next frame.
+    """
+    frames = []
+    while True:
+        start = buffer.find(b"\xff\xd8")
+        if start < 0:
+            return frames, b""
+        end = buffer.find(b"\xff\xd9", start + 2)
+        if end < 0:
+            return frames, buffer[start:]
+        frames.append(buffer[start : end + 2])
+        buffer = buffer[end + 2 :]
+
+
+def filmstrip_times(duration, count=FILMSTRIP_FRAMES):
+    """Sample times at the middle of count equal slices of the media."""
+    return [duration * (i + 0.5) / count for i in range(count)]
+
+
+# yt-dlp option profiles served by the extraction service
+EXTRACTION_PROFILES = {
+    "metadata": YTDLP_METADATA_OPTS,
+}
+
+
+class ExtractionService:
+    """Long-lived yt-dlp extraction threads serving requests from a queue.
+
+    Each service thread keeps one warm YoutubeDL per option profile, so
+    extractor instances, the HTTP session, cookies and YouTube player data
+    survive between fetches. YoutubeDL is not thread-safe, which is why
+    instances are per thread rather than shared.
+    """
+
+    def __init__(self, cache_dir, num_threads=2, name="yt-dlp-extract"):
+        self.cache_dir = cache_dir
+        self._queue = queue.Queue()
+        self._threads = []
+        self._closed = False
+        # Bumped by reset(); threads drop their instances when it changes
+        self._generation = 0
+
+        for i in range(num_threads):
+            thread = threading.Thread(
+                target=self._serve, name=f"{name}-{i}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def submit(self, url, profile="metadata"):
+        """Queues an extraction; returns a Future resolving to the slim info.
+
+        Cancelling the Future before a thread picks it up skips the request.
+        """
+        if profile not in EXTRACTION_PROFILES:
+            raise ValueError(f"Unknown extraction profile: {profile}")
+        if self._closed:
+            raise RuntimeError("Extraction service is shut down")
+
+        future = Future()
+        self._queue.put((url, profile, future))
+        return future
+
+    def _serve(self):
+        instances = {}
+        yt_dlp = None
+        generation = self._generation
+
+        while True:
+            request = self._queue.get()
+            if request is None:
+                break
+
+            url, profile, future = request
+            if not future.set_running_or_notify_cancel():
+                continue
+
+            if generation != self._generation:
+                generation = self._generation
+                for ydl in instances.values():
+                    ydl.close()
+                instances.clear()
+
+            try:
+                if yt_dlp is None:
+                    yt_dlp = wait_for_ytdlp_warmup()
+
+                ydl = instances.get(profile)
+                if ydl is None:
+                    ydl = yt_dlp.YoutubeDL(
+                        dict(EXTRACTION_PROFILES[profile], cachedir=self.cache_dir)
+                    )
+                    instances[profile] = ydl
+                    DEBUG_METRICS.add("extraction_instances_created")
+                else:
+                    DEBUG_METRICS.add("extraction_instances_reused")
+
+                start = time.perf_counter()
+                info = ydl.extract_info(url, download=False)
+                DEBUG_METRICS.add("extractions_served")
+                DEBUG_METRICS.set(
+                    "last_extraction_ms", (time.perf_counter() - start) * 1000
+                )
+                # Drop the full info here so callers and caches never hold it
+                future.set_result(slim_info(info))
+                del info
+            except Exception as e:
+                # yt-dlp's own errors leave the instance usable; anything else
+                # may have left it in a bad state, so start fresh next time.
+                if not (yt_dlp and isinstance(e, yt_dlp.utils.YoutubeDLError)):
+                    stale = instances.pop(profile, None)
+                    if stale is not None:
+                        stale.close()
+                future.set_exception(e)
+
+        for ydl in instances.values():
+            ydl.close()
+
+    def reset(self):
+        """Makes every thread start fresh YoutubeDL instances on its next request.
+
+        Instances only belong to their own thread, so they are replaced
+        there; this drops in-memory player and signature data, e.g. after
+        the on-disk cache was cleared.
+        """
+        self._generation += 1
+
+    def shutdown(self):
+        """Stops the service threads after the requests already queued."""
+        if self._closed:
+            return
+        self._closed = True
+        for _ in self._threads:
+            self._queue.put(None)
+
+
+_extraction_service = None
+_background_extraction_service = None
+
+
+def get_extraction_service():
+    """Returns the shared ExtractionService, starting it on first use."""
+    global _extraction_service
+    if _extraction_service is None:
+        _extraction_service = ExtractionService(get_ytdlp_cache_dir())
+    return _extraction_service
+
+
+def reset_extraction_services():
+    """Resets the warm YoutubeDL instances of the services that are running."""
+    for service in (_extraction_service, _background_extraction_service):
+        if service is not None:
+            service.reset()
+
+
+def get_background_extraction_service():
+    """Returns the single-thread service for speculative, low-priority work.
+
+    Kept separate so clipboard pre-resolving and cache pre-warming can never
+    occupy the threads serving the user's own fetches.
+    """
+    global _background_extraction_service
+    if _background_extraction_service is None:
+        _background_extraction_service = ExtractionService(
+            get_ytdlp_cache_dir(), num_threads=1, name="yt-dlp-background"
+        )
+    return _background_extraction_service
+
+
+# --- Format Records ---
+
+
+class FormatRecord:
+    """Compact, typed view of one selectable format.
+
+    Only the fields the UI and the download path need are kept, so the format
+    lists no longer pin a copy of every raw yt-dlp format dict.
+    """
+
+    KIND_BEST = "best"
+    KIND_VIDEO = "video"
+    KIND_MUXED = "muxed"
+    KIND_AUDIO = "audio"
+    KIND_IMAGE = "image"
+    KIND_RECOMMENDED = "recommended"
+
+    __slots__ = (
+        "format_id",
+        "kind",
+        "label",
+        "ext",
+        "container",
+        "cost",
+        "size",
+        "size_is_estimate",
+        "seconds",
+        "height",
+        "fps",
+        "abr",
+        "vcodec",
+        "acodec",
+    )
+
+    def __init__(
+        self,
+        format_id,
+        kind,
+        label,
+        ext="",
+        container=None,
+        cost=COST_NONE,
+        size=None,
+        size_is_estimate=False,
+        seconds=None,
+        height=0,
+        fps=0,
+        abr=0,
+        vcodec="none",
+        acodec="none",
+    ):
+        self.format_id = format_id
+        self.kind = kind
+        self.label = label
+        self.ext = ext
+        # Output extension handed to yt-dlp (None lets yt-dlp choose)
+        self.container = container
+        self.cost = cost
+        self.size = size
+        self.size_is_estimate = size_is_estimate
+        # Estimated download time at the measured throughput, if known
+        self.seconds = seconds
+        self.height = height
+        self.fps = fps
+        self.abr = abr
+        self.vcodec = vcodec
+        self.acodec = acodec
+
+    @classmethod
+    def from_ytdlp(cls, f, kind, label, duration=None, force_mp4=False):
+        """Builds a record from a yt-dlp format dict."""
+        size, size_is_estimate = estimate_format_size(f, duration)
+        if kind == cls.KIND_AUDIO:
+            # Audio is saved in its own container; MP4 forcing is for video
+            container, cost = (f.get("ext") or "unknown").lower(), COST_NONE
+        else:
+            container, cost = container_plan(f, force_mp4=force_mp4)
+        return cls(
+            f["format_id"],
+            kind,
+            label,
+            ext=container.upper(),
+            container=container,
+            cost=cost,
+            size=size,
+            size_is_estimate=size_is_estimate,
+            height=f.get("height") or 0,
+            fps=f.get("fps") or 0,
+            abr=f.get("abr") or 0,
+            vcodec=f.get("vcodec") or "none",
+            acodec=f.get("acodec") or "none",
+        )
+
+    def size_text(self):
+        if not self.size:
+            return "Size Unknown"
+        prefix = "~" if self.size_is_estimate else ""
+        return prefix + format_bytes(self.size)
+
+    def time_text(self):
+        return f"~{format_eta(self.seconds)}" if self.seconds else ""
+
+    def display_text(self):
+        """Fixed-width row text: quality, container, cost, size and time."""
+        return (
+            f"{self.label:<60} {'| ' + self.ext:<8} {self.cost:<10} "
+            f"{self.size_text():>12} {self.time_text():>9}"
+        )
+
+    def __repr__(self):
+        return f"FormatRecord({self.format_id!r}, {self.kind!r}, {self.label!r})"
+
+
+# Palette colour used for each record kind in the format lists
+FORMAT_KIND_COLORS = {
+    FormatRecord.KIND_BEST: "ACCENT_RED",
+    FormatRecord.KIND_VIDEO: "ACCENT_BLUE",
+    FormatRecord.KIND_MUXED: "ACCENT_BLUE",
+    FormatRecord.KIND_AUDIO: "ACCENT_GREEN",
+    FormatRecord.KIND_RECOMMENDED: "ACCENT_PURPLE",
+}
+BOLD_FORMAT_KINDS = (FormatRecord.KIND_BEST, FormatRecord.KIND_RECOMMENDED)
+
+
+class FormatListModel(QAbstractListModel):
+    """List model over FormatRecords.
+
+    Row text, colour and font are produced on demand in data(), so nothing is
+    materialised per item. When there are no records an optional, unselectable
+    placeholder row is shown instead.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._records = []
+        self._placeholder = None
+        self._palette = PALETTES["light"]
+        self._best_font = QFont()
+        self._best_font.setBold(True)
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        if self._records:
+            return len(self._records)
+        return 1 if self._placeholder else 0
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        if not self._records:
+            return self._placeholder if role == Qt.DisplayRole else None
+
+        record = self._records[index.row()]
+        if role == Qt.DisplayRole:
+            return record.display_text()
+        if role == Qt.ForegroundRole:
+            color_key = FORMAT_KIND_COLORS.get(record.kind, "TEXT_PRIMARY")
+            return QColor(self._palette[color_key])
+        if role == Qt.FontRole and record.kind in BOLD_FORMAT_KINDS:
+            return self._best_font
+        return None
+
+    def flags(self, index):
+        if not index.isValid() or not self._records:
+            return Qt.NoItemFlags
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable
+
+    def set_records(self, records, placeholder=None):
+        self.beginResetModel()
+        self._records = list(records)
+        self._placeholder = placeholder
+        self.endResetModel()
+
+    def clear(self):
+        self.set_records([])
+
+    def record(self, row):
+        if 0 <= row < len(self._records):
+            return self._records[row]
+        return None
+
+    def find_row(self, format_id, label):
+        """Returns the row of the record with this format ID and label, or -1."""
+        for row, record in enumerate(self._records):
+            if record.format_id == format_id and record.label == label:
+                return row
+        return -1
+
+    def set_palette(self, palette):
+        """Switches the colour palette; only the foreground role changes."""
+        self._palette = palette
+        if self._records:
+            self.dataChanged.emit(
+                self.index(0), self.index(len(self._records) - 1), [Qt.ForegroundRole]
+            )
+
+
+# --- Format Recommendations ---
+
+
+def codec_family(codec):
+    """Normalises a yt-dlp codec string ("vp09.00.40.08") to a family name."""
+    if not codec or codec == "none":
+        return None
+    name = codec.split(".")[0].lower()
+    aliases = {
+        "av01": "av1",
+        "hvc1": "hevc",
+        "hev1": "hevc",
+        "h265": "hevc",
+        "vp09": "vp9",
+        "avc1": "avc",
+        "avc3": "avc",
+        "h264": "avc",
+        "mp4a": "aac",
+    }
+    return aliases.get(name, name)
+
+
+def estimate_throughput(samples):
+    """Returns the median of recent throughput samples (bytes/s), or None."""
+    samples = sorted(x for x in samples or [] if x and x > 0)
+    if not samples:
+        return None
+    return samples[len(samples) // 2]
+
+
+def format_eta(seconds):
+    """Formats a duration in seconds as "42s", "3m 05s" or "1h 07m"."""
+    seconds = int(round(seconds))
+    if seconds < 60:
+        return f"{max(seconds, 1)}s"
+    minutes, seconds = divmod(seconds, 60)
+    if minutes < 60:
+        return f"{minutes}m {seconds:02d}s"
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h {minutes:02d}m"
+
+
+def container_plan(video, audio=None, force_mp4=False):
+    """Returns (container, cost) for saving a format, or a video+audio pair.
+
+    A single pre-muxed file is saved as-is. A pair has to be merged, which is
+    a stream copy into the first container both fit (mp4, webm, else mkv).
+    When MP4 output is forced, codecs MP4 players do not handle are
+    re-encoded.
+    """
+    vext = (video.get("ext") or "unknown").lower()
+    codecs = [codec_family(video.get("vcodec")), codec_family(video.get("acodec"))]
+    if audio is not None:
+        codecs[1] = codec_family(audio.get("acodec"))
+
+    if force_mp4:
+        compatible = codecs[0] in MP4_VIDEO_CODECS and codecs[1] in (
+            MP4_AUDIO_CODECS + (None,)
+        )
+        if not compatible:
+            return "mp4", COST_TRANSCODE
+        if audio is None and vext == "mp4":
+            return "mp4", COST_NONE
+        return "mp4", COST_REMUX
+
+    if audio is None:
+        return vext, COST_NONE
+
+    aext = (audio.get("ext") or "unknown").lower()
+    if vext == "mp4" and aext in ("m4a", "mp4"):
+        return "mp4", COST_REMUX
+    if vext == "webm" and aext == "webm":
+        return "webm", COST_REMUX
+    return "mkv", COST_REMUX
+
+
+def audio_conversion_plan(acodec, source_ext, target):
+    """Returns (cost, ffmpeg codec args, ext) to save an audio stream as target.
+
+    Streams already in the target codec are only re-wrapped (or kept as they
+    are when the container matches too); anything else is re-encoded.
+    """
+    spec = AUDIO_TARGETS.get(target) or AUDIO_TARGETS["native"]
+    if spec["ext"] is None:
+        return COST_NONE, None, source_ext
+
+    if codec_family(acodec) == spec["codec"]:
+        if source_ext == spec["ext"]:
+            return COST_NONE, None, source_ext
+        return COST_REMUX, ["-c:a", "copy"], spec["ext"]
+    return COST_TRANSCODE, spec["args"], spec["ext"]
+
+
+def convert_audio(ffmpeg_path, source, target, codec_args):
+    """Runs one ffmpeg audio conversion and returns the target path."""
+    process = FFMPEG_JOBS.popen(
+        [
+            ffmpeg_path,
+            "-hide_banner",
+            "-loglevel",
+            "error",
+            "-nostdin",
+            "-y",
+            "-i",
+            source,
+            "-vn",
+            *codec_args,
+            target,
+        ],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+        errors="replace",
+    )
+    try:
+        _, stderr = process.communicate()
+    finally:
+        FFMPEG_JOBS.release(process)
+    if process.returncode != 0:
+        try:
+            os.remove(target)
+        except OSError:
+            pass
+        details = stderr.strip().splitlines()
+        raise RuntimeError(
+            details[-1] if details else f"ffmpeg exited with {process.returncode}"
+        )
+    return target
+
+
+def build_format_candidates(formats, duration, force_mp4=False):
+    """Returns downloadable video options as FormatRecords.
+
+    Pre-muxed formats are used as they are. Each video-only format is paired
+    with the highest-bitrate audio of every audio codec family, so that
+    "with AAC audio" style choices exist. Options without any size estimate
+    are left out, since they cannot be ranked.
+    """
+    best_audio = {}
+    for f in formats:
+        if f.get("vcodec", "none") != "none" or f.get("acodec", "none") == "none":
+            continue
+        family = codec_family(f.get("acodec"))
+        current = best_audio.get(family)
+        if current is None or (f.get("abr") or 0) > (current.get("abr") or 0):
+            best_audio[family] = f
+
+    candidates = []
+    for f in formats:
+        vcodec = f.get("vcodec", "none")
+        acodec = f.get("acodec", "none")
+        if vcodec == "none" or not f.get("height"):
+            continue
+
+        if acodec != "none":
+            pairs = [(f, None)]
+        else:
+            pairs = [(f, audio) for audio in best_audio.values()]
+
+        for video, audio in pairs:
+            size, size_is_estimate = estimate_format_size(video, duration)
+            format_id = video["format_id"]
+            acodec = video.get("acodec", "none")
+            if audio is not None:
+                audio_size, audio_is_estimate = estimate_format_size(audio, duration)
+                size = size + audio_size if size and audio_size else None
+                size_is_estimate = size_is_estimate or audio_is_estimate
+                format_id = f"{format_id}+{audio['format_id']}"
+                acodec = audio.get("acodec", "none")
+            if not size:
+                continue
+
+            container, cost = container_plan(video, audio, force_mp4)
+
+            candidates.append(
+                FormatRecord(
+                    format_id,
+                    FormatRecord.KIND_RECOMMENDED,
+                    "",
+                    ext=container.upper(),
+                    container=container,
+                    cost=cost,
+                    size=size,
+                    size_is_estimate=size_is_estimate,
+                    height=video.get("height") or 0,
+                    fps=video.get("fps") or 0,
+                    vcodec=video.get("vcodec", "none"),
+                    acodec=acodec,
+                )
+            )
+    return candidates
+
+
+def score_candidate(candidate, duration, throughput, max_height, max_size):
+    """Scores an option: resolution and codec efficiency against time/size.
+
+    With a measured throughput the cost is the download time relative to the
+    media's own duration (capped at 2x), otherwise its share of the largest
+    option's size. Options needing a remux or transcode lose a little more.
+    """
+    resolution = min(candidate.height, max_height) / max_height
+    efficiency = CODEC_EFFICIENCY.get(codec_family(candidate.vcodec), 1.0)
+
+    if throughput and duration:
+        cost = min(candidate.size / throughput / duration, 2.0)
+    else:
+        cost = candidate.size / max_size
+    return resolution * efficiency - 0.5 * cost - COST_PENALTY[candidate.cost]
+
+
+def estimate_total_seconds(candidate, duration, throughput):
+    """Estimated download plus post-processing time of an option, in seconds."""
+    download = candidate.size / (throughput or FALLBACK_THROUGHPUT)
+    return download + (duration or 0) * POSTPROCESS_TIME_FACTOR[candidate.cost]
+
+
+def recommend_formats(formats, duration, throughput=None, force_mp4=False):
+    """Ranks the full format list and returns a few labelled picks.
+
+    Returns FormatRecords for "Recommended" (best score for this connection),
+    "Fastest <=720p" (least estimated download plus post-processing time up
+    to 720p, the higher resolution on a tie) and "Smallest with AAC audio".
+    Duplicate picks are shown once.
+    """
+    candidates = build_format_candidates(formats, duration, force_mp4)
+    if not candidates:
+        return []
+
+    max_height = max(c.height for c in candidates)
+    max_size = max(c.size for c in candidates)
+
+    picks = [
+        (
+            "Recommended",
+            max(
+                candidates,
+                key=lambda c: score_candidate(
+                    c, duration, throughput, max_height, max_size
+                ),
+            ),
+        )
+    ]
+
+    low_res = [c for c in candidates if c.height <= FASTEST_MAX_HEIGHT]
+    if low_res:
+        picks.append(
+            (
+                f"Fastest \u2264{FASTEST_MAX_HEIGHT}p",
+                min(
+                    low_res,
+                    key=lambda c: (
+                        estimate_total_seconds(c, duration, throughput),
+                        -c.height,
+                    ),
+                ),
+            )
+        )
+
+    with_aac = [c for c in candidates if codec_family(c.acodec) == "aac"]
+    if with_aac:
+        picks.append(("Smallest with AAC audio", min(with_aac, key=lambda c: c.size)))
+
+    recommendations = []
+    seen = set()
+    for title, pick in picks:
+        if pick.format_id in seen:
+            continue
+        seen.add(pick.format_id)
+
+        codecs = codec_family(pick.vcodec).upper()
+        if pick.acodec != "none":
+            codecs += f" + {codec_family(pick.acodec).upper()}"
+        pick.label = f"{title} - {pick.height}p {codecs}"
+        recommendations.append(pick)
+    return recommendations
+
+
+# --- Simple Loading Overlay (Clean Design) ---
+
+
+class LoadingOverlay(QWidget):
+    """Clean loading overlay with spinning animation."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setAttribute(Qt.WA_StyledBackground, True)
+        self.setAttribute(Qt.WA_TranslucentBackground, True)
+
+        self.setStyleSheet(
+            """
+            LoadingOverlay {
+                background-color: rgba(0, 0, 0, 120);
+                border-radius: 12px;
+            }
+        """
+        )
+
+        layout = QVBoxLayout(self)
+        layout.setAlignment(Qt.AlignCenter)
+
+        # Spinner
+        self.spinner_label = QLabel()
+        self.spinner_label.setFixedSize(60, 60)
+        self.spinner_label.setStyleSheet("background: transparent;")
+        layout.addWidget(self.spinner_label, alignment=Qt.AlignCenter)
+
+        # Message
+        self.message_label = QLabel("Loading...")
+        self.message_label.setAlignment(Qt.AlignCenter)
+        self.message_label.setStyleSheet(
+            """
+            color: white; 
+            font-size: 14pt; 
+            font-weight: 600;
+            background: transparent;
+            padding: 10px;
+        """
+        )
+        layout.addWidget(self.message_label)
+
+        # Animation
+        self.frame_index = 0
+        self.paused = False
+        self.visible_since = None
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.rotate_spinner)
+
+        self.hide()
+
+    # Spinner rotation frames, rendered once and shared by all overlays
+    _spinner_frames = None
+
+    FRAME_STEP_DEGREES = 12
+    FRAME_INTERVAL_MS = 50
+
+    @classmethod
+    def spinner_frames(cls):
+        """Returns the pre-rendered spinner frames, drawing them on first use."""
+        if cls._spinner_frames is None:
+            frames = []
+            for angle in range(0, 360, cls.FRAME_STEP_DEGREES):
+                pixmap = QPixmap(60, 60)
+                pixmap.fill(Qt.transparent)
+
+                painter = QPainter(pixmap)
+                painter.setRenderHint(QPainter.Antialiasing)
+
+                pen = painter.pen()
+                pen.setWidth(4)
+                pen.setCapStyle(Qt.RoundCap)
+                pen.setColor(QColor("#4A90E2"))
+                painter.setPen(pen)
+
+                painter.translate(30, 30)
+                painter.rotate(angle)
+
+                for i in range(8):
+                    painter.rotate(45)
+                    painter.drawLine(0, -20, 0, -15)
+
+                painter.end()
+                frames.append(pixmap)
+            cls._spinner_frames = frames
+        return cls._spinner_frames
+
+    def rotate_spinner(self):
+        """Advances the spinner by one frame."""
+        # Skip work while the window is covered or off screen
+        handle = self.window().windowHandle()
+        if handle is not None and not handle.isExposed():
+            return
+
+        start = time.perf_counter()
+        frames = self.spinner_frames()
+        self.frame_index = (self.frame_index + 1) % len(frames)
+        self.update_spinner()
+
+        DEBUG_METRICS.add("overlay_frames")
+        DEBUG_METRICS.add("overlay_tick_seconds", time.perf_counter() - start)
+
+    def update_spinner(self):
+        """Shows the current spinner frame."""
+        self.spinner_label.setPixmap(self.spinner_frames()[self.frame_index])
+
+    def set_paused(self, paused):
+        """Pauses the animation (e.g. while the window is minimized)."""
+        self.paused = paused
+        if paused:
+            self.timer.stop()
+        elif self.isVisible():
+            self.timer.start(self.FRAME_INTERVAL_MS)
+
+    def showEvent(self, event):
+        """Centers overlay and starts animation."""
+        if self.parent():
+            self.setGeometry(self.parent().rect())
+        if not self.paused:
+            self.timer.start(self.FRAME_INTERVAL_MS)
+        self.update_spinner()
+        self.visible_since = time.perf_counter()
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        """Stops animation."""
+        self.timer.stop()
+        if self.visible_since is not None:
+            DEBUG_METRICS.add(
+                "overlay_visible_seconds", time.perf_counter() - self.visible_since
+            )
+            self.visible_since = None
+        super().hideEvent(event)
+
+    def set_message(self, message):
+        """Updates loading message."""
+        self.message_label.setText(message)
+
+
+# --- Worker Thread: Fetch Metadata ---
+
+
+class YtdlpWorker(QThread):
+    """Thread to fetch video/audio metadata using yt-dlp."""
+
+    metadata_fetched = pyqtSignal(dict)
+    error_occurred = pyqtSignal(str)
+
+    def __init__(self, url, future=None):
+        super().__init__()
+        self.url = url
+        # An in-flight prefetch for the same URL to wait on, if any
+        self.future = future
+
+    def run(self):
+        try:
+            try:
+                if self.future is None:
+                    raise CancelledError()
+                info = self.future.result()
+            except CancelledError:
+                info = get_extraction_service().submit(self.url).result()
+            self.metadata_fetched.emit(info)
+
+        except Exception as e:
+            error_msg = str(e)
+            if "Unsupported URL" in error_msg or "No video" in error_msg:
+                self.error_occurred.emit(
+                    "This URL is not supported. Please try a video/audio link from YouTube, "
+                    "Vimeo, or other supported platforms."
+                )
+            else:
+                self.error_occurred.emit(f"Failed to fetch metadata: {error_msg}")
+
+
+# --- Audio Conversion Pool ---
+
+
+class AudioConversionPool(QObject):
+    """Converts downloaded audio on a bounded pool of ffmpeg processes.
+
+    Pool threads only wait on their ffmpeg child, so the pool size is the
+    number of encoders running at once; a batch of downloads converts
+    concurrently while the next download is already running.
+    """
+
+    # job dict, error message ("" on success)
+    conversion_finished = pyqtSignal(dict, str)
+
+    def __init__(self, max_workers=AUDIO_CONVERSION_WORKERS, parent=None):
+        super().__init__(parent)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="audio-convert"
+        )
+        # Jobs not reported yet and their futures, by id(job)
+        self._unfinished = {}
+        self._futures = {}
+        self._closed = False
+        self._lock = threading.Lock()
+
+    def submit(self, job):
+        """Queues job["source"] -> job["target"] with job["codec_args"]."""
+        with self._lock:
+            self._unfinished[id(job)] = job
+        future = self._executor.submit(
+            convert_audio,
+            job["ffmpeg_path"],
+            job["source"],
+            job["target"],
+            job["codec_args"],
+        )
+        with self._lock:
+            self._futures[id(job)] = future
+        future.add_done_callback(lambda f: self._on_done(job, f))
+
+    def _on_done(self, job, future):
+        with self._lock:
+            # After shutdown the job is handed back by shutdown() instead
+            if self._closed:
+                return
+            del self._unfinished[id(job)]
+            self._futures.pop(id(job), None)
+
+        if future.cancelled():
+            error = "Conversion cancelled"
+        elif future.exception() is not None:
+            error = str(future.exception()) or "Conversion failed"
+        else:
+            error = ""
+            DEBUG_METRICS.add("audio_conversions")
+        self.conversion_finished.emit(job, error)
+
+    def pending(self):
+        with self._lock:
+            return len(self._unfinished)
+
+    def shutdown(self):
+        """Cancels queued conversions and returns (job, error) for every job
+        that was not reported.
+
+        Call after FFMPEG_JOBS.terminate_all(): running conversions are then
+        already killed, so waiting for their futures to settle is brief. A
+        job that finished before the kill keeps its converted file.
+        """
+        with self._lock:
+            self._closed = True
+            unfinished = list(self._unfinished.values())
+            futures = [self._futures.get(id(job)) for job in unfinished]
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        wait_futures([f for f in futures if f is not None], timeout=2)
+
+        results = []
+        for job, future in zip(unfinished, futures):
+            done = future is not None and future.done() and not future.cancelled()
+            if done and future.exception() is None:
+                DEBUG_METRICS.add("audio_conversions")
+                results.append((job, ""))
+            else:
+                results.append((job, "Stopped on exit"))
+        return results
+
+
+# --- Local Post-Processing Pool ---
+
+
+class PostProcessPool(QObject):
+    """Runs local ffmpeg jobs on files that are already downloaded.
+
+    Jobs are plain callables taking an on_progress(percent) callback last;
+    progress and completion are re-emitted as signals for the UI thread.
+    """
+
+    job_progress = pyqtSignal(str, float)
+    # job id, output path, error message ("" on success)
+    job_finished = pyqtSignal(str, str, str)
+
+    def __init__(self, max_workers=POSTPROCESS_WORKERS, parent=None):
+        super().__init__(parent)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="postprocess"
+        )
+
+    def submit(self, job_id, fn, *args):
+        def on_progress(percent):
+            self.job_progress.emit(job_id, percent)
+
+        future = self._executor.submit(fn, *args, on_progress)
+        future.add_done_callback(lambda f: self._on_done(job_id, f))
+
+    def _on_done(self, job_id, future):
+        # Only shutdown cancels jobs, and then there is nobody to tell
+        if future.cancelled():
+            return
+        if future.exception() is not None:
+            self.job_finished.emit(job_id, "", str(future.exception()) or "Failed")
+        else:
+            DEBUG_METRICS.add("postprocess_jobs")
+            self.job_finished.emit(job_id, future.result(), "")
+
+    def shutdown(self):
+        """Cancels queued jobs without waiting for the running ones.
+
+        Running jobs are stopped by FFMPEG_JOBS.terminate_all().
+        """
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+# --- Worker Thread: Download Image ---
+
+
+class ImageDownloadWorker(QThread):
+    """Thread to download direct image links."""
+
+    image_data_fetched = pyqtSignal(bytes, str)
+    error_occurred = pyqtSignal(str)
+
+    def __init__(self, url):
+        super().__init__()
+        self.url = url
+
+    def run(self):
+        try:
+            image_data = fetch_url_bytes(self.url, timeout=15, require_image=True)
+            self.image_data_fetched.emit(image_data, image_filename_from_url(self.url))
+
+        except Exception as e:
+            self.error_occurred.emit(f"Image download failed: {str(e)}")
+
+
+# --- Worker Thread: Format Size Probe ---
+
+
+class FormatSizeProbeWorker(QThread):
+    """Thread to HEAD direct-download format URLs in parallel for exact sizes."""
+
+    sizes_probed = pyqtSignal(str, dict)
+
+    def __init__(self, key, urls_by_format, parent=None):
+        super().__init__(parent)
+        # Identifies the media the sizes belong to, to drop stale results
+        self.key = key
+        self.urls_by_format = urls_by_format
+
+    def run(self):
+        pool = ThreadPoolExecutor(max_workers=SIZE_PROBE_WORKERS)
+        pending = {
+            pool.submit(probe_content_length, url): format_id
+            for format_id, url in self.urls_by_format.items()
+        }
+        found = {}
+        try:
+            while pending and not self.isInterruptionRequested():
+                done, _ = wait_futures(
+                    pending, timeout=0.2, return_when=FIRST_COMPLETED
+                )
+                for future in done:
+                    format_id = pending.pop(future)
+                    if future.result():
+                        found[format_id] = future.result()
+        finally:
+            # Running HEADs are bounded by SIZE_PROBE_TIMEOUT and only fill
+            # CONTENT_LENGTH_CACHE, so they are left to finish on their own
+            pool.shutdown(wait=False, cancel_futures=True)
+        if self.isInterruptionRequested():
+            return
+        DEBUG_METRICS.add("format_sizes_probed", len(found))
+        self.sizes_probed.emit(self.key, found)
+
+
+# --- Worker Thread: Timeline Filmstrip ---
+
+
+class FilmstripWorker(QThread):
+    """Thread to sample timeline frames from a remote stream in parallel.
+
+    Each frame is its own ffmpeg run that input-seeks straight to its time in
+    the stream URL, so only the data around that point is fetched. Frames
+    are emitted as JPEG bytes in the order they arrive.
+    """
+
+    # generation, media key, slot index, JPEG bytes
+    frame_ready = pyqtSignal(int, str, int, bytes)
+
+    def __init__(
+        self, generation, key, ffmpeg_path, stream, times, indexes, parent=None
+    ):
+        super().__init__(parent)
+        # The strip shown when started; frames of older ones are not drawn
+        self.generation = generation
+        self.key = key
+        self.ffmpeg_path = ffmpeg_path
+        self.stream = stream
+        self.times = times
+        self.indexes = indexes
+        self._processes = set()
+        self._lock = threading.Lock()
+
+    def sample(self, seconds):
+        """Returns one JPEG frame at seconds into the stream."""
+        cmd = [
+            self.ffmpeg_path,
+            "-hide_banner",
+            "-loglevel",
+            "error",
+            *ffmpeg_header_args(self.stream.get("http_headers")),
+            "-ss",
+            f"{seconds:.3f}",
+            "-i",
+            self.stream["url"],
+            "-an",
+            "-frames:v",
+            "1",
+            "-vf",
+            f"scale={FILMSTRIP_FRAME_WIDTH}:-2",
+            "-f",
+            "image2pipe",
+            "-vcodec",
+            "mjpeg",
+            "pipe:1",
+        ]
+        process = subprocess.Popen(
+            cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+        )
+        with self._lock:
+            self._processes.add(process)
+        try:
+            data, _ = process.communicate(timeout=FILMSTRIP_SAMPLE_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.communicate()
+            raise
+        finally:
+            with self._lock:
+                self._processes.discard(process)
+        if process.returncode != 0 or not data:
+            raise RuntimeError(f"No frame at {seconds:.1f}s")
+        return data
+
+    def run(self):
+        pool = ThreadPoolExecutor(
+            max_workers=FILMSTRIP_WORKERS, thread_name_prefix="filmstrip"
+        )
+        pending = {pool.submit(self.sample, self.times[i]): i for i in self.indexes}
+        try:
+            while pending and not self.isInterruptionRequested():
+                done, _ = wait_futures(
+                    pending, timeout=0.2, return_when=FIRST_COMPLETED
+                )
+                for future in done:
+                    self._emit_frame(future, pending.pop(future))
+            # Frames finished before a stop still reach the cache
+            for future, index in pending.items():
+                if future.done() and not future.cancelled():
+                    self._emit_frame(future, index)
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+            self._kill_processes()
+
+    def _emit_frame(self, future, index):
+        if future.exception() is None:
+            DEBUG_METRICS.add("filmstrip_frames")
+            self.frame_ready.emit(self.generation, self.key, index, future.result())
+
+    def stop(self):
+        """Abandons the strip; running samples are killed, not waited for."""
+        self.requestInterruption()
+        self._kill_processes()
+
+    def _kill_processes(self):
+        with self._lock:
+            for process in self._processes:
+                process.kill()
+
+
+# --- Timeline Filmstrip Widget ---
+
+
+class FilmstripWidget(QWidget):
+    """Row of frames sampled across the media, filled in as they arrive.
+
+    Left-click a frame to use its time as the clip start, right-click to use
+    it as the end.
+    """
+
+    # media time of the clicked frame, True for a right-click
+    frame_clicked = pyqtSignal(float, bool)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setMinimumHeight(90)
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
+        self.setCursor(Qt.PointingHandCursor)
+        self._times = []
+        self._pixmaps = {}
+        self._message = ""
+
+    def reset(self, times, message=""):
+        """Shows empty slots for the given sample times."""
+        self._times = list(times)
+        self._pixmaps = {}
+        self._message = message
+        self.update()
+
+    def clear(self, message=""):
+        self.reset([], message)
+
+    def set_frame(self, index, data):
+        pixmap = QPixmap()
+        if 0 <= index < len(self._times) and pixmap.loadFromData(data):
+            self._pixmaps[index] = pixmap
+            self.update()
+
+    def frame_count(self):
+        return len(self._pixmaps)
+
+    def nearest_frame(self, seconds):
+        """Returns (time, pixmap) of the sampled frame closest to seconds."""
+        loaded = [(abs(self._times[i] - seconds), i) for i in self._pixmaps]
+        if not loaded:
+            return None
+        index = min(loaded)[1]
+        return self._times[index], self._pixmaps[index]
+
+    def _slot_rect(self, index):
+        width = self.width() / len(self._times)
+        return QRect(int(index * width), 0, int(width), self.height())
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        palette = self.palette()
+        painter.fillRect(self.rect(), palette.color(QPalette.Base))
+        painter.setPen(palette.color(QPalette.Text))
+
+        if not self._times:
+            painter.drawText(self.rect(), Qt.AlignCenter, self._message)
+            return
+
+        for index, seconds in enumerate(self._times):
+            rect = self._slot_rect(index).adjusted(2, 2, -2, -18)
+            pixmap = self._pixmaps.get(index)
+            if pixmap is None:
+                painter.fillRect(rect, palette.color(QPalette.Window))
+            else:
+                scaled = pixmap.scaled(
+                    rect.size(), Qt.KeepAspectRatio, Qt.SmoothTransformation
+                )
+                painter.drawPixmap(
+                    rect.x() + (rect.width() - scaled.width()) // 2,
+                    rect.y() + (rect.height() - scaled.height()) // 2,
+                    scaled,
+                )
+            label_rect = QRect(rect.x(), rect.bottom() + 2, rect.width(), 16)
+            painter.drawText(label_rect, Qt.AlignCenter, format_hms(seconds))
+
+    def mousePressEvent(self, event):
+        if not self._times or self.width() <= 0:
+            return
+        index = int(event.x() * len(self._times) / self.width())
+        index = max(0, min(index, len(self._times) - 1))
+        self.frame_clicked.emit(self._times[index], event.button() == Qt.RightButton)
+
+
+# --- Trim Point Preview ---
+
+
+class PreviewSegment:
+    """Frames decoded from one window of the preview stream, PREVIEW_FPS apart."""
+
+    __slots__ = ("start", "end", "frames", "complete")
+
+    def __init__(self, start, end):
+        self.start = start
+        self.end = end
+        self.frames = []
+        # Set once ffmpeg exits; if it was stopped, end is trimmed to the frames
+        self.complete = False
+
+    def covers(self, start, end):
+        return self.start <= start and end <= self.end
+
+    def frame_time(self, index):
+        return self.start + index / PREVIEW_FPS
+
+
+class PreviewSnippetWorker(QThread):
+    """Thread to decode a few seconds of a remote stream for the preview player.
+
+    ffmpeg input-seeks to the window start, which costs HTTP range requests
+    for progressive files and only the covering segments for HLS, and pipes
+    small JPEG frames back; each is emitted as soon as it is complete.
+    """
+
+    frame_ready = pyqtSignal(object, bytes)
+    # segment, True when stopped before ffmpeg finished the window
+    segment_finished = pyqtSignal(object, bool)
+
+    def __init__(self, ffmpeg_path, stream, segment, parent=None):
+        super().__init__(parent)
+        self.ffmpeg_path = ffmpeg_path
+        self.stream = stream
+        self.segment = segment
+        self._process = None
+
+    def stop(self):
+        """Abandons the window; frames already emitted stay usable."""
+        self.requestInterruption()
+        process = self._process
+        if process is not None and process.poll() is None:
+            process.kill()
+
+    def run(self):
+        cmd = [
+            self.ffmpeg_path,
+            "-hide_banner",
+            "-loglevel",
+            "error",
+            *ffmpeg_header_args(self.stream.get("http_headers")),
+            "-ss",
+            f"{self.segment.start:.3f}",
+            "-t",
+            f"{self.segment.end - self.segment.start:.3f}",
+            "-i",
+            self.stream["url"],
+            "-an",
+            "-sn",
+            "-vf",
+            f"fps={PREVIEW_FPS},scale={PREVIEW_FRAME_WIDTH}:-2",
+            "-q:v",
+            "5",
+            "-f",
+            "image2pipe",
+            "-vcodec",
+            "mjpeg",
+            "pipe:1",
+        ]
+        try:
+            self._process = subprocess.Popen(
+                cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+            )
+        except OSError:
+            self.segment_finished.emit(self.segment, False)
+            return
+
+        buffer = b""
+        try:
+            while not self.isInterruptionRequested():
+                chunk = self._process.stdout.read1(65536)
+                if not chunk:
+                    break
+                frames, buffer = split_jpeg_stream(buffer + chunk)
+                for frame in frames:
+                    self.frame_ready.emit(self.segment, frame)
+        finally:
+            if self._process.poll() is None:
+                self._process.kill()
+            self._process.stdout.close()
+            self._process.wait()
+            self.segment_finished.emit(self.segment, self.isInterruptionRequested())
+
+
+class PreviewPlayer(QWidget):
+    """Plays buffered preview windows, showing frames as soon as they arrive.
+
+    This is a silent slideshow of small JPEG frames at PREVIEW_FPS, not a
+    media player: there is no audio and no frame-accurate timing. Playback
+    waits (buffering) when it catches up with a window that is still being
+    decoded and stops at the end of a complete one.
+    """
+
+    # Emitted with the segment when no frame arrived within the target
+    first_frame_late = pyqtSignal(object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        vbox = QVBoxLayout(self)
+        vbox.setContentsMargins(0, 0, 0, 0)
+        vbox.setSpacing(4)
+
+        self.screen = QLabel()
+        self.screen.setAlignment(Qt.AlignCenter)
+        self.screen.setMinimumSize(320, 180)
+        self.screen.setStyleSheet(
+            "background-color: #000000; color: #BBBBBB; border-radius: 6px;"
+        )
+        vbox.addWidget(self.screen)
+
+        self.position_label = QLabel()
+        self.position_label.setAlignment(Qt.AlignCenter)
+        vbox.addWidget(self.position_label)
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(1000 // PREVIEW_FPS)
+        self.timer.timeout.connect(self._advance)
+
+        self.first_frame_timer = QTimer(self)
+        self.first_frame_timer.setSingleShot(True)
+        self.first_frame_timer.setInterval(int(PREVIEW_FIRST_FRAME_TARGET * 1000))
+        self.first_frame_timer.timeout.connect(self._first_frame_missed)
+
+        self.segment = None
+        self.index = 0
+        # Set on load until the first frame is on screen
+        self.load_started = None
+        self.clear()
+
+    def clear(self, message="Preview the start or end time"):
+        self.timer.stop()
+        self.first_frame_timer.stop()
+        self.segment = None
+        self.load_started = None
+        self.screen.setPixmap(QPixmap())
+        self.screen.setText(message)
+        self.position_label.clear()
+
+    def load(self, segment, autoplay=True):
+        """Shows segment from its start, playing it when autoplay is set."""
+        self.segment = segment
+        self.index = 0
+        self.load_started = time.perf_counter()
+        if not self._show_frame():
+            self.first_frame_timer.start()
+        if autoplay:
+            self.timer.start()
+
+    def is_playing(self):
+        return self.timer.isActive()
+
+    def toggle_playback(self):
+        if self.segment is None:
+            return
+        if self.timer.isActive():
+            self.timer.stop()
+            return
+        if self.segment.complete and self.index >= len(self.segment.frames) - 1:
+            self.index = 0
+        self.timer.start()
+
+    def frame_added(self, segment):
+        """Draws a newly decoded frame if playback was waiting for it."""
+        if segment is self.segment and self.index == len(segment.frames) - 1:
+            self._show_frame()
+
+    def segment_finished(self, segment):
+        if segment is self.segment and not segment.frames:
+            self.clear("No preview available at this point")
+
+    def _show_frame(self):
+        segment = self.segment
+        if self.index >= len(segment.frames):
+            if not segment.frames:
+                self.screen.setText("Buffering...")
+            return False
+
+        pixmap = QPixmap()
+        pixmap.loadFromData(segment.frames[self.index])
+        self.screen.setPixmap(
+            pixmap.scaled(self.screen.size(), Qt.KeepAspectRatio, Qt.FastTransformation)
+        )
+        self.position_label.setText(format_hms(segment.frame_time(self.index)))
+        if self.load_started is not None:
+            self.first_frame_timer.stop()
+            DEBUG_METRICS.set(
+                "preview_first_frame_ms",
+                (time.perf_counter() - self.load_started) * 1000,
+            )
+            self.load_started = None
+        return True
+
+    def show_stand_in(self, seconds, pixmap):
+        """Shows a timeline frame while the real first frame is still coming."""
+        if self.load_started is None:
+            return
+        self.screen.setPixmap(
+            pixmap.scaled(self.screen.size(), Qt.KeepAspectRatio, Qt.FastTransformation)
+        )
+        self.position_label.setText(f"~{format_hms(seconds)} (buffering slow stream)")
+
+    def _first_frame_missed(self):
+        if self.segment is None or self.load_started is None:
+            return
+        DEBUG_METRICS.add("preview_slow_starts")
+        self.screen.setText("Buffering (slow stream)...")
+        self.first_frame_late.emit(self.segment)
+
+    def _advance(self):
+        segment = self.segment
+        if segment is None:
+            self.timer.stop()
+        elif self.index + 1 < len(segment.frames):
+            self.index += 1
+            self._show_frame()
+        elif segment.complete:
+            self.timer.stop()
+
+
+# --- Worker Thread: History File Scanner ---
+
+
+class HistoryScanWorker(QThread):
+    """Thread that checks history records against the files in the media folder."""
+
+    statuses_scanned = pyqtSignal(int, list)
+
+    BATCH_SIZE = 100
+
+    def __init__(self, generation, media_folder, entries):
+        super().__init__()
+        self.generation = generation
+        self.media_folder = media_folder
+        # entries: list of (key, filename, recorded size string)
+        self.entries = entries
+
+    def run(self):
+        # One directory listing instead of an os.stat round-trip per record
+        sizes = {}
+        try:
+            with os.scandir(self.media_folder) as it:
+                for entry in it:
+                    if self.isInterruptionRequested():
+                        return
+                    try:
+                        if entry.is_file():
+                            sizes[entry.name] = entry.stat().st_size
+                    except OSError:
+                        continue
+        except OSError:
+            pass
+
+        batch = []
+        for key, filename, recorded_size in self.entries:
+            if self.isInterruptionRequested():
+                return
+
+            actual_size = sizes.get(filename) if filename else None
+            if actual_size is None:
+                status = FILE_STATUS_MISSING
+            elif (
+                parse_size_string(recorded_size) is not None
+                and format_bytes(actual_size) != recorded_size
+            ):
+                status = FILE_STATUS_SIZE_MISMATCH
+            else:
+                status = FILE_STATUS_PRESENT
+
+            batch.append((key, status))
+            if len(batch) >= self.BATCH_SIZE:
+                self.statuses_scanned.emit(self.generation, batch)
+                batch = []
+
+        if batch:
+            self.statuses_scanned.emit(self.generation, batch)
+
+
+# --- Worker Thread: Clear History Files ---
+
+
+class ClearHistoryWorker(QThread):
+    """Thread that deletes downloaded files for a set of history records."""
+
+    progress_signal = pyqtSignal(int, int)
+    finished_signal = pyqtSignal(list, int, list, bool)
+
+    BATCH_SIZE = 25
+
+    def __init__(self, media_folder, records):
+        super().__init__()
+        self.media_folder = media_folder
+        # records: list of (record_id, filename)
+        self.records = records
+        # Kept on the worker so closeEvent can apply it after wait()
+        self.removed_ids = []
+
+    def run(self):
+        removed_ids = self.removed_ids
+        deleted_count = 0
+        failed_files = []
+        total = len(self.records)
+        cancelled = False
+
+        for index, (record_id, filename) in enumerate(self.records, start=1):
+            if self.isInterruptionRequested():
+                cancelled = True
+                break
+
+            filepath = os.path.join(self.media_folder, filename) if filename else ""
+
+            try:
+                if filepath and os.path.isfile(filepath):
+                    os.remove(filepath)
+                    deleted_count += 1
+                removed_ids.append(record_id)
+            except OSError as e:
+                # Keep the record so the user can retry
+                failed_files.append(f"{filename}: {str(e)}")
+
+            if index % self.BATCH_SIZE == 0 or index == total:
+                self.progress_signal.emit(index, total)
+
+        self.finished_signal.emit(removed_ids, deleted_count, failed_files, cancelled)
+
+
+# --- Worker Thread: yt-dlp Cache Maintenance ---
+
+
+class CacheMaintenanceWorker(QThread):
+    """Thread that measures (and optionally clears) the yt-dlp cache directory."""
+
+    finished_signal = pyqtSignal(object, int)
+
+    def __init__(self, cache_dir, clear=False):
+        super().__init__()
+        self.cache_dir = cache_dir
+        self.clear = clear
+
+    def run(self):
+        if self.clear and os.path.isdir(self.cache_dir):
+            for entry in os.listdir(self.cache_dir):
+                path = os.path.join(self.cache_dir, entry)
+                if os.path.isdir(path):
+                    shutil.rmtree(path, ignore_errors=True)
+                else:
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+
+        # Emitted as object: cache sizes can exceed a 32-bit int signal
+        size, count = get_directory_size(self.cache_dir)
+        self.finished_signal.emit(size, count)
+
+
+# --- Worker Thread: Download Media/Image ---
+
+
+class DownloadWorker(QThread):
+    """Thread to handle actual downloads (media or image)."""
+
+    progress_signal = pyqtSignal(float, str)
+    finished_signal = pyqtSignal(str, str, str, str)
+    error_signal = pyqtSignal(str)
+    # Average bytes/s of each completed file transfer
+    throughput_signal = pyqtSignal(float)
+
+    def __init__(
+        self,
+        url,
+        format_id,
+        start_time,
+        end_time,
+        filepath,
+        filename_template,
+        is_image=False,
+        container=None,
+        transcode=False,
+        source_cache=None,
+        cache_key=None,
+    ):
         super().__init__()
         self.url = url
         self.format_id = format_id
@@ -639,6 +3657,13 @@ class DownloadWorker(QThread):
         self.filepath = filepath
         self.filename_template = filename_template
         self.is_image = is_image
+        # Output container; None keeps yt-dlp's own compatible choice
+        self.container = container
+        self.transcode = transcode
+        # Trims run locally from a cached full download when these are set
+        self.source_cache = source_cache
+        self.cache_key = cache_key
+        self.cache_dir = get_ytdlp_cache_dir()
 
     def hook(self, d):
         """Progress hook for yt-dlp downloads."""
@@ -656,6 +3681,13 @@ class DownloadWorker(QThread):
 
             self.progress_signal.emit(percent, status_text)
 
+        elif d["status"] == "finished":
+            elapsed = d.get("elapsed") or 0
+            total = d.get("total_bytes") or d.get("downloaded_bytes") or 0
+            # Very short transfers say more about latency than bandwidth
+            if elapsed >= 1 and total:
+                self.throughput_signal.emit(total / elapsed)
+
     def download_image(self):
         """Handles direct image file download."""
         try:
@@ -699,7 +3731,74 @@ class DownloadWorker(QThread):
                 )
 
         except Exception as e:
-            self.error_signal.emit(f"Image download failed: {str(e)}")
+            self.error_signal.emit(f"Image download failed: {str(e)}")
+
+    def uses_source_cache(self):
+        return self.source_cache is not None and self.cache_key is not None
+
+    def fetch_cached_source(self, yt_dlp, ffmpeg_caps):
+        """Returns the cache entry for this source, downloading it on a miss."""
+        entry = self.source_cache.lookup(self.cache_key)
+        if entry is not None:
+            self.progress_signal.emit(100, "Using cached source - no download needed")
+            return entry
+
+        staging = self.source_cache.staging_dir()
+        ydl_opts = {
+            "format": self.format_id,
+            "outtmpl": {"default": os.path.join(staging, f"{self.cache_key}.%(ext)s")},
+            "progress_hooks": [self.hook],
+            "noplaylist": True,
+            "cachedir": self.cache_dir,
+            "ffmpeg_location": os.path.dirname(ffmpeg_caps["path"]),
+        }
+        if self.container:
+            ydl_opts["merge_output_format"] = self.container
+
+        try:
+            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+                info = ydl.extract_info(self.url, download=True)
+                downloads = info.get("requested_downloads") or [{}]
+                path = downloads[-1].get("filepath") or ydl.prepare_filename(info)
+            return self.source_cache.add(self.cache_key, path, info.get("title", ""))
+        finally:
+            # .part and fragment files of a failed download go with it
+            shutil.rmtree(staging, ignore_errors=True)
+
+    def run_cached_trim(self):
+        """Trims from the source cache, downloading the full source only once."""
+        ffmpeg_caps = FFMPEG_PROBE.caps()
+        if not ffmpeg_caps.get("available"):
+            self.error_signal.emit(
+                "FFmpeg not found! Trimming and merging require FFmpeg. "
+                "Please install FFmpeg and add it to your system PATH."
+            )
+            return
+
+        try:
+            yt_dlp = wait_for_ytdlp_warmup()
+            entry = self.fetch_cached_source(yt_dlp, ffmpeg_caps)
+
+            start = parse_hms(self.start_time) if self.start_time else 0
+            end = parse_hms(self.end_time) if self.end_time else None
+            ((final_filepath, _),) = cut_clips(
+                ffmpeg_caps["path"],
+                entry["path"],
+                [(start, end)],
+                0,
+                self.filepath,
+                stem=yt_dlp.utils.sanitize_filename(entry["title"]) or None,
+            )
+
+            self.finished_signal.emit(
+                final_filepath,
+                os.path.basename(final_filepath),
+                format_bytes(os.path.getsize(final_filepath)),
+                self.format_id,
+            )
+
+        except Exception as e:
+            self.error_signal.emit(f"Download failed: {str(e)}")
 
     def run(self):
         """Main download execution."""
@@ -707,48 +3806,38 @@ class DownloadWorker(QThread):
             self.download_image()
             return
 
-        # Media download via yt-dlp
-        try:
-            output_template = os.path.join(self.filepath, self.filename_template)
-
-            # Build yt-dlp options
-            ydl_opts = {
-                "format": self.format_id,
-                "outtmpl": {"default": output_template},
-                "progress_hooks": [self.hook],
-                "noplaylist": True,
-                "merge_output_format": "mp4",
-            }
+        trimming = self.start_time or self.end_time
+        if trimming and self.uses_source_cache() and not self.transcode:
+            self.run_cached_trim()
+            return
 
-            # Add trimming via external args if needed
-            external_args = []
-            if self.start_time:
-                external_args.extend(["-ss", self.start_time])
-            if self.end_time:
-                external_args.extend(["-to", self.end_time])
+        ffmpeg_caps = FFMPEG_PROBE.caps()
+        needs_ffmpeg = trimming or self.transcode or "+" in self.format_id
+        if needs_ffmpeg and not ffmpeg_caps.get("available"):
+            self.error_signal.emit(
+                "FFmpeg not found! Trimming and merging require FFmpeg. "
+                "Please install FFmpeg and add it to your system PATH."
+            )
+            return
 
-            if external_args:
-                # Check FFmpeg availability
-                try:
-                    subprocess.run(
-                        ["ffmpeg", "-version"],
-                        stdout=subprocess.DEVNULL,
-                        stderr=subprocess.DEVNULL,
-                        check=True,
-                    )
-                except (FileNotFoundError, subprocess.CalledProcessError):
-                    self.error_signal.emit(
-                        "FFmpeg not found! Trimming and merging require FFmpeg. "
-                        "Please install FFmpeg and add it to your system PATH."
-                    )
-                    return
+        if trimming:
+            self.run_trim(ffmpeg_caps)
+            return
 
-                ydl_opts["postprocessor_args"] = {"ffmpeg": external_args}
+        # Media download via yt-dlp
+        try:
+            output_template = os.path.join(self.filepath, self.filename_template)
+            ydl_opts = self.media_ydl_opts(output_template, ffmpeg_caps)
 
+            yt_dlp = wait_for_ytdlp_warmup()
             with yt_dlp.YoutubeDL(ydl_opts) as ydl:
                 info = ydl.extract_info(self.url, download=True)
 
-                final_filename = ydl.prepare_filename(info)
+                # Post-processors may change the extension after download
+                downloads = info.get("requested_downloads") or [{}]
+                final_filename = downloads[-1].get("filepath") or ydl.prepare_filename(
+                    info
+                )
                 final_filename = os.path.basename(final_filename)
                 final_filepath = os.path.join(self.filepath, final_filename)
 
@@ -764,6 +3853,189 @@ class DownloadWorker(QThread):
         except Exception as e:
             self.error_signal.emit(f"Download failed: {str(e)}")
 
+    def media_ydl_opts(self, output_template, ffmpeg_caps):
+        """yt-dlp options downloading this worker's format to output_template."""
+        ydl_opts = {
+            "format": self.format_id,
+            "outtmpl": {"default": output_template},
+            "progress_hooks": [self.hook],
+            "noplaylist": True,
+            "cachedir": self.cache_dir,
+        }
+
+        # Merges are stream copies; only a forced container re-encodes
+        if self.transcode:
+            ydl_opts["postprocessors"] = [
+                {"key": "FFmpegVideoConvertor", "preferedformat": self.container}
+            ]
+        elif self.container:
+            ydl_opts["merge_output_format"] = self.container
+
+        if ffmpeg_caps.get("available"):
+            # Saves yt-dlp searching PATH for the binaries again
+            ydl_opts["ffmpeg_location"] = os.path.dirname(ffmpeg_caps["path"])
+        return ydl_opts
+
+    def run_trim(self, ffmpeg_caps):
+        """Downloads only the trimmed range, then cuts it exactly once.
+
+        yt-dlp's download_ranges fetches the range for any format, merged,
+        pre-muxed or audio-only, into a scratch folder. The cut itself is a
+        single local stream copy, so no postprocessor ever sees -ss/-to.
+        """
+        try:
+            start = parse_hms(self.start_time) if self.start_time else 0
+            end = parse_hms(self.end_time) if self.end_time else None
+
+            yt_dlp = wait_for_ytdlp_warmup()
+            with tempfile.TemporaryDirectory(
+                dir=self.filepath, prefix=".clipshr-"
+            ) as work_dir:
+                ydl_opts = self.media_ydl_opts(
+                    os.path.join(work_dir, self.filename_template), ffmpeg_caps
+                )
+                ydl_opts["download_ranges"] = yt_dlp.utils.download_range_func(
+                    None, [(start, float("inf") if end is None else end)]
+                )
+
+                with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+                    info = ydl.extract_info(self.url, download=True)
+                    downloads = info.get("requested_downloads") or [{}]
+                    source = downloads[-1].get("filepath") or ydl.prepare_filename(info)
+
+                self.progress_signal.emit(100, "Trimming...")
+                ((final_filepath, _),) = cut_clips(
+                    ffmpeg_caps["path"],
+                    source,
+                    [(start, end)],
+                    start,
+                    self.filepath,
+                    stem=yt_dlp.utils.sanitize_filename(info.get("title", "")) or None,
+                )
+
+            self.finished_signal.emit(
+                final_filepath,
+                os.path.basename(final_filepath),
+                format_bytes(os.path.getsize(final_filepath)),
+                self.format_id,
+            )
+
+        except Exception as e:
+            self.error_signal.emit(f"Download failed: {str(e)}")
+
+
+# --- Worker Thread: Multi-Clip Extraction ---
+
+
+class MultiClipWorker(DownloadWorker):
+    """Thread to cut several clips out of one source in a single pass.
+
+    Only the span covering every range is downloaded (yt-dlp download_ranges),
+    into a scratch folder; one ffmpeg run then writes all clips as separate
+    outputs.
+    """
+
+    # filepath, filename, size, range label (one per clip)
+    clip_saved = pyqtSignal(str, str, str, str)
+    clips_finished = pyqtSignal(int)
+
+    def __init__(
+        self,
+        url,
+        format_id,
+        ranges,
+        filepath,
+        container=None,
+        source_cache=None,
+        cache_key=None,
+    ):
+        super().__init__(
+            url=url,
+            format_id=format_id,
+            start_time=None,
+            end_time=None,
+            filepath=filepath,
+            filename_template="%(title)s.%(ext)s",
+            container=container,
+            source_cache=source_cache,
+            cache_key=cache_key,
+        )
+        # [(start_seconds, end_seconds)] in media time
+        self.ranges = ranges
+
+    def run(self):
+        ffmpeg_caps = FFMPEG_PROBE.caps()
+        if not ffmpeg_caps.get("available"):
+            self.error_signal.emit(
+                "FFmpeg not found! Cutting clips requires FFmpeg. "
+                "Please install FFmpeg and add it to your system PATH."
+            )
+            return
+
+        span_start = min(start for start, _ in self.ranges)
+        span_end = max(end for _, end in self.ranges)
+
+        try:
+            yt_dlp = wait_for_ytdlp_warmup()
+            if self.uses_source_cache():
+                # The whole source is cached, so later cuts need no network
+                entry = self.fetch_cached_source(yt_dlp, ffmpeg_caps)
+                self.progress_signal.emit(100, f"Cutting {len(self.ranges)} clips...")
+                clips = cut_clips(
+                    ffmpeg_caps["path"],
+                    entry["path"],
+                    self.ranges,
+                    0,
+                    self.filepath,
+                    stem=yt_dlp.utils.sanitize_filename(entry["title"]) or None,
+                )
+                self.emit_clips(clips)
+                return
+
+            with tempfile.TemporaryDirectory(
+                dir=self.filepath, prefix=".clipshr-"
+            ) as work_dir:
+                ydl_opts = {
+                    "format": self.format_id,
+                    "outtmpl": {
+                        "default": os.path.join(work_dir, self.filename_template)
+                    },
+                    "progress_hooks": [self.hook],
+                    "noplaylist": True,
+                    "cachedir": self.cache_dir,
+                    "ffmpeg_location": os.path.dirname(ffmpeg_caps["path"]),
+                    "download_ranges": yt_dlp.utils.download_range_func(
+                        None, [(span_start, span_end)]
+                    ),
+                }
+                if self.container:
+                    ydl_opts["merge_output_format"] = self.container
+
+                with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+                    info = ydl.extract_info(self.url, download=True)
+                    downloads = info.get("requested_downloads") or [{}]
+                    source = downloads[-1].get("filepath") or ydl.prepare_filename(info)
+
+                self.progress_signal.emit(100, f"Cutting {len(self.ranges)} clips...")
+                clips = cut_clips(
+                    ffmpeg_caps["path"], source, self.ranges, span_start, self.filepath
+                )
+
+            self.emit_clips(clips)
+
+        except Exception as e:
+            self.error_signal.emit(f"Clip extraction failed: {str(e)}")
+
+    def emit_clips(self, clips):
+        for path, label in clips:
+            self.clip_saved.emit(
+                path,
+                os.path.basename(path),
+                format_bytes(os.path.getsize(path)),
+                label,
+            )
+        self.clips_finished.emit(len(clips))
+
 
 # --- Main Application Class ---
 
@@ -773,8 +4045,12 @@ class ClipShrApp(QMainWindow):
 
     def __init__(self):
         super().__init__()
-        self.config = load_config()
+        self.config_service = get_config_service()
+        self.config = self.config_service.data
+        self.config_service.changed.connect(self.on_config_changed)
         self.media_folder = get_media_folder()
+        # Read after first paint (on_first_paint), not during construction
+        self.history = HistoryStore(autoload=False)
         self.metadata = None
         self.selected_format = None
         self.is_image_mode = False
@@ -783,6 +4059,58 @@ class ClipShrApp(QMainWindow):
         self.ytdlp_thread = None
         self.download_thread = None
         self.image_fetch_thread = None
+        self.history_scan_thread = None
+        self.clear_history_thread = None
+        self.cache_thread = None
+        self.size_probe_thread = None
+        self.filmstrip_thread = None
+        self.preview_thread = None
+
+        # Speculative metadata prefetch (URL -> Future of the info dict)
+        self.prefetch_cache = BoundedCache(PREFETCH_CACHE_SIZE, ttl=PREFETCH_TTL)
+        self.prefetch_future = None
+
+        # Clipboard pre-resolving (opt-in): thumbnails and direct images
+        self.thumbnail_cache = BoundedCache(THUMBNAIL_CACHE_SIZE)
+        self.image_prefetch_cache = BoundedCache(THUMBNAIL_CACHE_SIZE)
+
+        # Timeline frames per video (key -> {slot index: JPEG bytes})
+        self.filmstrip_cache = BoundedCache(FILMSTRIP_CACHE_SIZE)
+        self.filmstrip_generation = 0
+
+        # Decoded preview windows for the session (key -> [PreviewSegment])
+        self.preview_buffers = BoundedCache(PREVIEW_VIDEOS)
+        self.preresolve_pool = ThreadPoolExecutor(
+            max_workers=2, thread_name_prefix="clipboard-preresolve"
+        )
+        QApplication.clipboard().dataChanged.connect(self.on_clipboard_changed)
+
+        # Audio conversions run after their download, off the UI thread
+        self.audio_pool = AudioConversionPool(parent=self)
+        self.audio_pool.conversion_finished.connect(self.on_audio_conversion_finished)
+        self.download_audio_plan = None
+
+        # Extra (start, end) ranges in seconds, cut from one download
+        self.clip_ranges = []
+        self.clip_job = None
+
+        # Clips/exports made from files already in the media folder
+        self.postprocess_pool = PostProcessPool(parent=self)
+        self.postprocess_pool.job_progress.connect(self.on_postprocess_progress)
+        self.postprocess_pool.job_finished.connect(self.on_postprocess_finished)
+        self.postprocess_jobs = {}
+
+        # Widgets of lazily built tabs
+        self.history_table = None
+        self.folder_path_label = None
+        self.diagnostics_view = None
+        self.first_paint_done = False
+
+        # History file status scanning
+        self.history_generation = 0
+        self.history_scan_pending = False
+        self.history_row_by_id = {}
+        self.history_file_status = {}
 
         # Window setup
         self.setGeometry(
@@ -794,6 +4122,10 @@ class ClipShrApp(QMainWindow):
         # Progress bar
         self.progress_bar = QProgressBar()
 
+        # Stylesheets are compiled once per palette and reused on every switch
+        precompile_stylesheets()
+        self.applied_theme = None
+
         # Setup UI
         self.setup_ui()
         self.apply_theme(self.config["theme"])
@@ -801,12 +4133,27 @@ class ClipShrApp(QMainWindow):
         # Ensure media folder exists
         Path(self.media_folder).mkdir(exist_ok=True)
 
+        # Watch the media folder (inotify on Linux) and rescan after changes
+        self.media_watcher = QFileSystemWatcher(self)
+        self.media_watcher.addPath(self.media_folder)
+        self.media_watcher.directoryChanged.connect(self.on_media_folder_changed)
+
+        self.rescan_timer = QTimer(self)
+        self.rescan_timer.setSingleShot(True)
+        self.rescan_timer.setInterval(500)
+        self.rescan_timer.timeout.connect(self.scan_history_files)
+
     def apply_theme(self, theme_name):
         """Applies the selected theme to the entire application."""
         if theme_name not in PALETTES:
             theme_name = "light"
 
-        qss = generate_qss(theme_name)
+        # Re-applying the same stylesheet would still re-polish every widget
+        if theme_name == self.applied_theme:
+            return
+        self.applied_theme = theme_name
+
+        qss = get_qss(theme_name)
         palette_data = PALETTES[theme_name]
 
         # Create Qt Palette
@@ -821,10 +4168,13 @@ class ClipShrApp(QMainWindow):
         palette.setColor(QPalette.HighlightedText, QColor("white"))
 
         QApplication.setPalette(palette)
+        self.detach_hidden_tabs()
         self.setStyleSheet(qss)
 
-        self.config["theme"] = theme_name
-        save_config(self.config)
+        self.video_format_model.set_palette(palette_data)
+        self.audio_format_model.set_palette(palette_data)
+
+        self.config_service.set("theme", theme_name)
 
     def setup_ui(self):
         """Initializes the main window layout and tabs."""
@@ -838,16 +4188,24 @@ class ClipShrApp(QMainWindow):
         self.tab_widget = QTabWidget()
         self.tab_widget.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
 
-        # Create Tabs
-        self.downloader_tab = self.create_downloader_tab()
+        # Create Tabs (History and Settings are built on first view)
+        self.downloader_tab = self._create_tab_page()
+        self.downloader_tab.layout().addWidget(self.create_downloader_tab())
         self.tab_widget.addTab(self.downloader_tab, "Downloader")
 
-        self.history_tab = self.create_history_tab()
+        self.history_tab = self._create_tab_page()
         self.tab_widget.addTab(self.history_tab, "History")
 
-        self.settings_tab = self.create_settings_tab()
+        self.settings_tab = self._create_tab_page()
         self.tab_widget.addTab(self.settings_tab, "Settings")
 
+        self.lazy_tab_builders = {
+            self.history_tab: self.create_history_tab,
+            self.settings_tab: self.create_settings_tab,
+        }
+        # Tab page -> its content, taken out of the window while restyling
+        self.detached_tab_content = {}
+
         main_layout.addWidget(self.tab_widget)
 
         # Loading Overlay
@@ -857,8 +4215,65 @@ class ClipShrApp(QMainWindow):
         # Connect tab change event
         self.tab_widget.currentChanged.connect(self.on_tab_change)
 
-        # Load history on startup
+    def _create_tab_page(self):
+        """Creates a tab page holding a single content widget."""
+        page = QWidget()
+        layout = QVBoxLayout(page)
+        layout.setContentsMargins(0, 0, 0, 0)
+        return page
+
+    def ensure_tab_built(self, index):
+        """Builds a lazily created tab the first time it is shown and puts
+        back content detached by a theme switch."""
+        page = self.tab_widget.widget(index)
+        content = self.detached_tab_content.pop(page, None)
+        if content is not None:
+            # Re-parenting polishes it against the current stylesheet
+            page.layout().addWidget(content)
+            content.show()
+        builder = self.lazy_tab_builders.pop(page, None)
+        if builder is not None:
+            page.layout().addWidget(builder())
+
+    def detach_hidden_tabs(self):
+        """Takes the content of hidden tabs out of the window until shown.
+
+        A window stylesheet change re-polishes every widget under the window,
+        so hidden tabs are restyled on their next view instead.
+        """
+        current = self.tab_widget.currentWidget()
+        for index in range(self.tab_widget.count()):
+            page = self.tab_widget.widget(index)
+            item = page.layout().itemAt(0)
+            if page is current or item is None:
+                continue
+            content = item.widget()
+            page.layout().removeWidget(content)
+            content.setParent(None)
+            self.detached_tab_content[page] = content
+
+    def paintEvent(self, event):
+        """Records the first paint and then starts deferred startup work."""
+        super().paintEvent(event)
+        if not self.first_paint_done:
+            self.first_paint_done = True
+            mark_startup("first_paint")
+            QTimer.singleShot(0, self.on_first_paint)
+
+    def on_first_paint(self):
+        """Runs startup work that does not need to block the first frame."""
+        start_ytdlp_warmup()
+        FFMPEG_PROBE.start()
+        get_extraction_service()
+
+        self.history.ensure_loaded()
+        mark_startup("history")
         self.load_history()
+        self.scan_history_files()
+        self.prewarm_extractor_cache()
+
+        if "--startup-report" in sys.argv:
+            print(startup_report())
 
     # ===== DOWNLOADER TAB =====
 
@@ -878,6 +4293,12 @@ class ClipShrApp(QMainWindow):
         self.url_input.returnPressed.connect(self.determine_fetch_type)
         self.url_input.textChanged.connect(self.clear_ui_on_text_change)
 
+        self.prefetch_timer = QTimer(self)
+        self.prefetch_timer.setSingleShot(True)
+        self.prefetch_timer.setInterval(PREFETCH_DELAY_MS)
+        self.prefetch_timer.timeout.connect(self.prefetch_metadata)
+        self.url_input.textChanged.connect(self.prefetch_timer.start)
+
         self.fetch_button = QPushButton("Fetch Details")
         self.fetch_button.setMinimumWidth(140)
         self.fetch_button.clicked.connect(self.determine_fetch_type)
@@ -945,13 +4366,13 @@ class ClipShrApp(QMainWindow):
             key = label_text.rstrip(":")
 
             label = QLabel(label_text)
-            label.setStyleSheet("font-weight: 600; color: #666666;")
+            label.setObjectName("MetaKeyLabel")
             meta_grid.addWidget(label, i, 0, Qt.AlignTop)
 
             value = QLabel("N/A")
             value.setWordWrap(True)
             value.setTextInteractionFlags(Qt.TextSelectableByMouse)
-            value.setStyleSheet("font-weight: 500; color: #333333;")
+            value.setObjectName("MetaValueLabel")
             meta_grid.addWidget(value, i, 1)
 
             self.meta_labels[key] = value
@@ -978,32 +4399,65 @@ class ClipShrApp(QMainWindow):
         self.end_time_input.setPlaceholderText("Leave blank for full duration")
         manual_grid.addWidget(self.end_time_input, 1, 1)
 
+        clip_buttons = QHBoxLayout()
+        self.add_clip_button = QPushButton("Add Range to Clip List")
+        self.add_clip_button.clicked.connect(self.add_clip_range)
+        clip_buttons.addWidget(self.add_clip_button)
+        self.clear_clips_button = QPushButton("Clear Clip List")
+        self.clear_clips_button.clicked.connect(self.clear_clip_ranges)
+        clip_buttons.addWidget(self.clear_clips_button)
+        manual_grid.addLayout(clip_buttons, 2, 0, 1, 2)
+
+        self.clip_list_widget = QListWidget()
+        self.clip_list_widget.setMaximumHeight(90)
+        self.clip_list_widget.hide()
+        manual_grid.addWidget(self.clip_list_widget, 3, 0, 1, 2)
+
         trim_vbox.addWidget(manual_group)
 
-        # Timeline placeholder
-        timeline_group = QGroupBox("2. Interactive Timeline (Future Feature)")
+        # Timeline filmstrip
+        timeline_group = QGroupBox("2. Timeline")
         timeline_vbox = QVBoxLayout(timeline_group)
         timeline_label = QLabel(
-            "Interactive drag-and-drop timeline selection is not yet implemented in this version."
+            "Left-click a frame to set the start time, right-click to set the end time."
         )
         timeline_label.setWordWrap(True)
         timeline_label.setStyleSheet("color: #888888; font-style: italic;")
         timeline_vbox.addWidget(timeline_label)
 
-        timeline_placeholder = QLabel("[ Visual Timeline / Waveform Placeholder ]")
-        timeline_placeholder.setAlignment(Qt.AlignCenter)
-        timeline_placeholder.setStyleSheet(
-            """
-            background-color: #F5F5F5;
-            border: 1px dashed #CCCCCC;
-            padding: 20px;
-            border-radius: 6px;
-            color: #999999;
-        """
-        )
-        timeline_vbox.addWidget(timeline_placeholder)
+        self.filmstrip = FilmstripWidget()
+        self.filmstrip.frame_clicked.connect(self.on_filmstrip_clicked)
+        timeline_vbox.addWidget(self.filmstrip)
         trim_vbox.addWidget(timeline_group)
 
+        # Trim point preview
+        preview_group = QGroupBox("3. Preview (video frames only, no sound)")
+        preview_vbox = QVBoxLayout(preview_group)
+        self.preview_player = PreviewPlayer()
+        self.preview_player.setToolTip(
+            f"A silent {PREVIEW_FPS} fps frame preview of {PREVIEW_WINDOW} seconds "
+            "around the trim point, for checking where the cut lands."
+        )
+        self.preview_player.first_frame_late.connect(self.on_preview_first_frame_late)
+        preview_vbox.addWidget(self.preview_player)
+
+        preview_buttons = QHBoxLayout()
+        self.preview_start_button = QPushButton("Preview Start")
+        self.preview_start_button.clicked.connect(
+            lambda: self.preview_trim_point(is_end=False)
+        )
+        preview_buttons.addWidget(self.preview_start_button)
+        self.preview_play_button = QPushButton("Play / Pause")
+        self.preview_play_button.clicked.connect(self.preview_player.toggle_playback)
+        preview_buttons.addWidget(self.preview_play_button)
+        self.preview_end_button = QPushButton("Preview End")
+        self.preview_end_button.clicked.connect(
+            lambda: self.preview_trim_point(is_end=True)
+        )
+        preview_buttons.addWidget(self.preview_end_button)
+        preview_vbox.addLayout(preview_buttons)
+        trim_vbox.addWidget(preview_group)
+
         vbox.addWidget(self.trim_group)
         self.trim_group.hide()
 
@@ -1026,18 +4480,19 @@ class ClipShrApp(QMainWindow):
         video_vbox = QVBoxLayout(self.video_format_group)
         video_vbox.setSpacing(5)
 
-        video_header = QLabel("Quality | Format | Size")
-        video_header.setStyleSheet(
-            "font-weight: 600; color: #888888; font-size: 9pt; padding: 5px;"
-        )
+        video_header = QLabel("Quality | Format | Cost | Size | Est. Time")
+        video_header.setObjectName("ListHeaderLabel")
         video_vbox.addWidget(video_header)
 
-        self.video_list_widget = QListWidget()
-        self.video_list_widget.setSelectionMode(QListWidget.SingleSelection)
-        self.video_list_widget.itemSelectionChanged.connect(
+        self.video_format_model = FormatListModel(self)
+        self.video_list_view = QListView()
+        self.video_list_view.setModel(self.video_format_model)
+        self.video_list_view.setSelectionMode(QListView.SingleSelection)
+        self.video_list_view.setUniformItemSizes(True)
+        self.video_list_view.selectionModel().selectionChanged.connect(
             self.on_video_format_selected
         )
-        video_vbox.addWidget(self.video_list_widget)
+        video_vbox.addWidget(self.video_list_view)
 
         formats_layout.addWidget(self.video_format_group, 3)
 
@@ -1046,18 +4501,34 @@ class ClipShrApp(QMainWindow):
         audio_vbox = QVBoxLayout(self.audio_format_group)
         audio_vbox.setSpacing(5)
 
-        audio_header = QLabel("Quality | Format | Size")
-        audio_header.setStyleSheet(
-            "font-weight: 600; color: #888888; font-size: 9pt; padding: 5px;"
-        )
+        audio_header = QLabel("Quality | Format | Cost | Size | Est. Time")
+        audio_header.setObjectName("ListHeaderLabel")
         audio_vbox.addWidget(audio_header)
 
-        self.audio_list_widget = QListWidget()
-        self.audio_list_widget.setSelectionMode(QListWidget.SingleSelection)
-        self.audio_list_widget.itemSelectionChanged.connect(
+        self.audio_format_model = FormatListModel(self)
+        self.audio_list_view = QListView()
+        self.audio_list_view.setModel(self.audio_format_model)
+        self.audio_list_view.setSelectionMode(QListView.SingleSelection)
+        self.audio_list_view.setUniformItemSizes(True)
+        self.audio_list_view.selectionModel().selectionChanged.connect(
             self.on_audio_format_selected
         )
-        audio_vbox.addWidget(self.audio_list_widget)
+        audio_vbox.addWidget(self.audio_list_view)
+
+        audio_target_row = QHBoxLayout()
+        audio_target_row.addWidget(QLabel("Save audio as:"))
+        self.audio_target_combo = QComboBox()
+        for key, spec in AUDIO_TARGETS.items():
+            self.audio_target_combo.addItem(spec["label"], key)
+        target_index = self.audio_target_combo.findData(
+            self.config.get("audio_target", "native")
+        )
+        self.audio_target_combo.setCurrentIndex(max(target_index, 0))
+        self.audio_target_combo.currentIndexChanged.connect(
+            self.on_audio_target_changed
+        )
+        audio_target_row.addWidget(self.audio_target_combo, 1)
+        audio_vbox.addLayout(audio_target_row)
 
         formats_layout.addWidget(self.audio_format_group, 2)
 
@@ -1071,18 +4542,9 @@ class ClipShrApp(QMainWindow):
 
         # === STATUS LABEL ===
         self.status_label = QLabel("Status: Ready to fetch link.")
+        self.status_label.setObjectName("StatusLabel")
+        self.status_label.setProperty("state", "info")
         self.status_label.setAlignment(Qt.AlignCenter)
-        self.status_label.setStyleSheet(
-            """
-            padding: 10px;
-            font-weight: 500;
-            font-size: 10pt;
-            color: #666666;
-            background-color: #F8F9FA;
-            border-radius: 6px;
-            border: 1px solid #DEE2E6;
-        """
-        )
         formats_layout.addWidget(self.status_label)
 
         # === DOWNLOAD BUTTON ===
@@ -1115,6 +4577,11 @@ class ClipShrApp(QMainWindow):
 
     def fetch_image_details(self, url):
         """Fetches and processes direct image URLs."""
+        cached = self.image_prefetch_cache.get(url)
+        if cached is not None:
+            self.process_image_details(*cached)
+            return
+
         self.update_status("Fetching image details...")
         self.fetch_button.setEnabled(False)
         self.download_button.setEnabled(False)
@@ -1169,35 +4636,125 @@ class ClipShrApp(QMainWindow):
         self.meta_labels["URL"].setText(self.metadata["url"])
 
         # Update format lists for image
-        self.video_list_widget.clear()
-        self.audio_list_widget.clear()
         self.video_format_group.setTitle("Image Format")
         self.audio_format_group.setTitle("Download Info")
 
         # Create image format entry
-        image_format = {
-            "format_id": "image_original",
-            "display_quality": f"Original {Path(filename).suffix.upper().lstrip('.')} Format",
-            "ext": Path(filename).suffix.upper().lstrip("."),
-            "size": format_bytes(len(image_data)),
-            "raw_format": {
-                "vcodec": "image",
-                "acodec": "none",
-            },
-        }
-
-        self._populate_format_list(self.video_list_widget, [image_format])
+        image_ext = Path(filename).suffix.upper().lstrip(".")
+        image_format = FormatRecord(
+            "image_original",
+            FormatRecord.KIND_IMAGE,
+            f"Original {image_ext} Format",
+            ext=image_ext,
+            size=len(image_data),
+            vcodec="image",
+        )
+        self.video_format_model.set_records([image_format])
 
         # Info in audio section
-        info_item = QListWidgetItem("Direct image download - no conversion needed")
-        info_item.setFlags(Qt.NoItemFlags)
-        self.audio_list_widget.addItem(info_item)
+        self.audio_format_model.set_records(
+            [], placeholder="Direct image download - no conversion needed"
+        )
 
         self.trim_group.hide()
         self.download_button.setEnabled(False)
 
+    def prefetch_metadata(self):
+        """Starts extracting the URL in the box before the user presses Fetch."""
+        url = self.url_input.text().strip()
+        if not is_valid_media_url(url) or is_image_url(url):
+            return
+
+        # Drop the previous speculative request if it has not started yet
+        previous = self.prefetch_future
+        if previous is not None and previous.cancel():
+            DEBUG_METRICS.add("prefetch_cancelled")
+
+        self.prefetch_future = self._get_metadata_future(url)
+
+    def _get_metadata_future(self, url, service=None):
+        """Returns a cached or new extraction Future for a URL."""
+        future = self.prefetch_cache.get(url)
+        if future is not None and not future.cancelled():
+            if not future.done() or future.exception() is None:
+                return future
+
+        future = (service or get_extraction_service()).submit(url)
+        self.prefetch_cache.put(url, future)
+        DEBUG_METRICS.add("prefetch_started")
+        return future
+
+    def on_clipboard_changed(self):
+        """Pre-resolves media/image links copied anywhere (if enabled)."""
+        if not self.config.get("clipboard_prefetch", False):
+            return
+
+        url = QApplication.clipboard().text().strip()
+        if not is_valid_media_url(url):
+            return
+        if url in self.prefetch_cache or url in self.image_prefetch_cache:
+            return
+
+        if is_image_url(url):
+            DEBUG_METRICS.add("clipboard_links_seen")
+            self.preresolve_pool.submit(self._preresolve_image, url)
+            return
+
+        # Other links (docs, tickets, searches) would only reach the Generic
+        # extractor, which downloads the whole page; links copied before the
+        # warm-up finishes are skipped too
+        if not has_site_extractor(url):
+            DEBUG_METRICS.add("clipboard_links_skipped")
+            return
+
+        DEBUG_METRICS.add("clipboard_links_seen")
+        future = self._get_metadata_future(
+            url, service=get_background_extraction_service()
+        )
+        future.add_done_callback(self._queue_thumbnail_preresolve)
+
+    def _queue_thumbnail_preresolve(self, future):
+        """Hands a finished extraction to the pool to fetch its thumbnail."""
+        try:
+            self.preresolve_pool.submit(self._preresolve_thumbnail, future)
+        except RuntimeError:
+            # The pool is shut down on close
+            pass
+
+    def _preresolve_image(self, url):
+        """Downloads a direct image link into the prefetch cache (pool thread)."""
+        try:
+            image_data = fetch_url_bytes(url, timeout=15, require_image=True)
+        except Exception:
+            return
+        self.image_prefetch_cache.put(url, (image_data, image_filename_from_url(url)))
+
+    def _preresolve_thumbnail(self, future):
+        """Caches the thumbnail of finished metadata (pool thread)."""
+        try:
+            thumbnail_url = future.result().get("thumbnail")
+            if thumbnail_url and thumbnail_url not in self.thumbnail_cache:
+                self.thumbnail_cache.put(thumbnail_url, fetch_url_bytes(thumbnail_url))
+                DEBUG_METRICS.add("clipboard_thumbnails_cached")
+        except Exception:
+            pass
+
     def fetch_metadata(self, url):
         """Fetches video/audio metadata using yt-dlp."""
+        self.prefetch_timer.stop()
+        future = self._get_metadata_future(url)
+
+        # A background pre-resolve that has not started yet moves to the
+        # foreground service instead of waiting its turn.
+        if not future.done() and not future.running() and future.cancel():
+            future = self._get_metadata_future(url)
+
+        # Common paste-then-click flow: the prefetch already finished
+        if future.done() and not future.cancelled() and future.exception() is None:
+            DEBUG_METRICS.add("prefetch_hits")
+            self.process_metadata(future.result())
+            return
+
         self.update_status("Fetching media details...")
         self.fetch_button.setEnabled(False)
         self.download_button.setEnabled(False)
@@ -1205,7 +4762,7 @@ class ClipShrApp(QMainWindow):
         self.loading_overlay.set_message("Extracting media information...")
         self.loading_overlay.show()
 
-        self.ytdlp_thread = YtdlpWorker(url)
+        self.ytdlp_thread = YtdlpWorker(url, future)
         self.ytdlp_thread.metadata_fetched.connect(self.process_metadata)
         self.ytdlp_thread.error_occurred.connect(self.handle_fetch_error)
         self.ytdlp_thread.start()
@@ -1229,8 +4786,11 @@ class ClipShrApp(QMainWindow):
 
         # Display preview and formats
         self.display_preview(info)
-        self.display_formats(info.get("formats", []))
+        self.display_formats(info.get("formats", []), info.get("duration"))
+        self.probe_format_sizes(info)
         self.trim_group.show()
+        self.start_filmstrip(info)
+        self.reset_preview_player(info)
 
     def display_preview(self, info):
         """Displays thumbnail and metadata information."""
@@ -1274,11 +4834,10 @@ class ClipShrApp(QMainWindow):
         thumbnail_url = info.get("thumbnail")
         if thumbnail_url:
             try:
-                req = urllib.request.Request(
-                    thumbnail_url, headers={"User-Agent": "Mozilla/5.0"}
-                )
-                with urllib.request.urlopen(req, timeout=10) as response:
-                    image_data = response.read()
+                image_data = self.thumbnail_cache.get(thumbnail_url)
+                if image_data is None:
+                    image_data = fetch_url_bytes(thumbnail_url)
+                    self.thumbnail_cache.put(thumbnail_url, image_data)
 
                 pixmap = QPixmap()
                 pixmap.loadFromData(image_data)
@@ -1299,11 +4858,12 @@ class ClipShrApp(QMainWindow):
         else:
             self.thumbnail_label.setText("No thumbnail available")
 
-    def display_formats(self, formats):
-        """Displays available formats grouped by video and audio (CLEAN VERSION)."""
-        self.video_list_widget.clear()
-        self.audio_list_widget.clear()
+    def display_formats(self, formats, duration=None):
+        """Displays available formats grouped by video and audio (CLEAN VERSION).
 
+        Formats without a reported size get one estimated from their bitrate
+        and the duration, shown with a leading "~".
+        """
         video_formats = []
         audio_formats = []
 
@@ -1312,7 +4872,7 @@ class ClipShrApp(QMainWindow):
         best_audio_size = 0
 
         for f in formats:
-            size = f.get("filesize") or f.get("filesize_approx") or 0
+            size = estimate_format_size(f, duration)[0] or 0
 
             if f.get("vcodec") != "none" and size > best_video_size:
                 best_video_size = size
@@ -1324,60 +4884,46 @@ class ClipShrApp(QMainWindow):
             ):
                 best_audio_size = size
 
+        force_mp4 = self.config.get("force_mp4", False)
+
         # Create BEST QUALITY format entry (auto-merged video+audio)
         if best_video_size > 0:
             estimated_size = best_video_size + best_audio_size
             video_formats.append(
-                {
-                    "format_id": "bestvideo+bestaudio/best",
-                    "display_quality": "BEST QUALITY (Full Video + Audio)",
-                    "ext": "MP4 (MERGED)",
-                    "size": (
-                        format_bytes(estimated_size)
-                        if estimated_size > 0
-                        else "Size Unknown"
-                    ),
-                    "raw_format": {
-                        "vcodec": "best",
-                        "acodec": "best",
-                        "height": 999999,
-                    },
-                    "is_best": True,
-                }
+                FormatRecord(
+                    "bestvideo+bestaudio/best",
+                    FormatRecord.KIND_BEST,
+                    "BEST QUALITY (Full Video + Audio)",
+                    ext="MP4" if force_mp4 else "AUTO",
+                    container="mp4" if force_mp4 else None,
+                    cost=COST_REMUX,
+                    size=estimated_size or None,
+                    size_is_estimate=True,
+                    height=999999,
+                    vcodec="best",
+                    acodec="best",
+                )
             )
 
         # Process all other formats
         for f in formats:
-            filesize = f.get("filesize") or f.get("filesize_approx")
-
-            if not filesize:
-                continue
-
-            format_data = {
-                "format_id": f["format_id"],
-                "ext": f.get("ext", "unknown").upper(),
-                "size": format_bytes(filesize),
-                "raw_format": f,
-            }
-
-            height = f.get("height", 0)
-            fps = f.get("fps", 30)
             vcodec = f.get("vcodec", "none")
             acodec = f.get("acodec", "none")
 
-            # VIDEO + AUDIO (Combined)
+            # VIDEO + AUDIO (Pre-muxed) - saved as-is, no merge needed
             if vcodec != "none" and acodec != "none":
+                height = f.get("height") or 0
+                fps = f.get("fps") or 0
                 quality_text = (
-                    f"Video Only (Muted) - {height}p"
-                    if height
-                    else "Video Only (Muted)"
+                    f"Video + Audio - {height}p" if height else "Video + Audio"
                 )
-                if fps and fps > 30:
+                if fps > 30:
                     quality_text += f" {fps}fps"
-
-                format_data["display_quality"] = quality_text
-                # Don't add these - they're confusing for users
-                # video_formats.append(format_data)
+                video_formats.append(
+                    FormatRecord.from_ytdlp(
+                        f, FormatRecord.KIND_MUXED, quality_text, duration, force_mp4
+                    )
+                )
 
             # VIDEO ONLY - Skip these to avoid confusion
             elif vcodec != "none" and acodec == "none":
@@ -1387,92 +4933,314 @@ class ClipShrApp(QMainWindow):
             elif vcodec == "none" and acodec != "none":
                 abr = f.get("abr", 0)
                 quality_text = f"Audio Only - {int(abr)}kbps" if abr else "Audio Only"
+                audio_formats.append(
+                    FormatRecord.from_ytdlp(
+                        f, FormatRecord.KIND_AUDIO, quality_text, duration
+                    )
+                )
 
-                format_data["display_quality"] = quality_text
-                audio_formats.append(format_data)
+        # Audio rows show what saving them as the chosen target costs
+        audio_target = self.config.get("audio_target", "native")
+        for record in audio_formats:
+            record.cost, _, target_ext = audio_conversion_plan(
+                record.acodec, record.container, audio_target
+            )
+            record.ext = target_ext.upper()
 
         # Sort formats
-        video_formats.sort(key=lambda x: x["raw_format"].get("height", 0), reverse=True)
+        video_formats.sort(key=lambda r: r.height, reverse=True)
+        audio_formats.sort(key=lambda r: r.abr, reverse=True)
 
-        audio_formats.sort(key=lambda x: x["raw_format"].get("abr", 0), reverse=True)
+        # Ranked picks for this connection go above everything else
+        throughput = estimate_throughput(self.config.get("recent_throughput"))
+        video_formats[:0] = recommend_formats(formats, duration, throughput, force_mp4)
 
-        # Populate lists
-        self._populate_format_list(self.video_list_widget, video_formats)
-        self._populate_format_list(self.audio_list_widget, audio_formats)
+        if throughput:
+            for record in video_formats + audio_formats:
+                if record.size:
+                    record.seconds = record.size / throughput
 
-        # Show message if no formats
-        if not video_formats:
-            item = QListWidgetItem("No video formats available")
-            item.setFlags(Qt.NoItemFlags)
-            self.video_list_widget.addItem(item)
+        # Populate lists (a placeholder row is shown if there are no formats)
+        previous = self.selected_format
+        self.selected_format = None
+        self.download_button.setEnabled(False)
+        self.video_format_model.set_records(
+            video_formats, placeholder="No video formats available"
+        )
+        self.audio_format_model.set_records(
+            audio_formats, placeholder="No audio formats available"
+        )
 
-        if not audio_formats:
-            item = QListWidgetItem("No audio formats available")
-            item.setFlags(Qt.NoItemFlags)
-            self.audio_list_widget.addItem(item)
+        # A redisplay of the same media keeps the row the user had picked
+        if previous is not None:
+            for view in (self.video_list_view, self.audio_list_view):
+                row = view.model().find_row(previous.format_id, previous.label)
+                if row >= 0:
+                    view.setCurrentIndex(view.model().index(row))
+                    break
+
+    def probe_format_sizes(self, info):
+        """HEADs direct-download formats lacking an exact size (if enabled)."""
+        if not self.config.get("probe_format_sizes", False):
+            return
 
-    def _populate_format_list(self, list_widget, formats):
-        """Populates format lists with clean text items (EXACTLY like your reference UI)."""
-        list_widget.clear()
+        urls_by_format = {
+            f["format_id"]: f["url"]
+            for f in info.get("formats", [])
+            if not f.get("filesize")
+            and f.get("url")
+            and f.get("protocol") in DIRECT_HTTP_PROTOCOLS
+        }
+        if not urls_by_format:
+            return
 
-        if not formats:
+        self.stop_format_size_probe()
+        self.size_probe_thread = FormatSizeProbeWorker(
+            info.get("webpage_url", ""), urls_by_format, parent=self
+        )
+        self.size_probe_thread.sizes_probed.connect(self.on_format_sizes_probed)
+        self.size_probe_thread.finished.connect(self.on_size_probe_worker_finished)
+        self.size_probe_thread.finished.connect(self.size_probe_thread.deleteLater)
+        self.size_probe_thread.start()
+
+    def stop_format_size_probe(self):
+        """Abandons the running probe without waiting; it is deleted once done."""
+        if self.size_probe_thread is not None:
+            self.size_probe_thread.requestInterruption()
+            self.size_probe_thread = None
+
+    def on_size_probe_worker_finished(self):
+        # Forget the worker before deleteLater destroys it
+        if self.sender() is self.size_probe_thread:
+            self.size_probe_thread = None
+
+    def start_filmstrip(self, info):
+        """Samples timeline frames for the fetched media, reusing cached ones."""
+        self.stop_filmstrip()
+        duration = info.get("duration")
+        stream = info.get("preview")
+        if not duration or not stream:
+            self.filmstrip.clear("No timeline preview for this media")
+            return
+        # Never probe on the UI thread; the probe ran after first paint
+        caps = FFMPEG_PROBE.caps(wait=False) or {}
+        if not caps.get("available"):
+            self.filmstrip.clear("Timeline preview needs FFmpeg on your PATH")
             return
 
-        palette = PALETTES[self.config["theme"]]
+        key = media_key(info)
+        times = filmstrip_times(duration)
+        self.filmstrip.reset(times)
 
-        for f in formats:
-            # Create clean text format (like reference UI)
-            display_text = f["display_quality"]
-            format_text = f"| {f['ext']}"
-            size_text = f["size"]
-
-            # Build formatted string with proper spacing
-            full_text = f"{display_text:<60} {format_text:<15} {size_text:>12}"
-
-            # Create list item
-            list_item = QListWidgetItem(full_text)
-            list_item.setData(Qt.UserRole, f)
-
-            # Color coding based on type
-            if f.get("is_best"):
-                # BEST QUALITY in red
-                list_item.setForeground(QColor(palette["ACCENT_RED"]))
-                font = list_item.font()
-                font.setBold(True)
-                list_item.setFont(font)
-            elif "Video + Audio" in display_text or "Video Only" in display_text:
-                # Video in blue
-                list_item.setForeground(QColor(palette["ACCENT_BLUE"]))
-            elif "Audio Only" in display_text:
-                # Audio in green
-                list_item.setForeground(QColor(palette["ACCENT_GREEN"]))
-            else:
-                # Default
-                list_item.setForeground(QColor(palette["TEXT_PRIMARY"]))
+        frames = self.filmstrip_cache.get(key) or {}
+        for index, data in frames.items():
+            self.filmstrip.set_frame(index, data)
+        missing = [i for i in range(len(times)) if i not in frames]
+        if not missing:
+            DEBUG_METRICS.add("filmstrip_cache_hits")
+            return
+
+        # Parented to the window and deleted once finished, so a stopped
+        # worker can wind down without anyone waiting for it
+        self.filmstrip_thread = FilmstripWorker(
+            self.filmstrip_generation,
+            key,
+            caps["path"],
+            stream,
+            times,
+            missing,
+            parent=self,
+        )
+        self.filmstrip_thread.frame_ready.connect(self.on_filmstrip_frame)
+        self.filmstrip_thread.finished.connect(self.on_filmstrip_worker_finished)
+        self.filmstrip_thread.finished.connect(self.filmstrip_thread.deleteLater)
+        self.filmstrip_thread.start()
+
+    def on_filmstrip_worker_finished(self):
+        # Forget the worker before deleteLater destroys it
+        if self.sender() is self.filmstrip_thread:
+            self.filmstrip_thread = None
+
+    def stop_filmstrip(self):
+        """Abandons the current strip without blocking (it runs per keystroke)."""
+        self.filmstrip_generation += 1
+        if self.filmstrip_thread is not None:
+            self.filmstrip_thread.stop()
+            self.filmstrip_thread = None
+
+    def on_filmstrip_frame(self, generation, key, index, data):
+        """Caches an arrived frame; draws it only if its strip is still shown."""
+        frames = self.filmstrip_cache.get(key)
+        if frames is None:
+            frames = {}
+            self.filmstrip_cache.put(key, frames)
+        frames[index] = data
+        if generation == self.filmstrip_generation:
+            self.filmstrip.set_frame(index, data)
+
+    def on_filmstrip_clicked(self, seconds, is_end):
+        if is_end:
+            self.end_time_input.setText(format_hms(seconds))
+        else:
+            self.start_time_input.setText(format_hms(seconds))
+        if self.preview_start_button.isEnabled():
+            self.preview_trim_point(is_end)
+
+    def reset_preview_player(self, info):
+        """Enables trim previews when the media has a stream ffmpeg can seek."""
+        self.stop_preview()
+        # Until the ffmpeg probe finishes, preview_trim_point checks again
+        caps = FFMPEG_PROBE.caps(wait=False)
+        available = bool(
+            info.get("duration")
+            and info.get("preview")
+            and (caps is None or caps.get("available"))
+        )
+        for button in (
+            self.preview_start_button,
+            self.preview_play_button,
+            self.preview_end_button,
+        ):
+            button.setEnabled(available)
+        self.preview_player.clear(
+            "Preview the start or end time"
+            if available
+            else "No preview for this media (needs FFmpeg and a video stream)"
+        )
+
+    def preview_trim_point(self, is_end):
+        """Plays the seconds after the start input or leading up to the end input."""
+        if not self.metadata or not self.metadata.get("preview"):
+            return
+        caps = FFMPEG_PROBE.caps(wait=False)
+        if not caps or not caps.get("available"):
+            self.update_status(
+                "Still checking FFmpeg, try the preview again in a moment."
+                if caps is None
+                else "Previews need FFmpeg.",
+                error=caps is not None,
+            )
+            return
+        duration = self.metadata.get("duration") or 0
+        field = self.end_time_input if is_end else self.start_time_input
+        try:
+            seconds = parse_hms(field.text())
+        except ValueError:
+            if not (is_end and not field.text().strip()):
+                self.update_status(
+                    "Enter the time as HH:MM:SS to preview it.", error=True
+                )
+                return
+            seconds = duration
+        seconds = min(seconds, duration)
 
-            list_widget.addItem(list_item)
+        if is_end:
+            start, end = max(0, seconds - PREVIEW_WINDOW), seconds
+        else:
+            start, end = seconds, min(duration, seconds + PREVIEW_WINDOW)
+        if end <= start:
+            return
+
+        DEBUG_METRICS.add("preview_seeks")
+        key = media_key(self.metadata)
+        segments = self.preview_buffers.get(key)
+        if segments is None:
+            segments = []
+            self.preview_buffers.put(key, segments)
+        for segment in segments:
+            # A window that failed to decode is skipped and fetched again
+            if segment.covers(start, end) and (segment.frames or not segment.complete):
+                DEBUG_METRICS.add("preview_buffer_hits")
+                self.preview_player.load(segment)
+                return
+
+        segment = PreviewSegment(start, end)
+        segments.append(segment)
+        del segments[:-PREVIEW_SEGMENTS_PER_VIDEO]
+        self.stop_preview()
+        self.preview_player.load(segment)
+
+        self.preview_thread = PreviewSnippetWorker(
+            caps["path"], self.metadata["preview"], segment, parent=self
+        )
+        self.preview_thread.frame_ready.connect(self.on_preview_frame)
+        self.preview_thread.segment_finished.connect(self.on_preview_segment_finished)
+        self.preview_thread.finished.connect(self.on_preview_worker_finished)
+        self.preview_thread.finished.connect(self.preview_thread.deleteLater)
+        self.preview_thread.start()
+
+    def stop_preview(self):
+        """Stops the decoding window without waiting; its frames stay buffered."""
+        if self.preview_thread is not None:
+            self.preview_thread.stop()
+            self.preview_thread = None
+
+    def on_preview_worker_finished(self):
+        # Forget the worker before deleteLater destroys it
+        if self.sender() is self.preview_thread:
+            self.preview_thread = None
+
+    def on_preview_first_frame_late(self, segment):
+        """Stands in the closest timeline frame for a window that is slow to decode."""
+        nearest = self.filmstrip.nearest_frame(segment.start)
+        if nearest is not None:
+            self.preview_player.show_stand_in(*nearest)
+
+    def on_preview_frame(self, segment, data):
+        segment.frames.append(data)
+        self.preview_player.frame_added(segment)
+
+    def on_preview_segment_finished(self, segment, interrupted):
+        """Marks a window complete; a stopped one keeps only what was decoded."""
+        segment.complete = True
+        if interrupted:
+            segment.end = min(segment.end, segment.frame_time(len(segment.frames)))
+        self.preview_player.segment_finished(segment)
+
+    def on_format_sizes_probed(self, key, sizes):
+        """Redisplays formats with probed sizes if the same media is shown.
+
+        The sizes are already in CONTENT_LENGTH_CACHE, so a redisplay also
+        updates estimated times, the BEST QUALITY total and recommendations.
+        """
+        if (
+            not sizes
+            or not self.metadata
+            or self.metadata.get("webpage_url", "") != key
+        ):
+            return
+        self.display_formats(
+            self.metadata.get("formats", []), self.metadata.get("duration")
+        )
 
     def on_video_format_selected(self):
         """Handles video format selection."""
-        self.audio_list_widget.clearSelection()
-        selected_items = self.video_list_widget.selectedItems()
-        self._handle_format_selection(selected_items)
+        if self.video_list_view.selectionModel().hasSelection():
+            self.audio_list_view.clearSelection()
+        self._handle_format_selection()
 
     def on_audio_format_selected(self):
         """Handles audio format selection."""
-        self.video_list_widget.clearSelection()
-        selected_items = self.audio_list_widget.selectedItems()
-        self._handle_format_selection(selected_items)
-
-    def _handle_format_selection(self, selected_items):
+        if self.audio_list_view.selectionModel().hasSelection():
+            self.video_list_view.clearSelection()
+        self._handle_format_selection()
+
+    def _selected_format_record(self):
+        """Returns the FormatRecord selected in either list, or None."""
+        for view in (self.video_list_view, self.audio_list_view):
+            indexes = view.selectionModel().selectedIndexes()
+            if indexes:
+                return view.model().record(indexes[0].row())
+        return None
+
+    def _handle_format_selection(self):
         """Stores selected format and enables download button."""
-        if selected_items:
-            self.selected_format = selected_items[0].data(Qt.UserRole)
+        self.selected_format = self._selected_format_record()
 
-            if self.selected_format:
-                self.download_button.setEnabled(True)
-                quality = self.selected_format.get("display_quality", "N/A")
-                self.update_status(f"Selected: {quality} - Ready to download!")
+        if self.selected_format:
+            self.download_button.setEnabled(True)
+            quality = self.selected_format.label
+            self.update_status(f"Selected: {quality} - Ready to download!")
         else:
             self.selected_format = None
             self.download_button.setEnabled(False)
@@ -1497,46 +5265,37 @@ class ClipShrApp(QMainWindow):
             label.setText("N/A")
 
         # Clear format lists
-        self.video_list_widget.clear()
-        self.audio_list_widget.clear()
+        self.video_format_model.clear()
+        self.audio_format_model.clear()
         self.video_format_group.setTitle("Video Formats")
         self.audio_format_group.setTitle("Audio Formats")
 
         # Reset time inputs
         self.start_time_input.setText("00:00:00")
         self.end_time_input.clear()
+        self.clear_clip_ranges()
+        self.stop_filmstrip()
+        self.filmstrip.clear()
+        self.stop_preview()
+        self.preview_player.clear()
         self.trim_group.hide()
 
     def update_status(self, message, error=False):
         """Updates the status label with appropriate styling."""
         self.status_label.setText(f"Status: {message}")
 
-        palette = PALETTES[self.config["theme"]]
-
         if error:
-            bg_color = "#FFF3CD"
-            text_color = "#856404"
-            border_color = "#FFC107"
+            state = "error"
         elif "Ready" in message or "successfully" in message or "Selected" in message:
-            bg_color = "#D4EDDA"
-            text_color = "#155724"
-            border_color = "#28A745"
+            state = "success"
         else:
-            bg_color = palette["BG_CARD"]
-            text_color = palette["TEXT_PRIMARY"]
-            border_color = palette["BORDER"]
-
-        self.status_label.setStyleSheet(
-            f"""
-            background-color: {bg_color};
-            color: {text_color};
-            padding: 10px;
-            font-weight: 500;
-            font-size: 10pt;
-            border-radius: 6px;
-            border: 1px solid {border_color};
-        """
-        )
+            state = "info"
+
+        # Only re-polish this label, and only when its state actually changes
+        if self.status_label.property("state") != state:
+            self.status_label.setProperty("state", state)
+            self.status_label.style().unpolish(self.status_label)
+            self.status_label.style().polish(self.status_label)
 
     # ===== DOWNLOAD EXECUTION =====
 
@@ -1549,7 +5308,7 @@ class ClipShrApp(QMainWindow):
             return
 
         url = self.url_input.text().strip()
-        format_id = self.selected_format["format_id"]
+        format_id = self.selected_format.format_id
 
         # Get trim times
         start_time = self.start_time_input.text().strip()
@@ -1576,6 +5335,45 @@ class ClipShrApp(QMainWindow):
                 )
                 return
 
+        # Several ranges: one covering download, then all clips in one pass
+        if self.clip_ranges and not self.is_image_mode:
+            self.start_multi_clip_download(url, format_id)
+            return
+
+        # Audio saved as another codec/container is converted afterwards
+        self.download_audio_plan = None
+        record = self.selected_format
+        if record.kind == FormatRecord.KIND_AUDIO:
+            target = self.config.get("audio_target", "native")
+            cost, codec_args, target_ext = audio_conversion_plan(
+                record.acodec, record.container, target
+            )
+            if cost != COST_NONE:
+                caps = FFMPEG_PROBE.caps(wait=False)
+                if caps is None:
+                    self.update_status(
+                        "Still checking FFmpeg, start the download again in a moment."
+                    )
+                    return
+                encoder = AUDIO_TARGETS[target]["encoder"]
+                if not caps.get("available") or (
+                    cost == COST_TRANSCODE
+                    and encoder not in (caps.get("encoders") or [])
+                ):
+                    QMessageBox.warning(
+                        self,
+                        "FFmpeg Required",
+                        f"Saving audio as {AUDIO_TARGETS[target]['label']} needs "
+                        f"FFmpeg with the '{encoder}' encoder.",
+                    )
+                    return
+                self.download_audio_plan = {
+                    "ffmpeg_path": caps["path"],
+                    "codec_args": codec_args,
+                    "ext": target_ext,
+                    "label": f"{record.label} -> {AUDIO_TARGETS[target]['label']}",
+                }
+
         self.update_status("Starting download...")
         self.download_button.setEnabled(False)
         self.fetch_button.setEnabled(False)
@@ -1596,39 +5394,157 @@ class ClipShrApp(QMainWindow):
             filepath=self.media_folder,
             filename_template=filename_template,
             is_image=self.is_image_mode,
+            container=self.selected_format.container,
+            transcode=self.selected_format.cost == COST_TRANSCODE,
+            **self.source_cache_args(format_id),
+        )
+
+        # Connect signals
+        self.download_thread.progress_signal.connect(self.update_download_progress)
+        self.download_thread.finished_signal.connect(self.download_finished)
+        self.download_thread.error_signal.connect(self.handle_download_error)
+        self.download_thread.throughput_signal.connect(self.record_throughput)
+
+        # Start download
+        self.download_thread.start()
+
+    def source_cache_args(self, format_id):
+        """Source cache keyword arguments for a download worker."""
+        source_cache = get_source_cache()
+        if source_cache is None or self.is_image_mode:
+            return {}
+        return {
+            "source_cache": source_cache,
+            "cache_key": SourceCache.make_key(self.metadata, format_id),
+        }
+
+    def add_clip_range(self):
+        """Adds the start/end inputs as one more clip to cut."""
+        try:
+            start = parse_hms(self.start_time_input.text())
+            end = parse_hms(self.end_time_input.text())
+        except ValueError:
+            QMessageBox.warning(
+                self,
+                "Invalid Time Format",
+                "Enter both start and end as HH:MM:SS (e.g., 00:01:30) to add a clip.",
+            )
+            return
+
+        duration = (self.metadata or {}).get("duration")
+        if end <= start or (duration and start >= duration):
+            QMessageBox.warning(
+                self, "Invalid Range", "The end time must be after the start time."
+            )
+            return
+        if duration:
+            end = min(end, int(duration))
+
+        self.clip_ranges.append((start, end))
+        self.clip_list_widget.addItem(
+            f"Clip {len(self.clip_ranges)}: {format_hms(start)} - {format_hms(end)}"
+        )
+        self.clip_list_widget.show()
+        self.start_time_input.setText(format_hms(end))
+        self.end_time_input.clear()
+
+    def clear_clip_ranges(self):
+        """Empties the clip list."""
+        self.clip_ranges = []
+        self.clip_list_widget.clear()
+        self.clip_list_widget.hide()
+
+    def start_multi_clip_download(self, url, format_id):
+        """Downloads the span covering all clip ranges once and cuts each clip."""
+        self.update_status(f"Starting download for {len(self.clip_ranges)} clips...")
+        self.download_button.setEnabled(False)
+        self.fetch_button.setEnabled(False)
+        self.progress_bar.setValue(0)
+
+        self.clip_job = {
+            "original_url": url,
+            "title": self.metadata.get("title", "Clip"),
+            "format": self.selected_format.label or format_id,
+            "saved": 0,
+        }
+        self.download_thread = MultiClipWorker(
+            url=url,
+            format_id=format_id,
+            ranges=list(self.clip_ranges),
+            filepath=self.media_folder,
+            container=self.selected_format.container,
+            **self.source_cache_args(format_id),
         )
-
-        # Connect signals
         self.download_thread.progress_signal.connect(self.update_download_progress)
-        self.download_thread.finished_signal.connect(self.download_finished)
+        self.download_thread.clip_saved.connect(self.clip_saved)
+        self.download_thread.clips_finished.connect(self.clips_finished)
         self.download_thread.error_signal.connect(self.handle_download_error)
-
-        # Start download
+        self.download_thread.throughput_signal.connect(self.record_throughput)
         self.download_thread.start()
 
+    def clip_saved(self, filepath, filename, size_str, range_label):
+        """Adds one cut clip to history as its own entry."""
+        self.clip_job["saved"] += 1
+        self.history.add(
+            {
+                "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                "original_url": self.clip_job["original_url"],
+                "title": f"{self.clip_job['title']} ({range_label})",
+                "format": self.clip_job["format"],
+                "filename": filename,
+                "size": size_str,
+                "is_image": False,
+            }
+        )
+
+    def clips_finished(self, count):
+        """Re-enables the UI once every clip has been written."""
+        self.progress_bar.setValue(100)
+        self.update_status(f"Download Complete! {count} clips saved.")
+        self.download_button.setEnabled(True)
+        self.fetch_button.setEnabled(True)
+
+        QMessageBox.information(
+            self,
+            "Clips Saved",
+            f"{count} clips were cut from a single download.\n"
+            f"Location: {self.media_folder}",
+        )
+
     def update_download_progress(self, percent, status_text):
         """Updates progress bar during download."""
         self.progress_bar.setValue(int(percent))
         self.update_status(f"Downloading... {int(percent)}% | {status_text}")
 
+    def record_throughput(self, bytes_per_second):
+        """Keeps the last few measured download speeds for recommendations."""
+        samples = list(self.config.get("recent_throughput", []))
+        samples.append(round(bytes_per_second))
+        self.config_service.set(
+            "recent_throughput", samples[-RECENT_THROUGHPUT_SAMPLES:]
+        )
+
     def download_finished(self, filepath, filename, size_str, format_id):
         """Handles successful download completion."""
         self.progress_bar.setValue(100)
+
+        if self.download_audio_plan is not None:
+            self.queue_audio_conversion(filepath, format_id)
+            return
+
         self.update_status(f"Download Complete! Size: {size_str}")
 
         # Save to history
-        db = load_db()
         history_item = {
             "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
             "original_url": self.url_input.text().strip(),
             "title": self.metadata.get("title", filename),
-            "format": self.selected_format.get("display_quality", format_id),
+            "format": self.selected_format.label or format_id,
             "filename": filename,
             "size": size_str,
             "is_image": self.is_image_mode,
         }
-        db.append(history_item)
-        save_db(db)
+        self.history.add(history_item)
 
         # Re-enable buttons
         self.download_button.setEnabled(True)
@@ -1655,6 +5571,78 @@ class ClipShrApp(QMainWindow):
         elif msg.clickedButton() == folder_btn:
             QDesktopServices.openUrl(QUrl.fromLocalFile(self.media_folder))
 
+    def queue_audio_conversion(self, filepath, format_id):
+        """Hands a downloaded audio stream to the conversion pool."""
+        plan = self.download_audio_plan
+        self.download_audio_plan = None
+
+        target = str(Path(filepath).with_suffix("." + plan["ext"]))
+        if os.path.normcase(target) == os.path.normcase(filepath):
+            target = str(Path(filepath).with_suffix(".converted." + plan["ext"]))
+
+        self.audio_pool.submit(
+            {
+                "ffmpeg_path": plan["ffmpeg_path"],
+                "source": filepath,
+                "target": target,
+                "codec_args": plan["codec_args"],
+                "title": self.metadata.get("title", os.path.basename(filepath)),
+                "original_url": self.url_input.text().strip(),
+                "format": plan["label"] or format_id,
+            }
+        )
+
+        # The next download can start while this one converts
+        self.download_button.setEnabled(True)
+        self.fetch_button.setEnabled(True)
+        self.update_status(
+            f"Download Complete! Converting {self.audio_pool.pending()} "
+            f"file(s) in the background..."
+        )
+
+    def on_audio_conversion_finished(self, job, error):
+        """Records a finished conversion (or the unconverted file) in history."""
+        filepath = job["source"]
+        if not error:
+            try:
+                os.remove(job["source"])
+            except OSError:
+                pass
+            filepath = job["target"]
+
+        try:
+            size_str = format_bytes(os.path.getsize(filepath))
+        except OSError:
+            size_str = "N/A"
+
+        self.history.add(
+            {
+                "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                "original_url": job["original_url"],
+                "title": job["title"],
+                "format": job["format"],
+                "filename": os.path.basename(filepath),
+                "size": size_str,
+                "is_image": False,
+            }
+        )
+
+        filename = os.path.basename(filepath)
+        if error:
+            self.update_status(
+                f"Conversion failed, kept original {filename}: {error}", error=True
+            )
+        else:
+            remaining = self.audio_pool.pending()
+            self.update_status(
+                f"Converted {filename} ({size_str})"
+                + (f" | {remaining} conversion(s) remaining" if remaining else "")
+            )
+
+    def on_audio_target_changed(self, index):
+        """Saves the audio target chosen in the Downloader tab."""
+        self.config_service.set("audio_target", self.audio_target_combo.itemData(index))
+
     def handle_download_error(self, error_message):
         """Handles download errors."""
         self.progress_bar.setValue(0)
@@ -1689,7 +5677,7 @@ class ClipShrApp(QMainWindow):
         self.refresh_history_btn = QPushButton("Refresh")
         self.refresh_history_btn.setObjectName("SecondaryButton")
         self.refresh_history_btn.setMinimumWidth(100)
-        self.refresh_history_btn.clicked.connect(self.load_history)
+        self.refresh_history_btn.clicked.connect(self.reload_history)
         header_layout.addWidget(self.refresh_history_btn)
 
         header_layout.addStretch(1)
@@ -1703,6 +5691,28 @@ class ClipShrApp(QMainWindow):
 
         vbox.addLayout(header_layout)
 
+        # Clear progress panel (non-modal, shown while files are being removed)
+        self.clear_progress_panel = QGroupBox("Clearing History")
+        clear_panel_layout = QHBoxLayout(self.clear_progress_panel)
+        clear_panel_layout.setSpacing(10)
+
+        self.clear_progress_label = QLabel()
+        self.clear_progress_label.setWordWrap(True)
+        clear_panel_layout.addWidget(self.clear_progress_label, 2)
+
+        self.clear_progress_bar = QProgressBar()
+        self.clear_progress_bar.setRange(0, 100)
+        clear_panel_layout.addWidget(self.clear_progress_bar, 3)
+
+        self.clear_cancel_button = QPushButton("Cancel")
+        self.clear_cancel_button.setObjectName("SecondaryButton")
+        self.clear_cancel_button.setMinimumWidth(100)
+        self.clear_cancel_button.clicked.connect(self.cancel_or_dismiss_clear)
+        clear_panel_layout.addWidget(self.clear_cancel_button)
+
+        vbox.addWidget(self.clear_progress_panel)
+        self.clear_progress_panel.hide()
+
         # History table
         self.history_table = QTableWidget()
         self.history_table.setColumnCount(7)
@@ -1736,15 +5746,26 @@ class ClipShrApp(QMainWindow):
 
         return history_widget
 
+    def reload_history(self):
+        """Re-reads history from disk and refreshes the table."""
+        self.history.load()
+        self.load_history()
+
     def load_history(self):
-        """Loads and displays download history."""
-        db = load_db()
+        """Displays download history."""
+        if self.history_table is None:
+            return
+
+        db = self.history.records()
         self.history_table.setRowCount(len(db))
+        self.history_row_by_id = {}
 
         total_size = 0
-        palette = PALETTES[self.config["theme"]]
 
         for row, item in enumerate(reversed(db)):
+            record_id = item["id"]
+            self.history_row_by_id[record_id] = row
+
             # Date
             date_text = item.get("timestamp", "N/A").split(" ")[0]
             date_item = QTableWidgetItem(date_text)
@@ -1776,21 +5797,14 @@ class ClipShrApp(QMainWindow):
             self.history_table.setItem(row, 4, size_item)
 
             # Calculate total size
-            size_str = item.get("size", "0 B")
-            try:
-                parts = size_str.split()
-                if len(parts) == 2:
-                    value = float(parts[0])
-                    unit = parts[1]
-                    multipliers = {"B": 1, "KB": 1024, "MB": 1024**2, "GB": 1024**3}
-                    total_size += value * multipliers.get(unit, 0)
-            except:
-                pass
+            total_size += parse_size_string(item.get("size", "0 B")) or 0
 
-            # Status
-            status_item = QTableWidgetItem("Completed")
-            status_item.setForeground(QColor(palette["ACCENT_GREEN"]))
+            # Status (filled in by the background file scanner)
+            status = self.history_file_status.get(record_id)
+            status_item = QTableWidgetItem()
             self.history_table.setItem(row, 5, status_item)
+            self._set_history_status(row, status or FILE_STATUS_CHECKING)
+            self._show_postprocess_status(record_id)
 
             # Action buttons
             action_widget = QWidget()
@@ -1801,15 +5815,24 @@ class ClipShrApp(QMainWindow):
             open_btn = QPushButton("Open")
             open_btn.setMinimumWidth(60)
             open_btn.clicked.connect(
-                lambda checked, r=row: self.open_downloaded_file(r)
+                lambda checked, rid=record_id: self.open_downloaded_file(rid)
             )
             action_layout.addWidget(open_btn)
 
+            if not item.get("is_image"):
+                clip_btn = QPushButton("Clip")
+                clip_btn.setMinimumWidth(60)
+                clip_btn.setToolTip("Create a clip from this file (no download)")
+                clip_btn.clicked.connect(
+                    lambda checked, rid=record_id: self.create_clip_from_file(rid)
+                )
+                action_layout.addWidget(clip_btn)
+
             delete_btn = QPushButton("Delete")
             delete_btn.setObjectName("DangerButton")
             delete_btn.setMinimumWidth(60)
             delete_btn.clicked.connect(
-                lambda checked, r=row: self.delete_history_item(r)
+                lambda checked, rid=record_id: self.delete_history_item(rid)
             )
             action_layout.addWidget(delete_btn)
 
@@ -1823,15 +5846,263 @@ class ClipShrApp(QMainWindow):
             f"Total Downloads: {total_downloads} | Total Size: {total_size_str}"
         )
 
-    def open_downloaded_file(self, row_index):
-        """Opens the downloaded file from history."""
-        db = load_db()
-        db_index = len(db) - 1 - row_index
+        self.scan_history_files()
+
+    def scan_history_files(self):
+        """Starts a background check of every history record against the media folder."""
+        if self.history_scan_thread and self.history_scan_thread.isRunning():
+            # Rescan once the current pass is done
+            self.history_scan_pending = True
+            return
+
+        self.history_scan_pending = False
+        self.history_generation += 1
+
+        entries = [
+            (item["id"], item.get("filename", ""), item.get("size", ""))
+            for item in self.history.records()
+        ]
+
+        self.history_scan_thread = HistoryScanWorker(
+            self.history_generation, self.media_folder, entries
+        )
+        self.history_scan_thread.statuses_scanned.connect(self.apply_history_statuses)
+        self.history_scan_thread.finished.connect(self.on_history_scan_finished)
+        self.history_scan_thread.start()
+
+    def on_history_scan_finished(self):
+        """Runs a queued rescan if files changed while scanning."""
+        if self.history_scan_pending:
+            self.scan_history_files()
+
+    def on_media_folder_changed(self, path):
+        """Debounces file system notifications from the media folder."""
+        self.rescan_timer.start()
+
+    def apply_history_statuses(self, generation, statuses):
+        """Pushes a batch of scanned file statuses into the history table."""
+        if generation != self.history_generation:
+            return
+
+        for record_id, status in statuses:
+            self.history_file_status[record_id] = status
+            row = self.history_row_by_id.get(record_id)
+            if row is not None and self.history_table is not None:
+                self._set_history_status(row, status)
+                self._show_postprocess_status(record_id)
+
+    def _set_history_status(self, row, status):
+        """Updates the Status cell of a history row."""
+        status_item = self.history_table.item(row, 5)
+        if status_item is None:
+            return
+
+        palette = PALETTES[self.config["theme"]]
+        colors = {
+            FILE_STATUS_PRESENT: palette["ACCENT_GREEN"],
+            FILE_STATUS_MISSING: palette["ACCENT_RED"],
+            FILE_STATUS_SIZE_MISMATCH: "#E67E22",
+        }
+
+        status_item.setText(status)
+        status_item.setForeground(QColor(colors.get(status, palette["TEXT_SECONDARY"])))
+
+    def _show_postprocess_status(self, record_id):
+        """Shows a running clip/export job's progress in its source row."""
+        jobs = [
+            job
+            for job in self.postprocess_jobs.values()
+            if job["record_id"] == record_id
+        ]
+        row = self.history_row_by_id.get(record_id)
+        if not jobs or row is None or self.history_table is None:
+            return
+
+        status_item = self.history_table.item(row, 5)
+        if status_item is None:
+            return
+        percent = min(job["percent"] for job in jobs)
+        text = f"Clipping {percent:.0f}%"
+        if len(jobs) > 1:
+            text += f" ({len(jobs)} jobs)"
+        status_item.setText(text)
+        status_item.setForeground(QColor(PALETTES[self.config["theme"]]["ACCENT_BLUE"]))
+
+    def create_clip_from_file(self, record_id):
+        """Cuts a new range (optionally at a lower resolution) from a local file."""
+        item = self.history.get(record_id)
+        if item is None:
+            return
+
+        source = os.path.join(self.media_folder, item.get("filename", ""))
+        if not item.get("filename") or not os.path.exists(source):
+            QMessageBox.warning(
+                self,
+                "File Not Found",
+                f"The file no longer exists:\n\n{source}\n\n"
+                "A clip can only be made from a file in the media folder.",
+            )
+            return
+
+        caps = FFMPEG_PROBE.caps(wait=False)
+        if caps is None:
+            # The status bar is on the Downloader tab, so say it here
+            QMessageBox.information(
+                self,
+                "Checking FFmpeg",
+                "ClipShr is still checking your FFmpeg install. "
+                "Try again in a moment.",
+            )
+            return
+        if not caps.get("available") or not caps.get("ffprobe_path"):
+            QMessageBox.warning(
+                self,
+                "FFmpeg Required",
+                "Creating clips from downloaded files needs FFmpeg and ffprobe "
+                "on your system PATH.",
+            )
+            return
+
+        dialog = QDialog(self)
+        dialog.setWindowTitle("Create Clip From File")
+        dialog.setMinimumWidth(420)
+
+        layout = QVBoxLayout(dialog)
+        layout.setSpacing(12)
+
+        source_label = QLabel(f"<b>{item.get('title', 'Unknown')}</b>")
+        source_label.setWordWrap(True)
+        layout.addWidget(source_label)
+
+        grid = QGridLayout()
+        grid.addWidget(QLabel("Start Time (HH:MM:SS):"), 0, 0)
+        start_input = QLineEdit("00:00:00")
+        grid.addWidget(start_input, 0, 1)
+
+        grid.addWidget(QLabel("End Time (HH:MM:SS):"), 1, 0)
+        end_input = QLineEdit()
+        end_input.setPlaceholderText("Leave blank for the end of the file")
+        grid.addWidget(end_input, 1, 1)
+
+        # Audio files have no picture to scale, so they are always copied
+        resolution_combo = QComboBox()
+        resolution_combo.addItem("Original (lossless copy, starts on a keyframe)", None)
+        if not item["filename"].lower().endswith(AUDIO_FILE_EXTENSIONS):
+            for height in EXPORT_HEIGHTS:
+                resolution_combo.addItem(f"{height}p (re-encode, exact start)", height)
+            grid.addWidget(QLabel("Resolution:"), 2, 0)
+            grid.addWidget(resolution_combo, 2, 1)
+        layout.addLayout(grid)
+
+        button_layout = QHBoxLayout()
+        button_layout.addStretch(1)
+
+        cancel_btn = QPushButton("Cancel")
+        cancel_btn.setObjectName("SecondaryButton")
+        cancel_btn.clicked.connect(dialog.reject)
+        button_layout.addWidget(cancel_btn)
+
+        create_btn = QPushButton("Create Clip")
+        create_btn.clicked.connect(dialog.accept)
+        button_layout.addWidget(create_btn)
+        layout.addLayout(button_layout)
+
+        if dialog.exec_() != QDialog.Accepted:
+            return
+
+        try:
+            start = parse_hms(start_input.text())
+            end = parse_hms(end_input.text()) if end_input.text().strip() else None
+        except ValueError:
+            QMessageBox.warning(
+                self,
+                "Invalid Time Format",
+                "Please use HH:MM:SS format for clip times (e.g., 00:01:30)",
+            )
+            return
+        # The file's own duration is checked by export_clip once it is probed
+        if end is not None and end <= start:
+            QMessageBox.warning(
+                self, "Invalid Range", "The end time must be after the start time."
+            )
+            return
+
+        height = resolution_combo.currentData()
+        stem, ext = os.path.splitext(item["filename"])
+        span = f"{format_hms(start, '-')} to " + (
+            format_hms(end, "-") if end is not None else "end"
+        )
+        if height is None:
+            target_name = f"{stem} ({span}){ext}"
+            format_text = "Local clip (lossless copy)"
+        else:
+            target_name = f"{stem} ({span}, {height}p).mp4"
+            format_text = f"Local export {height}p (H.264/AAC)"
+
+        # Repeating a cut writes a new file rather than replacing the last one
+        target = unique_path(
+            os.path.join(self.media_folder, target_name),
+            taken={job["target"] for job in self.postprocess_jobs.values()},
+        )
+
+        job_id = uuid.uuid4().hex
+        self.postprocess_jobs[job_id] = {
+            "record_id": record_id,
+            "target": target,
+            "percent": 0.0,
+            "title": f"{item.get('title', stem)} ({span.replace('-', ':')})",
+            "original_url": item.get("original_url", ""),
+            "format": format_text,
+        }
+        self.postprocess_pool.submit(
+            job_id,
+            export_clip,
+            caps["path"],
+            caps["ffprobe_path"],
+            source,
+            target,
+            start,
+            end,
+            height,
+        )
+        self._show_postprocess_status(record_id)
+
+    def on_postprocess_progress(self, job_id, percent):
+        job = self.postprocess_jobs.get(job_id)
+        if job is not None:
+            job["percent"] = percent
+            self._show_postprocess_status(job["record_id"])
+
+    def on_postprocess_finished(self, job_id, output_path, error):
+        """Adds a finished local clip to history (or reports the failure)."""
+        job = self.postprocess_jobs.pop(job_id, None)
+        if job is None:
+            return
 
-        if db_index < 0 or db_index >= len(db):
+        if error:
+            QMessageBox.warning(
+                self, "Clip Failed", f"Could not create clip:\n\n{error}"
+            )
+        else:
+            self.history.add(
+                {
+                    "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                    "original_url": job["original_url"],
+                    "title": job["title"],
+                    "format": job["format"],
+                    "filename": os.path.basename(output_path),
+                    "size": format_bytes(os.path.getsize(output_path)),
+                    "is_image": False,
+                }
+            )
+        self.load_history()
+
+    def open_downloaded_file(self, record_id):
+        """Opens the downloaded file from history."""
+        item = self.history.get(record_id)
+        if item is None:
             return
 
-        item = db[db_index]
         filename = item.get("filename")
 
         if not filename:
@@ -1850,15 +6121,12 @@ class ClipShrApp(QMainWindow):
 
         QDesktopServices.openUrl(QUrl.fromLocalFile(filepath))
 
-    def delete_history_item(self, row_index):
+    def delete_history_item(self, record_id):
         """Deletes a single history record."""
-        db = load_db()
-        db_index = len(db) - 1 - row_index
-
-        if db_index < 0 or db_index >= len(db):
+        item = self.history.get(record_id)
+        if item is None:
             return
 
-        item = db[db_index]
         title = item.get("title", "this item")
 
         reply = QMessageBox.question(
@@ -1871,13 +6139,13 @@ class ClipShrApp(QMainWindow):
         )
 
         if reply == QMessageBox.Yes:
-            db.pop(db_index)
-            save_db(db)
+            self.history.remove(record_id)
+            self.history_file_status.pop(record_id, None)
             self.load_history()
 
     def clear_history_prompt(self):
         """Prompts user before clearing all history and files."""
-        db = load_db()
+        db = self.history.records()
 
         if not db:
             QMessageBox.information(self, "No History", "History is already empty.")
@@ -1931,37 +6199,77 @@ class ClipShrApp(QMainWindow):
         # Execute
         if dialog.exec_() == QDialog.Accepted:
             if confirm_input.text() == "DELETE ALL":
-                deleted_count = 0
-                failed_files = []
+                self.start_clear_history(db)
+            else:
+                QMessageBox.warning(
+                    self,
+                    "Confirmation Failed",
+                    "Text did not match 'DELETE ALL'. Action cancelled.",
+                )
+
+    def start_clear_history(self, records):
+        """Deletes files and records in the background with a progress panel."""
+        self.clear_history_button.setEnabled(False)
+        self.refresh_history_btn.setEnabled(False)
 
-                for item in db:
-                    filename = item.get("filename", "")
-                    filepath = os.path.join(self.media_folder, filename)
+        self.clear_progress_bar.setValue(0)
+        self.clear_progress_label.setText(f"Deleting 0 of {len(records)} file(s)...")
+        self.clear_cancel_button.setText("Cancel")
+        self.clear_cancel_button.setEnabled(True)
+        self.clear_progress_panel.show()
 
-                    if os.path.exists(filepath):
-                        try:
-                            os.remove(filepath)
-                            deleted_count += 1
-                        except Exception as e:
-                            failed_files.append(f"{filename}: {str(e)}")
+        self.clear_history_thread = ClearHistoryWorker(
+            self.media_folder,
+            [(item["id"], item.get("filename", "")) for item in records],
+        )
+        self.clear_history_thread.progress_signal.connect(self.update_clear_progress)
+        self.clear_history_thread.finished_signal.connect(self.clear_history_finished)
+        self.clear_history_thread.start()
+
+    def update_clear_progress(self, done, total):
+        """Updates the clear progress panel."""
+        self.clear_progress_bar.setValue(int(done / total * 100) if total else 100)
+        self.clear_progress_label.setText(f"Deleting {done} of {total} file(s)...")
+
+    def cancel_or_dismiss_clear(self):
+        """Cancels a running clear, or hides the panel once it is done."""
+        if self.clear_history_thread and self.clear_history_thread.isRunning():
+            self.clear_history_thread.requestInterruption()
+            self.clear_cancel_button.setEnabled(False)
+            self.clear_progress_label.setText("Cancelling...")
+        else:
+            self.clear_progress_panel.hide()
 
-                save_db([])
-                self.load_history()
+    def clear_history_finished(
+        self, removed_ids, deleted_count, failed_files, cancelled
+    ):
+        """Removes processed records in one write and shows a summary."""
+        self.history.remove_many(removed_ids)
+        for record_id in removed_ids:
+            self.history_file_status.pop(record_id, None)
+        self.load_history()
 
-                result_msg = (
-                    f"History cleared successfully!\n\nFiles deleted: {deleted_count}\n"
+        summary = (
+            f"Files deleted: {deleted_count} | Records removed: {len(removed_ids)}"
+        )
+        if cancelled:
+            summary = f"Cancelled. {summary}"
+        if failed_files:
+            summary += f" | Failed: {len(failed_files)} (see {CLEAR_FAILURES_FILE})"
+            with open(CLEAR_FAILURES_FILE, "w", encoding="utf-8") as f:
+                f.write(
+                    f"Clear history - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
                 )
+                f.write("\n".join(failed_files) + "\n")
 
-                if failed_files:
-                    result_msg += f"\nFailed to delete {len(failed_files)} file(s)"
+        if not cancelled:
+            self.clear_progress_bar.setValue(100)
+        self.clear_progress_label.setText(summary)
+        self.clear_cancel_button.setText("Close")
+        self.clear_cancel_button.setEnabled(True)
 
-                QMessageBox.information(self, "History Cleared", result_msg)
-            else:
-                QMessageBox.warning(
-                    self,
-                    "Confirmation Failed",
-                    "Text did not match 'DELETE ALL'. Action cancelled.",
-                )
+        self.clear_history_button.setEnabled(True)
+        self.refresh_history_btn.setEnabled(True)
 
     # ===== SETTINGS TAB =====
 
@@ -2042,14 +6350,225 @@ class ClipShrApp(QMainWindow):
         self.compress_checkbox.stateChanged.connect(self.save_download_preferences)
         prefs_layout.addWidget(self.compress_checkbox)
 
+        self.clipboard_checkbox = QCheckBox(
+            "Watch the clipboard and pre-load copied media links in the background."
+        )
+        self.clipboard_checkbox.setChecked(self.config.get("clipboard_prefetch", False))
+        self.clipboard_checkbox.stateChanged.connect(self.save_download_preferences)
+        prefs_layout.addWidget(self.clipboard_checkbox)
+
+        self.size_probe_checkbox = QCheckBox(
+            "Check exact sizes of direct downloads with quick HEAD requests."
+        )
+        self.size_probe_checkbox.setChecked(
+            self.config.get("probe_format_sizes", False)
+        )
+        self.size_probe_checkbox.stateChanged.connect(self.save_download_preferences)
+        prefs_layout.addWidget(self.size_probe_checkbox)
+
+        self.force_mp4_checkbox = QCheckBox(
+            "Always produce MP4 (re-encodes formats whose codecs MP4 players do not support)."
+        )
+        self.force_mp4_checkbox.setChecked(self.config.get("force_mp4", False))
+        self.force_mp4_checkbox.stateChanged.connect(self.save_download_preferences)
+        prefs_layout.addWidget(self.force_mp4_checkbox)
+
         scroll_layout.addWidget(prefs_group)
 
+        # ===== EXTRACTOR CACHE =====
+        cache_group = QGroupBox("Extractor Cache")
+        cache_layout = QVBoxLayout(cache_group)
+        cache_layout.setSpacing(12)
+
+        cache_info = QLabel(
+            "yt-dlp keeps site player/signature data here so extraction "
+            "does not re-download it every session:"
+        )
+        cache_info.setWordWrap(True)
+        cache_info.setStyleSheet("color: #666666;")
+        cache_layout.addWidget(cache_info)
+
+        cache_path = QLineEdit(get_ytdlp_cache_dir())
+        cache_path.setReadOnly(True)
+        cache_layout.addWidget(cache_path)
+
+        cache_row = QHBoxLayout()
+        cache_row.setSpacing(10)
+
+        self.cache_size_label = QLabel("Size: calculating...")
+        cache_row.addWidget(self.cache_size_label, 1)
+
+        self.clear_cache_button = QPushButton("Clear Cache")
+        self.clear_cache_button.setObjectName("SecondaryButton")
+        self.clear_cache_button.setMinimumWidth(120)
+        self.clear_cache_button.clicked.connect(
+            lambda: self.run_cache_maintenance(True)
+        )
+        cache_row.addWidget(self.clear_cache_button)
+
+        self.rebuild_cache_button = QPushButton("Rebuild Cache")
+        self.rebuild_cache_button.setObjectName("SecondaryButton")
+        self.rebuild_cache_button.setMinimumWidth(120)
+        self.rebuild_cache_button.clicked.connect(self.rebuild_extractor_cache)
+        cache_row.addWidget(self.rebuild_cache_button)
+
+        cache_layout.addLayout(cache_row)
+        scroll_layout.addWidget(cache_group)
+
+        # ===== SOURCE CACHE =====
+        source_group = QGroupBox("Source Cache")
+        source_layout = QVBoxLayout(source_group)
+        source_layout.setSpacing(12)
+
+        self.source_cache_checkbox = QCheckBox(
+            "Keep full downloads of trimmed videos so re-trims run locally."
+        )
+        self.source_cache_checkbox.setChecked(
+            self.config.get("source_cache_enabled", False)
+        )
+        self.source_cache_checkbox.stateChanged.connect(self.save_source_cache_settings)
+        source_layout.addWidget(self.source_cache_checkbox)
+
+        source_path = QLineEdit(get_source_cache_dir())
+        source_path.setReadOnly(True)
+        source_layout.addWidget(source_path)
+
+        source_row = QHBoxLayout()
+        source_row.setSpacing(10)
+
+        source_row.addWidget(QLabel("Disk quota:"))
+        self.source_quota_combo = QComboBox()
+        for gigabytes in SOURCE_CACHE_QUOTA_CHOICES_GB:
+            self.source_quota_combo.addItem(f"{gigabytes} GB", gigabytes)
+        quota_index = self.source_quota_combo.findData(
+            self.config.get("source_cache_quota_gb", 10)
+        )
+        self.source_quota_combo.setCurrentIndex(max(quota_index, 0))
+        self.source_quota_combo.currentIndexChanged.connect(
+            self.save_source_cache_settings
+        )
+        source_row.addWidget(self.source_quota_combo)
+
+        self.source_cache_label = QLabel()
+        source_row.addWidget(self.source_cache_label, 1)
+
+        self.clear_source_cache_button = QPushButton("Clear Sources")
+        self.clear_source_cache_button.setObjectName("SecondaryButton")
+        self.clear_source_cache_button.setMinimumWidth(120)
+        self.clear_source_cache_button.clicked.connect(self.clear_source_cache)
+        source_row.addWidget(self.clear_source_cache_button)
+
+        source_layout.addLayout(source_row)
+        scroll_layout.addWidget(source_group)
+        self.update_source_cache_label()
+
+        # ===== DIAGNOSTICS =====
+        diagnostics_group = QGroupBox("Diagnostics")
+        diagnostics_layout = QVBoxLayout(diagnostics_group)
+        diagnostics_layout.setSpacing(10)
+
+        self.diagnostics_view = QPlainTextEdit()
+        self.diagnostics_view.setReadOnly(True)
+        self.diagnostics_view.setMinimumHeight(140)
+        self.diagnostics_view.setFont(QFont("Consolas", 9))
+        diagnostics_layout.addWidget(self.diagnostics_view)
+
+        refresh_diagnostics_btn = QPushButton("Refresh Metrics")
+        refresh_diagnostics_btn.setObjectName("SecondaryButton")
+        refresh_diagnostics_btn.clicked.connect(self.refresh_diagnostics)
+        diagnostics_layout.addWidget(refresh_diagnostics_btn, alignment=Qt.AlignLeft)
+
+        scroll_layout.addWidget(diagnostics_group)
+
         scroll_layout.addStretch(1)
         scroll_area.setWidget(scroll_content)
         main_layout.addWidget(scroll_area)
 
+        self.run_cache_maintenance(clear=False)
+
         return settings_widget
 
+    def run_cache_maintenance(self, clear=False, then=None):
+        """Measures (or clears, then measures) the yt-dlp cache in the background."""
+        if self.cache_thread and self.cache_thread.isRunning():
+            return
+
+        self.cache_size_label.setText(
+            "Size: clearing..." if clear else "Size: calculating..."
+        )
+        self.clear_cache_button.setEnabled(False)
+        self.rebuild_cache_button.setEnabled(False)
+
+        self.cache_thread = CacheMaintenanceWorker(get_ytdlp_cache_dir(), clear)
+        self.cache_thread.finished_signal.connect(self.on_cache_maintenance_finished)
+        if clear:
+            # The warm instances still hold what was just deleted from disk
+            self.cache_thread.finished_signal.connect(
+                lambda size, count: reset_extraction_services()
+            )
+        if then is not None:
+            self.cache_thread.finished_signal.connect(lambda size, count: then())
+        self.cache_thread.start()
+
+    def on_cache_maintenance_finished(self, size, count):
+        """Shows the cache size once maintenance is done."""
+        self.cache_size_label.setText(f"Size: {format_bytes(size)} ({count} files)")
+        self.clear_cache_button.setEnabled(True)
+        self.rebuild_cache_button.setEnabled(True)
+
+    def save_source_cache_settings(self):
+        """Saves the source cache switch and quota, evicting if it shrank."""
+        self.config_service.set(
+            "source_cache_enabled", self.source_cache_checkbox.isChecked()
+        )
+        self.config_service.set(
+            "source_cache_quota_gb", self.source_quota_combo.currentData()
+        )
+        get_source_cache()
+        self.update_source_cache_label()
+
+    def update_source_cache_label(self):
+        source_cache = get_source_cache()
+        if source_cache is None:
+            self.source_cache_label.setText("Disabled")
+            self.clear_source_cache_button.setEnabled(False)
+            return
+        size, count = source_cache.usage()
+        self.source_cache_label.setText(f"Used: {format_bytes(size)} ({count} sources)")
+        self.clear_source_cache_button.setEnabled(count > 0)
+
+    def clear_source_cache(self):
+        source_cache = get_source_cache()
+        if source_cache is not None:
+            source_cache.clear()
+        self.update_source_cache_label()
+
+    def rebuild_extractor_cache(self):
+        """Clears the cache, then re-fetches extractor data for the top sites."""
+        self.run_cache_maintenance(clear=True, then=self.prewarm_extractor_cache)
+
+    def prewarm_extractor_cache(self):
+        """Queues one extraction for each of the most-used sites in history.
+
+        This fills the yt-dlp cache (e.g. YouTube player signature functions)
+        so the user's first fetch of the session does not have to.
+        """
+        site_counts = Counter()
+        latest_url = {}
+        for item in self.history.records():
+            url = item.get("original_url")
+            if not url or item.get("is_image"):
+                continue
+            site = urlparse(url).netloc.lower()
+            if site:
+                site_counts[site] += 1
+                latest_url[site] = url
+
+        service = get_background_extraction_service()
+        for site, _ in site_counts.most_common(CACHE_PREWARM_SITES):
+            service.submit(latest_url[site])
+            DEBUG_METRICS.add("cache_prewarm_requests")
+
     def change_theme_from_radio(self, radio_button):
         """Changes theme based on radio button selection."""
         theme_key = radio_button.property("theme_key")
@@ -2068,12 +6587,7 @@ class ClipShrApp(QMainWindow):
         )
 
         if new_folder:
-            self.config["media_folder"] = new_folder
-            save_config(self.config)
-            self.media_folder = new_folder
-            self.folder_path_label.setText(new_folder)
-
-            Path(new_folder).mkdir(exist_ok=True)
+            self.config_service.set("media_folder", new_folder)
 
             QMessageBox.information(
                 self,
@@ -2083,26 +6597,146 @@ class ClipShrApp(QMainWindow):
 
     def save_download_preferences(self):
         """Saves download preference changes."""
-        self.config["default_compress"] = self.compress_checkbox.isChecked()
-        save_config(self.config)
+        self.config_service.set("default_compress", self.compress_checkbox.isChecked())
+        self.config_service.set(
+            "clipboard_prefetch", self.clipboard_checkbox.isChecked()
+        )
+        self.config_service.set(
+            "probe_format_sizes", self.size_probe_checkbox.isChecked()
+        )
+        self.config_service.set("force_mp4", self.force_mp4_checkbox.isChecked())
+
+    def on_config_changed(self, key, value):
+        """Reacts to configuration changes made anywhere in the app."""
+        if key == "media_folder":
+            self.media_folder = get_media_folder()
+            if self.folder_path_label is not None:
+                self.folder_path_label.setText(value)
+
+            Path(self.media_folder).mkdir(exist_ok=True)
+
+            if self.media_watcher.directories():
+                self.media_watcher.removePaths(self.media_watcher.directories())
+            self.media_watcher.addPath(self.media_folder)
+            self.history_file_status.clear()
+            self.load_history()
+
+        elif key in ("force_mp4", "audio_target") and (
+            self.metadata and not self.is_image_mode
+        ):
+            # Container plans and costs depend on these settings
+            self.display_formats(
+                self.metadata.get("formats", []), self.metadata.get("duration")
+            )
 
     def check_ffmpeg(self):
-        """Checks if FFmpeg is installed and available."""
-        try:
-            subprocess.run(
-                ["ffmpeg", "-version"],
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL,
-                check=True,
+        """Checks if FFmpeg is installed and available (from the cached probe)."""
+        caps = FFMPEG_PROBE.caps(wait=False)
+        return bool(caps and caps.get("available"))
+
+    def refresh_diagnostics(self):
+        """Shows the current debug metrics in the Settings tab."""
+        metrics = DEBUG_METRICS.snapshot()
+        lines = []
+
+        # Spinner overlay
+        visible = metrics.get("overlay_visible_seconds", 0)
+        if self.loading_overlay.visible_since is not None:
+            visible += time.perf_counter() - self.loading_overlay.visible_since
+        tick_seconds = metrics.get("overlay_tick_seconds", 0)
+        cpu_percent = (tick_seconds / visible * 100) if visible else 0
+        lines.append(
+            f"Loading overlay: {metrics.get('overlay_frames', 0)} frames, "
+            f"{visible:.1f} s visible, {tick_seconds * 1000:.1f} ms drawing "
+            f"({cpu_percent:.2f}% CPU)"
+        )
+
+        # Extraction service
+        last_ms = metrics.get("last_extraction_ms")
+        lines.append(
+            f"Prefetch: {metrics.get('prefetch_started', 0)} started, "
+            f"{metrics.get('prefetch_hits', 0)} instant fetches, "
+            f"{metrics.get('prefetch_cancelled', 0)} cancelled"
+        )
+        lines.append(
+            f"Clipboard: {metrics.get('clipboard_links_seen', 0)} links pre-resolved, "
+            f"{metrics.get('clipboard_links_skipped', 0)} skipped (no site "
+            f"extractor), {metrics.get('clipboard_thumbnails_cached', 0)} "
+            "thumbnails cached"
+        )
+        lines.append(
+            f"Extraction service: {metrics.get('extractions_served', 0)} served, "
+            f"{metrics.get('extraction_instances_reused', 0)} on warm instances, "
+            f"{metrics.get('extraction_instances_created', 0)} instances created"
+            + (f", last {last_ms:.0f} ms" if last_ms is not None else "")
+        )
+
+        lines.append(
+            f"Timeline frames: {metrics.get('filmstrip_frames', 0)} sampled, "
+            f"{metrics.get('filmstrip_cache_hits', 0)} strips from cache"
+        )
+        first_frame_ms = metrics.get("preview_first_frame_ms")
+        lines.append(
+            f"Trim preview: {metrics.get('preview_seeks', 0)} seeks, "
+            f"{metrics.get('preview_buffer_hits', 0)} from buffer, "
+            f"{metrics.get('preview_slow_starts', 0)} over the "
+            f"{PREVIEW_FIRST_FRAME_TARGET:.0f} s first-frame target"
+            + (
+                f", last first frame {first_frame_ms:.0f} ms"
+                if first_frame_ms is not None
+                else ""
             )
-            return True
-        except (FileNotFoundError, subprocess.CalledProcessError):
-            return False
+        )
+        lines.append(
+            f"Local clips: {metrics.get('postprocess_jobs', 0)} made, keyframe "
+            f"indexes {metrics.get('keyframe_index_built', 0)} built / "
+            f"{metrics.get('keyframe_index_hits', 0)} reused"
+        )
+        lines.append(
+            f"Source cache: {metrics.get('source_cache_hits', 0)} hits, "
+            f"{metrics.get('source_cache_stores', 0)} stored, "
+            f"{metrics.get('source_cache_evictions', 0)} evicted"
+        )
+
+        throughput = estimate_throughput(self.config.get("recent_throughput"))
+        lines.append(
+            f"Download throughput: {format_bytes(throughput)}/s (median of recent)"
+            if throughput
+            else "Download throughput: not measured yet"
+        )
+
+        # FFmpeg
+        caps = FFMPEG_PROBE.caps(wait=False)
+        if caps is None:
+            lines.append("FFmpeg: probing...")
+        elif caps.get("available"):
+            lines.append(
+                f"FFmpeg: {caps.get('version')} ({metrics.get('ffmpeg_probe')}), "
+                f"{len(caps.get('software_encoders', []))} software encoders, "
+                f"{len(caps.get('muxers', []))} muxers"
+            )
+        else:
+            lines.append("FFmpeg: not found on PATH")
+
+        lines.append("")
+        lines.append(startup_report())
+
+        self.diagnostics_view.setPlainText("\n".join(lines))
 
     def on_tab_change(self, index):
         """Handles tab changes (refresh history when switching to History tab)."""
+        self.ensure_tab_built(index)
+
         if self.tab_widget.tabText(index) == "History":
             self.load_history()
+        elif self.tab_widget.tabText(index) == "Settings":
+            self.refresh_diagnostics()
+
+    def changeEvent(self, event):
+        """Pauses the spinner while the window is minimized."""
+        if event.type() == event.WindowStateChange:
+            self.loading_overlay.set_paused(self.isMinimized())
+        super().changeEvent(event)
 
     def resizeEvent(self, event):
         """Handles window resize to reposition loading overlay."""
@@ -2112,19 +6746,237 @@ class ClipShrApp(QMainWindow):
 
     def closeEvent(self, event):
         """Handles application close - saves window size."""
-        self.config["window_width"] = self.width()
-        self.config["window_height"] = self.height()
-        save_config(self.config)
+        self.config_service.set("window_width", self.width())
+        self.config_service.set("window_height", self.height())
+        self.config_service.flush()
+
+        # Running ffmpeg jobs are stopped rather than waited for; audio that
+        # was not converted is recorded as its original download
+        FFMPEG_JOBS.terminate_all()
+        for job, error in self.audio_pool.shutdown():
+            self.on_audio_conversion_finished(job, error)
+        self.postprocess_pool.shutdown()
+        QApplication.processEvents()
+
+        self.stop_preview()
+
+        for service in (_extraction_service, _background_extraction_service):
+            if service is not None:
+                service.shutdown()
+        self.preresolve_pool.shutdown(wait=False, cancel_futures=True)
+
+        for thread in (
+            self.history_scan_thread,
+            self.clear_history_thread,
+            self.cache_thread,
+        ):
+            if thread and thread.isRunning():
+                thread.requestInterruption()
+                thread.wait()
+
+        # The queued finished_signal is never delivered once closed, so the
+        # records of files already deleted are dropped here
+        if self.clear_history_thread is not None:
+            self.clear_history_thread.finished_signal.disconnect()
+            self.history.remove_many(self.clear_history_thread.removed_ids)
+            self.clear_history_thread = None
+
+        if self.history.has_pending_journal():
+            self.history.checkpoint()
+
+        # Includes stopped strips, previews and size probes still winding down
+        self.stop_filmstrip()
+        self.stop_format_size_probe()
+        for thread in self.findChildren(
+            (FilmstripWorker, PreviewSnippetWorker, FormatSizeProbeWorker)
+        ):
+            thread.wait()
+
         event.accept()
 
 
+# ===== BENCHMARKS =====
+
+
+def benchmark_theme_switch(window, rounds=20):
+    """Times theme switching and status updates, before and after.
+
+    Prints average milliseconds per operation. Run with --benchmark-theme.
+    """
+    themes = list(PALETTES)
+    app = QApplication.instance()
+    tabs = range(window.tab_widget.count())
+    window.tab_widget.setCurrentIndex(0)
+
+    def attach_all_tabs(i=None):
+        for index in tabs:
+            window.ensure_tab_built(index)
+
+    attach_all_tabs()
+    app.processEvents()
+
+    # Only the synchronous style work is timed; repaints happen between rounds
+    def timed(fn, setup=None):
+        elapsed = 0.0
+        for i in range(rounds):
+            if setup is not None:
+                setup(i)
+            start = time.perf_counter()
+            fn(i)
+            elapsed += time.perf_counter() - start
+            app.processEvents()
+        return elapsed / rounds * 1000
+
+    # Previous behaviour: every tab is in the window and re-polished
+    def full_switch(i):
+        window.setStyleSheet(get_qss(themes[i % len(themes)]))
+
+    def deferred_switch(i):
+        window.applied_theme = None
+        window.apply_theme(themes[i % len(themes)])
+
+    # The deferred part: a hidden tab is polished when it is next shown
+    def hidden_tab_view(i):
+        window.ensure_tab_built(1 + i % (len(tabs) - 1))
+
+    # Previous behaviour: a fresh per-widget stylesheet for every progress tick
+    def stylesheet_status(i):
+        window.status_label.setText(f"Status: Downloading... {i}%")
+        window.status_label.setStyleSheet("background-color: #FFFFFF;")
+
+    def property_status(i):
+        window.update_status(f"Downloading... {i}%")
+
+    original_theme = window.applied_theme
+    results = {
+        "theme switch (every tab re-polished)": timed(
+            full_switch, setup=attach_all_tabs
+        ),
+        "theme switch (hidden tabs deferred)": timed(deferred_switch),
+        "first view of a hidden tab after it": timed(
+            hidden_tab_view, setup=deferred_switch
+        ),
+        "status update (setStyleSheet)": timed(stylesheet_status),
+    }
+    window.status_label.setStyleSheet("")
+    results["status update (dynamic property)"] = timed(property_status)
+
+    window.applied_theme = None
+    window.apply_theme(original_theme)
+    attach_all_tabs()
+
+    widgets = len(window.findChildren(QWidget))
+    print(f"Theme benchmark ({rounds} rounds, {widgets} widgets):")
+    for name, ms in results.items():
+        print(f"  {name:<38} {ms:8.2f} ms")
+    return results
+
+
+def _synthetic_hls_info(index, num_formats=30, fragments=900):
+    """Builds an info dict shaped like yt-dlp's output for a long HLS stream."""
+    base = f"https://cdn.example.com/hls/{index:04d}"
+    headers = {
+        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) ClipShr",
+        "Accept": "*/*",
+        "Accept-Language": "en-us,en;q=0.5",
+        "Sec-Fetch-Mode": "navigate",
+    }
+    formats = []
+    for n in range(num_formats):
+        audio = n % 3 == 0
+        formats.append(
+            {
+                "format_id": f"hls-{n}",
+                "ext": "mp4",
+                "protocol": "m3u8_native",
+                "url": f"{base}/{n}/index.m3u8?token={'x' * 300}",
+                "manifest_url": f"{base}/master.m3u8?token={'y' * 300}",
+                "vcodec": "none" if audio else "avc1.64001f",
+                "acodec": "mp4a.40.2" if audio else "none",
+                "height": None if audio else 144 * (n % 8 + 1),
+                "tbr": 64.0 + n * 150,
+                "http_headers": dict(headers),
+                "fragments": [
+                    {
+                        "url": f"{base}/{n}/seg-{k:05d}.ts?sig={'z' * 60}",
+                        "duration": 6.0,
+                    }
+                    for k in range(fragments)
+                ],
+            }
+        )
+    return {
+        "id": f"video{index:04d}",
+        "title": f"Synthetic stream {index}",
+        "uploader": "ClipShr",
+        "extractor": "generic",
+        "duration": fragments * 6.0,
+        "ext": "mp4",
+        "webpage_url": f"https://example.com/watch/{index}",
+        "thumbnail": f"https://example.com/thumb/{index}.jpg",
+        "http_headers": dict(headers),
+        "formats": formats,
+    }
+
+
+def benchmark_metadata_memory(jobs=20):
+    """Compares memory retained by full vs slim info dicts for a batch of jobs.
+
+    Reports the traced Python heap peak for each variant and, where the
+    platform provides it, the process peak RSS after each (slim runs first,
+    since peak RSS only ever grows). Run with --benchmark-memory.
+    """
+    import tracemalloc
+
+    try:
+        import resource
+    except ImportError:
+        resource = None
+
+    def peak_rss_mb():
+        if resource is None:
+            return None
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is bytes on macOS, kilobytes elsewhere
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+    def measure(keep):
+        tracemalloc.start()
+        retained = [keep(_synthetic_hls_info(i)) for i in range(jobs)]
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del retained
+        return current / (1024 * 1024), peak / (1024 * 1024), peak_rss_mb()
+
+    baseline_rss = peak_rss_mb()
+    results = {
+        "slim info": measure(slim_info),
+        "full info": measure(lambda info: info),
+    }
+
+    print(f"Metadata memory benchmark ({jobs} retained jobs):")
+    if baseline_rss is not None:
+        print(f"  {'baseline':<12} peak RSS {baseline_rss:8.1f} MB")
+    for name, (retained, peak, rss) in results.items():
+        line = f"  {name:<12} retained {retained:8.2f} MB  traced peak {peak:8.2f} MB"
+        if rss is not None:
+            line += f"  peak RSS {rss:8.1f} MB"
+        print(line)
+    return results
+
+
 # ===== APPLICATION ENTRY POINT =====
 
 
 def main():
     """Main application entry point."""
+    mark_startup("imports")
+
+    if "--benchmark-memory" in sys.argv:
+        benchmark_metadata_memory()
+        return
+
     # Load config and ensure media folder exists
-    config = load_config()
     Path(get_media_folder()).mkdir(exist_ok=True)
 
     # Create application
@@ -2142,8 +6994,15 @@ def main():
 
     # Create and show main window
     window = ClipShrApp()
+    mark_startup("window")
     window.show()
 
+    if "--benchmark-theme" in sys.argv:
+        app.processEvents()
+        benchmark_theme_switch(window)
+        window.close()
+        return
+
     # Start event loop
     sys.exit(app.exec_())
 
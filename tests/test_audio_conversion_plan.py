@@ -0,0 +1,50 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import clipshr_desktop as app  # noqa: E402
+
+
+@pytest.mark.parametrize(
+    "acodec, source_ext, target, expected",
+    [
+        # Already the target codec and container: nothing to do
+        ("mp4a.40.2", "m4a", "m4a", (app.COST_NONE, None, "m4a")),
+        ("opus", "opus", "opus", (app.COST_NONE, None, "opus")),
+        # Right codec, other container: re-wrapped without re-encoding
+        ("opus", "webm", "opus", (app.COST_REMUX, ["-c:a", "copy"], "opus")),
+        ("mp4a.40.5", "mp4", "m4a", (app.COST_REMUX, ["-c:a", "copy"], "m4a")),
+        ("mp3", "mka", "mp3", (app.COST_REMUX, ["-c:a", "copy"], "mp3")),
+    ],
+)
+def test_matching_codec_is_never_re_encoded(acodec, source_ext, target, expected):
+    assert app.audio_conversion_plan(acodec, source_ext, target) == expected
+
+
+@pytest.mark.parametrize(
+    "acodec, source_ext, target",
+    [
+        ("opus", "webm", "mp3"),
+        ("opus", "webm", "m4a"),
+        ("mp4a.40.2", "m4a", "opus"),
+        ("vorbis", "ogg", "mp3"),
+    ],
+)
+def test_other_codecs_are_transcoded_with_the_target_args(acodec, source_ext, target):
+    cost, args, ext = app.audio_conversion_plan(acodec, source_ext, target)
+
+    assert cost == app.COST_TRANSCODE
+    assert args == app.AUDIO_TARGETS[target]["args"]
+    assert ext == app.AUDIO_TARGETS[target]["ext"]
+
+
+@pytest.mark.parametrize("target", ["native", "unknown-target"])
+def test_native_or_unknown_target_keeps_the_download(target):
+    assert app.audio_conversion_plan("opus", "webm", target) == (
+        app.COST_NONE,
+        None,
+        "webm",
+    )
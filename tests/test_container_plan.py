@@ -0,0 +1,64 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import clipshr_desktop as app  # noqa: E402
+
+AVC_MP4 = {"ext": "mp4", "vcodec": "avc1.640028", "acodec": "none"}
+VP9_WEBM = {"ext": "webm", "vcodec": "vp9", "acodec": "none"}
+AAC_M4A = {"ext": "m4a", "vcodec": "none", "acodec": "mp4a.40.2"}
+OPUS_WEBM = {"ext": "webm", "vcodec": "none", "acodec": "opus"}
+
+
+@pytest.mark.parametrize(
+    "video, audio, expected",
+    [
+        (AVC_MP4, AAC_M4A, ("mp4", app.COST_REMUX)),
+        (VP9_WEBM, OPUS_WEBM, ("webm", app.COST_REMUX)),
+        # Mixed containers are merged into MKV, still without re-encoding
+        (AVC_MP4, OPUS_WEBM, ("mkv", app.COST_REMUX)),
+        (VP9_WEBM, AAC_M4A, ("mkv", app.COST_REMUX)),
+    ],
+)
+def test_pairs_are_stream_copied_into_a_shared_container(video, audio, expected):
+    assert app.container_plan(video, audio) == expected
+
+
+def test_premuxed_file_is_kept_as_is():
+    muxed = {"ext": "webm", "vcodec": "vp8", "acodec": "vorbis"}
+    assert app.container_plan(muxed) == ("webm", app.COST_NONE)
+
+
+@pytest.mark.parametrize(
+    "video, audio, expected",
+    [
+        (AVC_MP4, AAC_M4A, ("mp4", app.COST_REMUX)),
+        (AVC_MP4, OPUS_WEBM, ("mp4", app.COST_TRANSCODE)),
+        (VP9_WEBM, AAC_M4A, ("mp4", app.COST_TRANSCODE)),
+        (
+            {"ext": "mp4", "vcodec": "av01.0.08M.08", "acodec": "none"},
+            AAC_M4A,
+            ("mp4", app.COST_REMUX),
+        ),
+    ],
+)
+def test_forced_mp4_pairs(video, audio, expected):
+    assert app.container_plan(video, audio, force_mp4=True) == expected
+
+
+def test_forced_mp4_single_files():
+    muxed_mp4 = {"ext": "mp4", "vcodec": "avc1", "acodec": "mp4a.40.2"}
+    muxed_mkv = {"ext": "mkv", "vcodec": "h264", "acodec": "aac"}
+    muxed_webm = {"ext": "webm", "vcodec": "vp8", "acodec": "vorbis"}
+
+    assert app.container_plan(muxed_mp4, force_mp4=True) == ("mp4", app.COST_NONE)
+    assert app.container_plan(muxed_mkv, force_mp4=True) == ("mp4", app.COST_REMUX)
+    assert app.container_plan(muxed_webm, force_mp4=True) == (
+        "mp4",
+        app.COST_TRANSCODE,
+    )
+    # Video-only MP4 needs no audio codec check
+    assert app.container_plan(AVC_MP4, force_mp4=True) == ("mp4", app.COST_NONE)
@@ -0,0 +1,38 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import clipshr_desktop as app  # noqa: E402
+
+
+def test_add_after_torn_journal_line_survives_reload(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    store = app.HistoryStore()
+    first = store.add({"title": "first"})
+
+    # Crash mid-append: the last line has no newline and is not valid JSON
+    with open(app.HISTORY_JOURNAL_FILE, "a", encoding="utf-8") as f:
+        f.write('{"op": "add", "record": {"id": "torn", "ti')
+
+    store = app.HistoryStore()
+    second = store.add({"title": "second"})
+
+    reloaded = app.HistoryStore()
+    assert reloaded.get(first)["title"] == "first"
+    assert reloaded.get(second)["title"] == "second"
+    assert reloaded.get("torn") is None
+
+
+def test_append_onto_unterminated_line_keeps_both_entries(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    store = app.HistoryStore()
+
+    # A complete entry whose newline never made it to disk
+    with open(app.HISTORY_JOURNAL_FILE, "w", encoding="utf-8") as f:
+        f.write('{"op": "add", "record": {"id": "a", "title": "a"}}')
+    store._log({"op": "add", "record": {"id": "b", "title": "b"}})
+
+    entries, damaged = app.read_journal(app.HISTORY_JOURNAL_FILE)
+    assert [e["record"]["id"] for e in entries] == ["a", "b"]
+    assert damaged == 0
@@ -0,0 +1,128 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import clipshr_desktop as app  # noqa: E402
+
+MB = 1024 * 1024
+AAC = {
+    "format_id": "140",
+    "ext": "m4a",
+    "vcodec": "none",
+    "acodec": "mp4a.40.2",
+    "abr": 128,
+    "filesize": 5 * MB,
+}
+OPUS = {
+    "format_id": "251",
+    "ext": "webm",
+    "vcodec": "none",
+    "acodec": "opus",
+    "abr": 140,
+    "filesize": 5 * MB,
+}
+
+
+def video(format_id, ext, vcodec, height, size_mb):
+    return {
+        "format_id": format_id,
+        "ext": ext,
+        "vcodec": vcodec,
+        "acodec": "none",
+        "height": height,
+        "filesize": size_mb * MB,
+    }
+
+
+def picks_by_title(formats, **kwargs):
+    return {
+        r.label.split(" - ")[0]: r
+        for r in app.recommend_formats(formats, 600, **kwargs)
+    }
+
+
+def test_fastest_is_the_quickest_option_not_the_highest_resolution():
+    formats = [
+        video("137", "mp4", "avc1.640028", 1080, 300),
+        video("136", "mp4", "avc1.4d401f", 720, 150),
+        video("135", "mp4", "avc1.4d401e", 480, 40),
+        AAC,
+    ]
+    picks = picks_by_title(formats, throughput=2 * MB)
+
+    assert picks["Recommended"].format_id == "137+140"
+    fastest = picks[f"Fastest ≤{app.FASTEST_MAX_HEIGHT}p"]
+    assert fastest.format_id == "135+140"
+    assert fastest.label == "Fastest ≤720p - 480p AVC + AAC"
+
+
+def test_fastest_counts_transcode_time_when_mp4_is_forced():
+    formats = [
+        video("137", "mp4", "avc1.640028", 1080, 150),
+        video("248", "webm", "vp9", 1080, 150),
+        video("136", "mp4", "avc1.4d401f", 720, 100),
+        video("247", "webm", "vp9", 720, 90),
+        AAC,
+        OPUS,
+    ]
+    title = f"Fastest ≤{app.FASTEST_MAX_HEIGHT}p"
+
+    # The smaller VP9 pair only needs a stream copy into WebM/MKV
+    assert picks_by_title(formats)[title].format_id.startswith("247+")
+
+    # As MP4 it would be re-encoded, which costs more than the extra bytes
+    forced = picks_by_title(formats, force_mp4=True)[title]
+    assert forced.format_id == "136+140"
+    assert (forced.container, forced.cost) == ("mp4", app.COST_REMUX)
+
+
+def test_forced_mp4_candidates_are_all_mp4():
+    formats = [
+        video("247", "webm", "vp9", 720, 90),
+        video("136", "mp4", "avc1", 720, 100),
+        AAC,
+        OPUS,
+    ]
+    candidates = app.build_format_candidates(formats, 600, force_mp4=True)
+
+    assert {c.container for c in candidates} == {"mp4"}
+    costs = {c.format_id: c.cost for c in candidates}
+    assert costs["136+140"] == app.COST_REMUX
+    assert costs["247+140"] == app.COST_TRANSCODE
+    assert costs["136+251"] == app.COST_TRANSCODE
+
+
+def test_duplicate_picks_are_shown_once():
+    formats = [video("135", "mp4", "avc1", 480, 40), AAC]
+    recommendations = app.recommend_formats(formats, 600)
+
+    assert [r.format_id for r in recommendations] == ["135+140"]
+    assert recommendations[0].label.startswith("Recommended - 480p")
+
+
+def test_equal_options_prefer_the_one_without_post_processing():
+    muxed = {
+        "format_id": "22",
+        "ext": "mp4",
+        "vcodec": "avc1",
+        "acodec": "mp4a.40.2",
+        "height": 720,
+        "filesize": 105 * MB,
+    }
+    formats = [muxed, video("136", "mp4", "avc1", 720, 100), AAC]
+
+    assert picks_by_title(formats)["Recommended"].format_id == "22"
+
+
+def test_no_sizes_means_no_recommendations():
+    formats = [
+        {
+            "format_id": "hls",
+            "ext": "mp4",
+            "vcodec": "avc1",
+            "acodec": "aac",
+            "height": 720,
+        }
+    ]
+    assert app.recommend_formats(formats, None) == []
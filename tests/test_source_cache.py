@@ -0,0 +1,105 @@
+import itertools
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import clipshr_desktop as app  # noqa: E402
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    # Strictly increasing "last used" times
+    clock = itertools.count(1000)
+    monkeypatch.setattr(app.time, "time", lambda: next(clock))
+    return app.SourceCache(str(tmp_path), quota_bytes=2500)
+
+
+def download(cache, key, size=1000):
+    """Writes a finished download into a staging folder and adds it."""
+    path = os.path.join(cache.staging_dir(), f"{key}.mp4")
+    with open(path, "wb") as f:
+        f.write(b"x" * size)
+    return cache.add(key, path, title=key)
+
+
+def cached_files(cache):
+    return sorted(
+        name for name in os.listdir(cache.directory) if not name.startswith(".")
+    )
+
+
+def test_add_moves_the_download_into_the_cache(cache):
+    entry = download(cache, "a")
+
+    assert entry["path"] == os.path.join(cache.directory, "a.mp4")
+    assert os.path.exists(entry["path"])
+    assert cache.usage() == (1000, 1)
+    assert cache.lookup("a")["title"] == "a"
+
+
+def test_least_recently_used_entry_is_evicted_over_quota(cache):
+    download(cache, "a")
+    download(cache, "b")
+    cache.lookup("a")
+    download(cache, "c")
+
+    assert cache.lookup("b") is None
+    assert cache.lookup("a") is not None
+    assert cached_files(cache) == ["a.mp4", "c.mp4", app.SOURCE_CACHE_INDEX]
+    assert cache.usage() == (2000, 2)
+
+
+def test_entry_just_added_is_kept_even_when_over_quota(cache):
+    download(cache, "a")
+    entry = download(cache, "big", size=4000)
+
+    assert os.path.exists(entry["path"])
+    assert cache.lookup("a") is None
+    assert cache.usage() == (4000, 1)
+
+
+def test_lowering_the_quota_evicts(cache):
+    for key in "abc":
+        download(cache, key)
+    cache.set_quota(1000)
+
+    assert cache.usage() == (1000, 1)
+    assert cache.lookup("c") is not None
+
+
+def test_entry_whose_file_is_gone_is_dropped(cache):
+    entry = download(cache, "a")
+    os.remove(entry["path"])
+
+    assert cache.lookup("a") is None
+    assert cache.usage() == (0, 0)
+
+
+def test_index_survives_a_restart(cache):
+    download(cache, "a")
+
+    reopened = app.SourceCache(cache.directory, cache.quota_bytes)
+    assert reopened.lookup("a")["path"] == os.path.join(cache.directory, "a.mp4")
+
+
+def test_leftovers_of_interrupted_downloads_are_removed_on_load(cache):
+    download(cache, "a")
+    staging = cache.staging_dir()
+    with open(os.path.join(staging, "b.mp4.part"), "wb") as f:
+        f.write(b"x" * 5000)
+
+    reopened = app.SourceCache(cache.directory, cache.quota_bytes)
+    assert reopened.usage() == (1000, 1)
+    assert not os.path.exists(staging)
+    # Files the index does not know are only removed from staging
+    assert cached_files(reopened) == ["a.mp4", app.SOURCE_CACHE_INDEX]
+
+
+def test_make_key_is_filename_safe():
+    info = {"id": "a/b:c", "extractor": "youtube:tab"}
+
+    assert app.SourceCache.make_key(info, "137+140") == "youtube_tab_a_b_c_137_140"
+    assert app.SourceCache.make_key({}, "18") is None
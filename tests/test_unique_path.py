@@ -0,0 +1,46 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import clipshr_desktop as app  # noqa: E402
+
+
+def touch(path):
+    with open(path, "w") as f:
+        f.write("x")
+
+
+def test_free_name_is_used_as_is(tmp_path):
+    path = str(tmp_path / "Talk (00-01-00 to 00-01-30).mp4")
+    assert app.unique_path(path) == path
+
+
+def test_existing_files_get_the_next_number(tmp_path):
+    path = str(tmp_path / "Talk (00-01-00 to 00-01-30).mp4")
+    touch(path)
+    assert app.unique_path(path) == str(
+        tmp_path / "Talk (00-01-00 to 00-01-30) (2).mp4"
+    )
+
+    touch(str(tmp_path / "Talk (00-01-00 to 00-01-30) (2).mp4"))
+    assert app.unique_path(path) == str(
+        tmp_path / "Talk (00-01-00 to 00-01-30) (3).mp4"
+    )
+
+
+def test_names_taken_in_the_same_job_are_skipped(tmp_path):
+    path = str(tmp_path / "clip.m4a")
+    touch(path)
+    taken = [str(tmp_path / "clip (2).m4a")]
+
+    assert app.unique_path(path, taken=taken) == str(tmp_path / "clip (3).m4a")
+    assert app.unique_path(str(tmp_path / "other.m4a"), taken=taken) == str(
+        tmp_path / "other.m4a"
+    )
+
+
+def test_name_without_extension(tmp_path):
+    path = str(tmp_path / "clip")
+    touch(path)
+    assert app.unique_path(path) == str(tmp_path / "clip (2)")